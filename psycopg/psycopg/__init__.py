@@ -19,7 +19,9 @@ from ._column import Column
 from .dbapi20 import BINARY, DATETIME, NUMBER, ROWID, STRING, Binary, Date
 from .dbapi20 import DateFromTicks, Time, TimeFromTicks, Timestamp, TimestampFromTicks
 from .version import __version__ as __version__  # noqa: F401
-from ._pipeline import Pipeline
+from ._queries import CompiledQuery, query_cache
+from ._pipeline import Pipeline, PipelineResult
+from ._preparing import CostPreparePolicy, PreparedStats, PreparePolicy
 from .connection import Connection
 from .raw_cursor import AsyncRawCursor, AsyncRawServerCursor, RawCursor, RawServerCursor
 from .transaction import AsyncTransaction, Rollback, Transaction
@@ -27,7 +29,7 @@ from .cursor_async import AsyncCursor
 from ._capabilities import Capabilities, capabilities
 from .client_cursor import AsyncClientCursor, ClientCursor
 from ._server_cursor import ServerCursor
-from ._pipeline_async import AsyncPipeline
+from ._pipeline_async import AsyncPipeline, AsyncPipelineResult
 from ._connection_base import BaseConnection, Notify
 from ._connection_info import ConnectionInfo
 from .connection_async import AsyncConnection
@@ -63,6 +65,7 @@ __all__ = [
     "AsyncCopy",
     "AsyncCursor",
     "AsyncPipeline",
+    "AsyncPipelineResult",
     "AsyncRawCursor",
     "AsyncRawServerCursor",
     "AsyncServerCursor",
@@ -72,13 +75,19 @@ __all__ = [
     "capabilities",
     "ClientCursor",
     "Column",
+    "CompiledQuery",
     "Connection",
     "ConnectionInfo",
     "Copy",
+    "CostPreparePolicy",
     "Cursor",
     "IsolationLevel",
     "Notify",
     "Pipeline",
+    "PipelineResult",
+    "PreparedStats",
+    "PreparePolicy",
+    "query_cache",
     "RawCursor",
     "RawServerCursor",
     "Rollback",
@@ -7,7 +7,8 @@ compatibility functions for different Python versions
 from __future__ import annotations
 
 import sys
-from typing import Any, Iterator
+from typing import Any, Iterable, Iterator
+from itertools import islice
 
 if sys.version_info >= (3, 11):
     from typing import LiteralString, Self
@@ -30,6 +31,18 @@ if sys.version_info >= (3, 13):
 else:
     from typing_extensions import TypeVar
 
+T = TypeVar("T")
+
+if sys.version_info >= (3, 12):
+    from itertools import batched
+else:
+
+    def batched(iterable: Iterable[T], n: int) -> Iterator[tuple[T, ...]]:
+        it = iter(iterable)
+        while batch := tuple(islice(it, n)):
+            yield batch
+
+
 if sys.version_info >= (3, 14):
     from string.templatelib import Interpolation, Template
 else:
@@ -55,6 +68,7 @@ else:
 
 
 __all__ = [
+    "batched",
     "Interpolation",
     "LiteralString",
     "Self",
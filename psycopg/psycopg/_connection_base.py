@@ -12,20 +12,22 @@ from typing import TYPE_CHECKING, Any, Generic, NamedTuple, TypeAlias
 from weakref import ReferenceType, ref
 from warnings import warn
 from functools import partial
+from itertools import count
 from collections import deque
-from collections.abc import Callable
+from collections.abc import Callable, Mapping, Sequence
 
 from . import errors as e
 from . import generators, postgres, pq
 from .abc import PQGen, PQGenConn, QueryNoTemplate
-from .sql import SQL, Composable
+from .sql import SQL, Composable, Composed, Identifier
 from ._tpc import Xid
 from .rows import Row
-from .adapt import AdaptersMap
+from .adapt import AdaptersMap, Transformer
 from ._enums import IsolationLevel
 from ._compat import LiteralString, Self, TypeVar
 from .pq.misc import connection_summary
-from ._preparing import PrepareManager
+from ._queries import CompiledQuery
+from ._preparing import Key, PreparedStats, PrepareManager, PreparePolicy
 from ._capabilities import capabilities
 from ._pipeline_base import BasePipeline
 from ._connection_info import ConnectionInfo
@@ -56,6 +58,18 @@ _HAS_SEND_CLOSE = capabilities.has_send_close_prepared()
 
 logger = logging.getLogger("psycopg")
 
+# Used to give a distinct name to the bulk_upsert() staging tables
+_upsert_ids = count(1)
+
+
+class UpsertQueries(NamedTuple):
+    """The statements executed by `~Connection.bulk_upsert()`."""
+
+    create: Composed
+    describe: Composed
+    copy: Composed
+    insert: Composed
+
 
 class Notify(NamedTuple):
     """An asynchronous notification received from the database."""
@@ -423,6 +437,115 @@ class BaseConnection(Generic[Row]):
             value = sys.maxsize
         self._prepared.prepared_max = value
 
+    @property
+    def defer_deallocate(self) -> bool:
+        """
+        Defer the deallocation of the prepared statements evicted.
+
+        If `!False` (default), the prepared statements evicted from the cache
+        are deallocated after the query executed. If `!True`, they are only
+        deallocated by `flush_deallocations()`, or when more than
+        `prepared_max` are pending.
+        """
+        return self._prepared.defer_deallocate
+
+    @defer_deallocate.setter
+    def defer_deallocate(self, value: bool) -> None:
+        self._prepared.defer_deallocate = value
+
+    @property
+    def prepare_policy(self) -> PreparePolicy | None:
+        """
+        Object deciding which queries to prepare on the connection.
+
+        If `!None` (default), queries are prepared after being executed
+        `prepare_threshold` times.
+        """
+        return self._prepared.policy
+
+    @prepare_policy.setter
+    def prepare_policy(self, value: PreparePolicy | None) -> None:
+        self._prepared.policy = value
+
+    def prepared_stats(self) -> PreparedStats:
+        """
+        Return statistics about the prepared statements on the connection.
+        """
+        return self._prepared.stats()
+
+    def compile(
+        self,
+        query: QueryNoTemplate,
+        types: Sequence[int | str] | Mapping[str, int | str],
+        *,
+        binary: bool = False,
+    ) -> CompiledQuery:
+        """
+        Prepare a query to be executed many times with parameters of known types.
+
+        :param query: The query to compile, with `!%s` or `!%(name)s`
+            placeholders.
+        :param types: The PostgreSQL types of the parameters, as a sequence of
+            oids or type names (e.g. ``int4``, ``timestamptz[]``), or a mapping
+            from the placeholders names to types.
+        :param binary: If `!True`, dump the parameters in binary format,
+            otherwise in text format.
+        """
+        return CompiledQuery(
+            query, types, BINARY if binary else TEXT, Transformer(self)
+        )
+
+    def _bulk_upsert_queries(
+        self,
+        table: str | Composable,
+        columns: Sequence[str],
+        conflict_keys: Sequence[str],
+        update: Sequence[str] | None,
+        binary: bool,
+    ) -> UpsertQueries:
+        if not columns:
+            raise ValueError("no column to upsert specified")
+        if not conflict_keys:
+            raise ValueError("no conflict key specified")
+        if isinstance(table, str):
+            table = Identifier(table)
+        if update is None:
+            update = [col for col in columns if col not in conflict_keys]
+
+        name = f"_psycopg_upsert_{id(self):x}_{next(_upsert_ids)}"
+        stage = Identifier(name)
+        stage_tmp = Identifier("pg_temp", name)
+        cols = SQL(", ").join(map(Identifier, columns))
+        action: Composable
+        if update:
+            action = SQL("UPDATE SET {}").format(
+                SQL(", ").join(
+                    SQL("{0} = EXCLUDED.{0}").format(Identifier(col)) for col in update
+                )
+            )
+        else:
+            action = SQL("NOTHING")
+
+        return UpsertQueries(
+            create=SQL(
+                "CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA"
+            ).format(stage, cols, table),
+            describe=SQL("SELECT * FROM {} LIMIT 0").format(stage_tmp),
+            copy=SQL("COPY {} FROM STDIN{}").format(
+                stage_tmp, SQL(" (FORMAT BINARY)" if binary else "")
+            ),
+            insert=SQL(
+                "INSERT INTO {} ({}) SELECT {} FROM {} ON CONFLICT ({}) DO {}"
+            ).format(
+                table,
+                cols,
+                cols,
+                stage_tmp,
+                SQL(", ").join(map(Identifier, conflict_keys)),
+                action,
+            ),
+        )
+
     # Generators to perform high-level operations on the connection
     #
     # These operations are expressed in terms of non-blocking generators
@@ -524,6 +647,71 @@ class BaseConnection(Generic[Row]):
                     " from sending closing prepared statement message"
                 )
 
+    def _prepare_statements_gen(self, keys: Sequence[Key]) -> PQGen[None]:
+        """
+        Prepare the statements identified by *keys* in the session.
+
+        In pipeline mode the commands are only queued, to be sent in a single
+        batch on sync.
+        """
+        self._check_connection_ok()
+
+        for query, types in keys:
+            if not (name := self._prepared.add((query, types))):
+                continue
+
+            if self._pipeline:
+                cmd = partial(self.pgconn.send_prepare, name, query, types)
+                self._pipeline.command_queue.append(cmd)
+                self._pipeline.result_queue.append(None)
+                continue
+
+            self.pgconn.send_prepare(name, query, param_types=types)
+            result = (yield from generators.execute(self.pgconn))[-1]
+            if result.status == FATAL_ERROR:
+                raise e.error_from_result(result, encoding=self.pgconn._encoding)
+
+    def _deallocate_many(self, names: Sequence[bytes]) -> PQGen[None]:
+        """
+        Deallocate several prepared statements in a single round trip.
+
+        Use protocol-level commands in a pipeline if possible, otherwise a
+        multi-statement query.
+        """
+        if len(names) == 1 or self._pipeline:
+            for name in names:
+                yield from self._deallocate(name)
+            return
+
+        if not (_HAS_SEND_CLOSE and capabilities.has_pipeline()):
+            stmt = b"; ".join(b"DEALLOCATE " + name for name in names)
+            yield from self._exec_command(stmt)
+            return
+
+        self._check_connection_ok()
+
+        error = None
+        self.pgconn.enter_pipeline_mode()
+        try:
+            for name in names:
+                self.pgconn.send_close_prepared(name)
+            self.pgconn.pipeline_sync()
+            yield from generators.send(self.pgconn)
+
+            # Fetch the result of every command, then the sync one.
+            for _ in range(len(names) + 1):
+                results = yield from generators.fetch_many(self.pgconn)
+                if error is None and results[-1].status == FATAL_ERROR:
+                    error = e.error_from_result(
+                        results[-1], encoding=self.pgconn._encoding
+                    )
+        finally:
+            if self.pgconn.status != BAD:
+                self.pgconn.exit_pipeline_mode()
+
+        if error:
+            raise error
+
     def _check_connection_ok(self) -> None:
         if self.pgconn.status == OK:
             return
@@ -10,18 +10,22 @@ Objects to support the COPY protocol (sync version).
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from time import monotonic
 from types import TracebackType
-from typing import TYPE_CHECKING, Any
-from collections.abc import Iterator, Sequence
+from typing import IO, TYPE_CHECKING, Any
+from collections.abc import Iterable, Iterator, Sequence
 
 from . import errors as e
 from . import pq
 from ._compat import Self
 from ._acompat import Queue, Worker, gather, spawn
-from ._copy_base import MAX_BUFFER_SIZE, PREFER_FLUSH, QUEUE_SIZE, BaseCopy
+from ._copy_base import MAX_BUFFER_SIZE, PREFER_FLUSH, QUEUE_SIZE, BaseCopy, ReadAhead
+from ._copy_base import WriteBehind
 from .generators import copy_end, copy_to
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from .abc import Buffer
     from .cursor import Cursor
     from .connection import Connection  # noqa: F401
@@ -39,6 +43,14 @@ class Copy(BaseCopy["Connection[Any]"]):
     :param binary: if `!True`, write binary format.
     :param writer: the object to write to destination. If not specified, write
         to the `!cursor` connection.
+    :param format_workers: if greater than 0, format the records passed to
+        `write_row()` in batches using this number of threads.
+    :param buffer_size: size of the data to accumulate before writing it.
+    :param max_buffer_size: max size of a buffer passed to the libpq; larger
+        buffers are split.
+    :param prefer_flush: if `!True`, flush the connection after each buffer
+        written. Only used if `!writer` is not specified; otherwise configure
+        the writer itself.
 
     Choosing `!binary` is not necessary if the cursor has executed a
     :sql:`COPY` operation, because the operation result describes the format
@@ -57,13 +69,26 @@ class Copy(BaseCopy["Connection[Any]"]):
         *,
         binary: bool | None = None,
         writer: Writer | None = None,
+        format_workers: int = 0,
+        buffer_size: int | None = None,
+        max_buffer_size: int | None = None,
+        prefer_flush: bool | None = None,
     ):
-        super().__init__(cursor, binary=binary)
+        super().__init__(
+            cursor,
+            binary=binary,
+            format_workers=format_workers,
+            buffer_size=buffer_size,
+            max_buffer_size=max_buffer_size,
+        )
         if not writer:
-            writer = LibpqWriter(cursor)
+            writer = LibpqWriter(
+                cursor, max_buffer_size=max_buffer_size, prefer_flush=prefer_flush
+            )
+        elif prefer_flush is not None:
+            raise e.ProgrammingError("prefer_flush cannot be used with a custom writer")
 
         self.writer = writer
-        self._write = writer.write
 
     def __enter__(self) -> Self:
         self._enter()
@@ -92,6 +117,38 @@ class Copy(BaseCopy["Connection[Any]"]):
         """
         return self.connection.wait(self._read_gen())
 
+    def read_into(
+        self, file: int | IO[bytes], *, compression: str | None = None
+    ) -> int:
+        """
+        Write all the data of a :sql:`COPY TO` operation into a file.
+
+        :param file: The file to write into: either a file descriptor or a
+            file object opened in binary mode.
+        :param compression: If specified, compress the data written using
+            this format (``gzip`` or ``zstd``).
+        :return: The number of bytes received, before compression.
+        """
+        if not compression:
+            return self.connection.wait(self._read_into_gen(file))
+        writer = WriteBehind(file, compression)
+        nbytes = 0
+        future: Future[None] | None = None
+        try:
+            # Receive the next chunks of data while the current ones are
+            # compressed and written.
+            while chunks := self.connection.wait(self._read_chunks_gen()):
+                if future:
+                    future.result()
+                future = writer.write(chunks)
+                nbytes += sum(map(len, chunks))
+            if future:
+                future.result()
+        finally:
+            writer.close().result()
+
+        return nbytes
+
     def rows(self) -> Iterator[tuple[Any, ...]]:
         """
         Iterate on the result of a :sql:`COPY TO` operation record by record.
@@ -120,12 +177,65 @@ class Copy(BaseCopy["Connection[Any]"]):
         If the :sql:`COPY` is in binary format `!buffer` must be `!bytes`. In
         text mode it can be either `!bytes` or `!str`.
         """
+        if self._format_pool:
+            self._write_formatted(self._format_pool.flush())
         if data := self.formatter.write(buffer):
             self._write(data)
 
+    def write_from(
+        self, file: int | IO[bytes], *, compression: str | None = None
+    ) -> int:
+        """
+        Write all the data of a file to a table after a :sql:`COPY FROM`
+        operation.
+
+        :param file: The file to read from: either a file descriptor or a
+            file object opened in binary mode.
+        :param compression: If specified, decompress the data read using
+            this format (``gzip`` or ``zstd``).
+        :return: The number of bytes written, after decompression.
+        """
+        reader = ReadAhead(file, compression, self.formatter.max_buffer_size)
+        nbytes = 0
+        try:
+            # Read the next chunk of data while the current one is written.
+            future = reader.read()
+            while True:
+                data = future.result()
+                if not data:
+                    break
+                future = reader.read()
+                self.write(data)
+                nbytes += len(data)
+        finally:
+            reader.close().result()
+
+        return nbytes
+
     def write_row(self, row: Sequence[Any]) -> None:
         """Write a record to a table after a :sql:`COPY FROM` operation."""
-        if data := self.formatter.write_row(row):
+        if self._format_pool:
+            self._write_formatted(self._format_pool.write_row(row))
+        elif data := self.formatter.write_row(row):
+            self._write(data)
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Write several records to a table after a :sql:`COPY FROM` operation."""
+        if self._format_pool:
+            for row in rows:
+                self._write_formatted(self._format_pool.write_row(row))
+        else:
+            for data in self.formatter.write_rows(rows):
+                self._write(data)
+
+    def write_columns(self, columns: Sequence[Any]) -> None:
+        """
+        Write records to a table after a :sql:`COPY FROM` operation, passing
+        the data column by column.
+        """
+        if self._format_pool:
+            self._write_formatted(self._format_pool.flush())
+        for data in self.formatter.write_columns(columns):
             self._write(data)
 
     def finish(self, exc: BaseException | None) -> None:
@@ -136,10 +246,26 @@ class Copy(BaseCopy["Connection[Any]"]):
         using the `Copy` object outside a block.
         """
         if self._direction == COPY_IN:
+            if pool := self._format_pool:
+                try:
+                    if not exc:
+                        self._write_formatted(pool.flush())
+                except BaseException as ex:
+                    # A record failed to format: terminate the copy with error.
+                    self.writer.finish(ex)
+                    self._finished = True
+                    raise
+                finally:
+                    pool.close()
+
             if not exc:
                 if data := self.formatter.end():
                     self._write(data)
-            self.writer.finish(exc)
+            t0 = monotonic()
+            try:
+                self.writer.finish(exc)
+            finally:
+                self._write_time += monotonic() - t0
             self._finished = True
         else:
             if not exc:
@@ -155,6 +281,26 @@ class Copy(BaseCopy["Connection[Any]"]):
             self.connection._try_cancel()
             self.connection.wait(self._end_copy_out_gen())
 
+    def get_stats(self) -> dict[str, int]:
+        rv = super().get_stats()
+        if isinstance(self.writer, QueuedLibpqWriter):
+            rv[self._QUEUE_MAX] = self.writer._queue_max
+        return rv
+
+    def _write(self, data: Buffer) -> None:
+        t0 = monotonic()
+        try:
+            self.writer.write(data)
+        finally:
+            self._write_time += monotonic() - t0
+        self._bytes_written += len(data)
+
+    def _write_formatted(self, futures: list[Future[Buffer]]) -> None:
+        for future in futures:
+            data = future.result()
+            if data:
+                self._write(data)
+
 
 class Writer(ABC):
     """
@@ -182,24 +328,30 @@ class LibpqWriter(Writer):
 
     __module__ = "psycopg.copy"
 
-    def __init__(self, cursor: Cursor[Any]):
+    def __init__(
+        self,
+        cursor: Cursor[Any],
+        *,
+        max_buffer_size: int | None = None,
+        prefer_flush: bool | None = None,
+    ):
         self.cursor = cursor
         self.connection = cursor.connection
         self._pgconn = self.connection.pgconn
+        self.max_buffer_size = max_buffer_size or MAX_BUFFER_SIZE
+        self.prefer_flush = PREFER_FLUSH if prefer_flush is None else prefer_flush
 
     def write(self, data: Buffer) -> None:
-        if len(data) <= MAX_BUFFER_SIZE:
+        if len(data) <= (size := self.max_buffer_size):
             # Most used path: we don't need to split the buffer in smaller
             # bits, so don't make a copy.
-            self.connection.wait(copy_to(self._pgconn, data, flush=PREFER_FLUSH))
+            self.connection.wait(copy_to(self._pgconn, data, flush=self.prefer_flush))
         else:
             # Copy a buffer too large in chunks to avoid causing a memory
             # error in the libpq, which may cause an infinite loop (#255).
-            for i in range(0, len(data), MAX_BUFFER_SIZE):
+            for i in range(0, len(data), size):
                 self.connection.wait(
-                    copy_to(
-                        self._pgconn, data[i : i + MAX_BUFFER_SIZE], flush=PREFER_FLUSH
-                    )
+                    copy_to(self._pgconn, data[i : i + size], flush=self.prefer_flush)
                 )
 
     def finish(self, exc: BaseException | None = None) -> None:
@@ -226,34 +378,51 @@ class QueuedLibpqWriter(LibpqWriter):
     """
     `Writer` using a buffer to queue data to write.
 
-    `write()` returns immediately, so that the main thread can be CPU-bound
-    formatting messages, while a worker thread can be IO-bound waiting to write
-    on the connection.
+    `write()` returns immediately, so that the caller can be CPU-bound
+    formatting messages, while a separate worker can be IO-bound waiting to
+    write on the connection.
     """
 
     __module__ = "psycopg.copy"
 
-    def __init__(self, cursor: Cursor[Any]):
-        super().__init__(cursor)
+    def __init__(
+        self,
+        cursor: Cursor[Any],
+        *,
+        max_buffer_size: int | None = None,
+        prefer_flush: bool | None = None,
+        queue_size: int | None = None,
+    ):
+        super().__init__(
+            cursor, max_buffer_size=max_buffer_size, prefer_flush=prefer_flush
+        )
 
-        self._queue: Queue[Buffer] = Queue(maxsize=QUEUE_SIZE)
+        self._queue: Queue[Buffer] = Queue(maxsize=queue_size or QUEUE_SIZE)
+        self._queue_max = 0  # high-water mark of the queue
         self._worker: Worker | None = None
         self._worker_error: BaseException | None = None
 
     def worker(self) -> None:
         """Push data to the server when available from the copy queue.
 
-        Terminate reading when the queue receives a false-y value, or in case
-        of error.
+        Terminate reading when the queue receives a false-y value. In case of
+        error, discard the data received until then.
 
         The function is designed to be run in a separate task.
         """
         try:
             while data := self._queue.get():
-                self.connection.wait(copy_to(self._pgconn, data, flush=PREFER_FLUSH))
+                self.connection.wait(
+                    copy_to(self._pgconn, data, flush=self.prefer_flush)
+                )
         except BaseException as ex:
             # Propagate the error to the main thread.
             self._worker_error = ex
+            if isinstance(ex, Exception):
+                # Keep consuming the queue, otherwise a writer waiting on a
+                # full queue, or adding the end marker, would block forever.
+                while self._queue.get():
+                    pass
 
     def write(self, data: Buffer) -> None:
         if not self._worker:
@@ -264,15 +433,18 @@ class QueuedLibpqWriter(LibpqWriter):
         if self._worker_error:
             raise self._worker_error
 
-        if len(data) <= MAX_BUFFER_SIZE:
+        if len(data) <= (size := self.max_buffer_size):
             # Most used path: we don't need to split the buffer in smaller
             # bits, so don't make a copy.
             self._queue.put(data)
         else:
             # Copy a buffer too large in chunks to avoid causing a memory
             # error in the libpq, which may cause an infinite loop (#255).
-            for i in range(0, len(data), MAX_BUFFER_SIZE):
-                self._queue.put(data[i : i + MAX_BUFFER_SIZE])
+            for i in range(0, len(data), size):
+                self._queue.put(data[i : i + size])
+
+        if (qsize := self._queue.qsize()) > self._queue_max:
+            self._queue_max = qsize
 
     def finish(self, exc: BaseException | None = None) -> None:
         self._queue.put(b"")
@@ -283,6 +455,12 @@ class QueuedLibpqWriter(LibpqWriter):
 
         # Check if the worker thread raised any exception before terminating.
         if self._worker_error:
+            # Terminate the copy on the server, if the connection allows it,
+            # then report the error to the caller.
+            try:
+                super().finish(self._worker_error)
+            except e.Error:
+                pass
             raise self._worker_error
 
         super().finish(exc)
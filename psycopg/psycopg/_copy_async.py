@@ -7,18 +7,25 @@ Objects to support the COPY protocol (async version).
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from time import monotonic
 from types import TracebackType
-from typing import TYPE_CHECKING, Any
-from collections.abc import AsyncIterator, Sequence
+from typing import IO, TYPE_CHECKING, Any
+from collections.abc import AsyncIterator, Iterable, Sequence
 
 from . import errors as e
 from . import pq
 from ._compat import Self
 from ._acompat import AQueue, AWorker, agather, aspawn
-from ._copy_base import MAX_BUFFER_SIZE, PREFER_FLUSH, QUEUE_SIZE, BaseCopy
+from ._copy_base import MAX_BUFFER_SIZE, PREFER_FLUSH, QUEUE_SIZE, BaseCopy, ReadAhead
+from ._copy_base import WriteBehind
 from .generators import copy_end, copy_to
 
+if True:  # ASYNC
+    import asyncio
+
 if TYPE_CHECKING:
+    from concurrent.futures import Future
+
     from .abc import Buffer
     from .cursor_async import AsyncCursor
     from .connection_async import AsyncConnection  # noqa: F401
@@ -36,6 +43,14 @@ class AsyncCopy(BaseCopy["AsyncConnection[Any]"]):
     :param binary: if `!True`, write binary format.
     :param writer: the object to write to destination. If not specified, write
         to the `!cursor` connection.
+    :param format_workers: if greater than 0, format the records passed to
+        `write_row()` in batches using this number of threads.
+    :param buffer_size: size of the data to accumulate before writing it.
+    :param max_buffer_size: max size of a buffer passed to the libpq; larger
+        buffers are split.
+    :param prefer_flush: if `!True`, flush the connection after each buffer
+        written. Only used if `!writer` is not specified; otherwise configure
+        the writer itself.
 
     Choosing `!binary` is not necessary if the cursor has executed a
     :sql:`COPY` operation, because the operation result describes the format
@@ -54,13 +69,26 @@ class AsyncCopy(BaseCopy["AsyncConnection[Any]"]):
         *,
         binary: bool | None = None,
         writer: AsyncWriter | None = None,
+        format_workers: int = 0,
+        buffer_size: int | None = None,
+        max_buffer_size: int | None = None,
+        prefer_flush: bool | None = None,
     ):
-        super().__init__(cursor, binary=binary)
+        super().__init__(
+            cursor,
+            binary=binary,
+            format_workers=format_workers,
+            buffer_size=buffer_size,
+            max_buffer_size=max_buffer_size,
+        )
         if not writer:
-            writer = AsyncLibpqWriter(cursor)
+            writer = AsyncLibpqWriter(
+                cursor, max_buffer_size=max_buffer_size, prefer_flush=prefer_flush
+            )
+        elif prefer_flush is not None:
+            raise e.ProgrammingError("prefer_flush cannot be used with a custom writer")
 
         self.writer = writer
-        self._write = writer.write
 
     async def __aenter__(self) -> Self:
         self._enter()
@@ -89,6 +117,52 @@ class AsyncCopy(BaseCopy["AsyncConnection[Any]"]):
         """
         return await self.connection.wait(self._read_gen())
 
+    async def read_into(
+        self, file: int | IO[bytes], *, compression: str | None = None
+    ) -> int:
+        """
+        Write all the data of a :sql:`COPY TO` operation into a file.
+
+        :param file: The file to write into: either a file descriptor or a
+            file object opened in binary mode.
+        :param compression: If specified, compress the data written using
+            this format (``gzip`` or ``zstd``).
+        :return: The number of bytes received, before compression.
+        """
+        if True:  # ASYNC
+            # Write the file in a worker thread, even without compression, in
+            # order not to block the event loop.
+            writer = WriteBehind(file, compression)
+        else:
+            if not compression:
+                return await self.connection.wait(self._read_into_gen(file))
+            writer = WriteBehind(file, compression)
+        nbytes = 0
+        future: Future[None] | None = None
+        try:
+            # Receive the next chunks of data while the current ones are
+            # compressed and written.
+            while chunks := await self.connection.wait(self._read_chunks_gen()):
+                if future:
+                    if True:  # ASYNC
+                        await asyncio.wrap_future(future)
+                    else:
+                        future.result()
+                future = writer.write(chunks)
+                nbytes += sum(map(len, chunks))
+            if future:
+                if True:  # ASYNC
+                    await asyncio.wrap_future(future)
+                else:
+                    future.result()
+        finally:
+            if True:  # ASYNC
+                await asyncio.wrap_future(writer.close())
+            else:
+                writer.close().result()
+
+        return nbytes
+
     async def rows(self) -> AsyncIterator[tuple[Any, ...]]:
         """
         Iterate on the result of a :sql:`COPY TO` operation record by record.
@@ -117,12 +191,71 @@ class AsyncCopy(BaseCopy["AsyncConnection[Any]"]):
         If the :sql:`COPY` is in binary format `!buffer` must be `!bytes`. In
         text mode it can be either `!bytes` or `!str`.
         """
+        if self._format_pool:
+            await self._write_formatted(self._format_pool.flush())
         if data := self.formatter.write(buffer):
             await self._write(data)
 
+    async def write_from(
+        self, file: int | IO[bytes], *, compression: str | None = None
+    ) -> int:
+        """
+        Write all the data of a file to a table after a :sql:`COPY FROM`
+        operation.
+
+        :param file: The file to read from: either a file descriptor or a
+            file object opened in binary mode.
+        :param compression: If specified, decompress the data read using
+            this format (``gzip`` or ``zstd``).
+        :return: The number of bytes written, after decompression.
+        """
+        reader = ReadAhead(file, compression, self.formatter.max_buffer_size)
+        nbytes = 0
+        try:
+            # Read the next chunk of data while the current one is written.
+            future = reader.read()
+            while True:
+                if True:  # ASYNC
+                    data = await asyncio.wrap_future(future)
+                else:
+                    data = future.result()
+                if not data:
+                    break
+                future = reader.read()
+                await self.write(data)
+                nbytes += len(data)
+        finally:
+            if True:  # ASYNC
+                await asyncio.wrap_future(reader.close())
+            else:
+                reader.close().result()
+
+        return nbytes
+
     async def write_row(self, row: Sequence[Any]) -> None:
         """Write a record to a table after a :sql:`COPY FROM` operation."""
-        if data := self.formatter.write_row(row):
+        if self._format_pool:
+            await self._write_formatted(self._format_pool.write_row(row))
+        elif data := self.formatter.write_row(row):
+            await self._write(data)
+
+    async def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Write several records to a table after a :sql:`COPY FROM` operation."""
+        if self._format_pool:
+            for row in rows:
+                await self._write_formatted(self._format_pool.write_row(row))
+        else:
+            for data in self.formatter.write_rows(rows):
+                await self._write(data)
+
+    async def write_columns(self, columns: Sequence[Any]) -> None:
+        """
+        Write records to a table after a :sql:`COPY FROM` operation, passing
+        the data column by column.
+        """
+        if self._format_pool:
+            await self._write_formatted(self._format_pool.flush())
+        for data in self.formatter.write_columns(columns):
             await self._write(data)
 
     async def finish(self, exc: BaseException | None) -> None:
@@ -133,10 +266,26 @@ class AsyncCopy(BaseCopy["AsyncConnection[Any]"]):
         using the `Copy` object outside a block.
         """
         if self._direction == COPY_IN:
+            if pool := self._format_pool:
+                try:
+                    if not exc:
+                        await self._write_formatted(pool.flush())
+                except BaseException as ex:
+                    # A record failed to format: terminate the copy with error.
+                    await self.writer.finish(ex)
+                    self._finished = True
+                    raise
+                finally:
+                    pool.close()
+
             if not exc:
                 if data := self.formatter.end():
                     await self._write(data)
-            await self.writer.finish(exc)
+            t0 = monotonic()
+            try:
+                await self.writer.finish(exc)
+            finally:
+                self._write_time += monotonic() - t0
             self._finished = True
         else:
             if not exc:
@@ -154,6 +303,29 @@ class AsyncCopy(BaseCopy["AsyncConnection[Any]"]):
             await self.connection._try_cancel()
             await self.connection.wait(self._end_copy_out_gen())
 
+    def get_stats(self) -> dict[str, int]:
+        rv = super().get_stats()
+        if isinstance(self.writer, AsyncQueuedLibpqWriter):
+            rv[self._QUEUE_MAX] = self.writer._queue_max
+        return rv
+
+    async def _write(self, data: Buffer) -> None:
+        t0 = monotonic()
+        try:
+            await self.writer.write(data)
+        finally:
+            self._write_time += monotonic() - t0
+        self._bytes_written += len(data)
+
+    async def _write_formatted(self, futures: list[Future[Buffer]]) -> None:
+        for future in futures:
+            if True:  # ASYNC
+                data = await asyncio.wrap_future(future)
+            else:
+                data = future.result()
+            if data:
+                await self._write(data)
+
 
 class AsyncWriter(ABC):
     """
@@ -181,24 +353,32 @@ class AsyncLibpqWriter(AsyncWriter):
 
     __module__ = "psycopg.copy"
 
-    def __init__(self, cursor: AsyncCursor[Any]):
+    def __init__(
+        self,
+        cursor: AsyncCursor[Any],
+        *,
+        max_buffer_size: int | None = None,
+        prefer_flush: bool | None = None,
+    ):
         self.cursor = cursor
         self.connection = cursor.connection
         self._pgconn = self.connection.pgconn
+        self.max_buffer_size = max_buffer_size or MAX_BUFFER_SIZE
+        self.prefer_flush = PREFER_FLUSH if prefer_flush is None else prefer_flush
 
     async def write(self, data: Buffer) -> None:
-        if len(data) <= MAX_BUFFER_SIZE:
+        if len(data) <= (size := self.max_buffer_size):
             # Most used path: we don't need to split the buffer in smaller
             # bits, so don't make a copy.
-            await self.connection.wait(copy_to(self._pgconn, data, flush=PREFER_FLUSH))
+            await self.connection.wait(
+                copy_to(self._pgconn, data, flush=self.prefer_flush)
+            )
         else:
             # Copy a buffer too large in chunks to avoid causing a memory
             # error in the libpq, which may cause an infinite loop (#255).
-            for i in range(0, len(data), MAX_BUFFER_SIZE):
+            for i in range(0, len(data), size):
                 await self.connection.wait(
-                    copy_to(
-                        self._pgconn, data[i : i + MAX_BUFFER_SIZE], flush=PREFER_FLUSH
-                    )
+                    copy_to(self._pgconn, data[i : i + size], flush=self.prefer_flush)
                 )
 
     async def finish(self, exc: BaseException | None = None) -> None:
@@ -225,36 +405,51 @@ class AsyncQueuedLibpqWriter(AsyncLibpqWriter):
     """
     `AsyncWriter` using a buffer to queue data to write.
 
-    `write()` returns immediately, so that the main thread can be CPU-bound
-    formatting messages, while a worker thread can be IO-bound waiting to write
-    on the connection.
+    `write()` returns immediately, so that the caller can be CPU-bound
+    formatting messages, while a separate worker can be IO-bound waiting to
+    write on the connection.
     """
 
     __module__ = "psycopg.copy"
 
-    def __init__(self, cursor: AsyncCursor[Any]):
-        super().__init__(cursor)
+    def __init__(
+        self,
+        cursor: AsyncCursor[Any],
+        *,
+        max_buffer_size: int | None = None,
+        prefer_flush: bool | None = None,
+        queue_size: int | None = None,
+    ):
+        super().__init__(
+            cursor, max_buffer_size=max_buffer_size, prefer_flush=prefer_flush
+        )
 
-        self._queue: AQueue[Buffer] = AQueue(maxsize=QUEUE_SIZE)
+        self._queue: AQueue[Buffer] = AQueue(maxsize=queue_size or QUEUE_SIZE)
+        self._queue_max = 0  # high-water mark of the queue
         self._worker: AWorker | None = None
         self._worker_error: BaseException | None = None
 
     async def worker(self) -> None:
         """Push data to the server when available from the copy queue.
 
-        Terminate reading when the queue receives a false-y value, or in case
-        of error.
+        Terminate reading when the queue receives a false-y value. In case of
+        error, discard the data received until then.
 
         The function is designed to be run in a separate task.
         """
         try:
             while data := (await self._queue.get()):
                 await self.connection.wait(
-                    copy_to(self._pgconn, data, flush=PREFER_FLUSH)
+                    copy_to(self._pgconn, data, flush=self.prefer_flush)
                 )
         except BaseException as ex:
             # Propagate the error to the main thread.
             self._worker_error = ex
+            if isinstance(ex, Exception):
+                # Keep consuming the queue, otherwise a writer waiting on a
+                # full queue, or adding the end marker, would block forever.
+                while await self._queue.get():
+                    pass
 
     async def write(self, data: Buffer) -> None:
         if not self._worker:
@@ -265,15 +460,18 @@ class AsyncQueuedLibpqWriter(AsyncLibpqWriter):
         if self._worker_error:
             raise self._worker_error
 
-        if len(data) <= MAX_BUFFER_SIZE:
+        if len(data) <= (size := self.max_buffer_size):
             # Most used path: we don't need to split the buffer in smaller
             # bits, so don't make a copy.
             await self._queue.put(data)
         else:
             # Copy a buffer too large in chunks to avoid causing a memory
             # error in the libpq, which may cause an infinite loop (#255).
-            for i in range(0, len(data), MAX_BUFFER_SIZE):
-                await self._queue.put(data[i : i + MAX_BUFFER_SIZE])
+            for i in range(0, len(data), size):
+                await self._queue.put(data[i : i + size])
+
+        if (qsize := self._queue.qsize()) > self._queue_max:
+            self._queue_max = qsize
 
     async def finish(self, exc: BaseException | None = None) -> None:
         await self._queue.put(b"")
@@ -284,6 +482,12 @@ class AsyncQueuedLibpqWriter(AsyncLibpqWriter):
 
         # Check if the worker thread raised any exception before terminating.
         if self._worker_error:
+            # Terminate the copy on the server, if the connection allows it,
+            # then report the error to the caller.
+            try:
+                await super().finish(self._worker_error)
+            except e.Error:
+                pass
             raise self._worker_error
 
         await super().finish(exc)
@@ -6,22 +6,31 @@ psycopg copy support
 
 from __future__ import annotations
 
+import os
 import re
 import sys
+import gzip
 import struct
+import selectors
+from io import BufferedIOBase
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Generic
-from collections.abc import Sequence
+from time import monotonic
+from typing import IO, TYPE_CHECKING, Any, Generic, Literal, cast
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from . import adapt
 from . import errors as e
 from . import pq
-from .abc import Buffer, ConnectionType, PQGen, Transformer
+from .abc import AdaptContext, Buffer, ConnectionType, PQGen, Transformer
 from .pq.misc import connection_summary
 from ._cmodule import _psycopg
-from .generators import copy_from
+from .generators import copy_from, copy_from_into
+from .types.numpy import column_values, format_binary_columns
 
 if TYPE_CHECKING:
+    from .pq.abc import PGresult
     from ._cursor_base import BaseCursor
 
 PY_TEXT = adapt.PyFormat.TEXT
@@ -51,6 +60,17 @@ MAX_BUFFER_SIZE = 4 * BUFFER_SIZE
 # Each buffer should be around BUFFER_SIZE size.
 QUEUE_SIZE = 1024
 
+# Size of data to accumulate before writing it to a file in `read_into()`, and
+# max number of chunks to write together (IOV_MAX on most systems).
+READ_BUFFER_SIZE = MAX_BUFFER_SIZE
+READ_MAX_CHUNKS = 1024
+
+# Compression formats supported reading and writing files.
+COMPRESSIONS = ("gzip", "zstd")
+
+# Number of records to format together by a worker of a FormatPool.
+FORMAT_BATCH_SIZE = 1000
+
 # On certain systems, memmove seems particularly slow and flushing often is
 # more performing than accumulating a larger buffer. See #746 for details.
 PREFER_FLUSH = sys.platform == "darwin"
@@ -73,9 +93,23 @@ class BaseCopy(Generic[ConnectionType]):
 
     formatter: Formatter
 
+    # Stats keys
+    _ROWS = "rows"
+    _BYTES_WRITTEN = "bytes_written"
+    _WRITE_MS = "write_ms"
+    _OTHER_MS = "other_ms"
+    _QUEUE_MAX = "queue_max"
+
     def __init__(
-        self, cursor: BaseCursor[ConnectionType, Any], *, binary: bool | None = None
+        self,
+        cursor: BaseCursor[ConnectionType, Any],
+        *,
+        binary: bool | None = None,
+        format_workers: int = 0,
+        buffer_size: int | None = None,
+        max_buffer_size: int | None = None,
     ):
+        self._check_buffer_sizes(buffer_size, max_buffer_size)
         self.cursor = cursor
         self.connection = cursor.connection
         self._pgconn = self.connection.pgconn
@@ -98,8 +132,23 @@ class BaseCopy(Generic[ConnectionType]):
             self.formatter = BinaryFormatter(tx)
         else:
             self.formatter = TextFormatter(tx, encoding=self._pgconn._encoding)
+        if buffer_size is not None:
+            self.formatter.buffer_size = buffer_size
+        if max_buffer_size is not None:
+            self.formatter.max_buffer_size = max_buffer_size
+
+        self._format_pool: FormatPool | None = None
+        if format_workers > 0 and self._direction == COPY_IN:
+            self._format_pool = FormatPool(self.formatter, cursor, format_workers)
 
         self._finished = False
+        # Error received by _read_chunks_gen() after some data, to raise later
+        self._read_error: e.Error | None = None
+
+        # Measures reported by get_stats()
+        self._start_time = monotonic()
+        self._write_time = 0.0
+        self._bytes_written = 0
 
     def __repr__(self) -> str:
         cls = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
@@ -110,6 +159,28 @@ class BaseCopy(Generic[ConnectionType]):
         if self._finished:
             raise TypeError("copy blocks can be used only once")
 
+    @staticmethod
+    def _check_buffer_sizes(
+        buffer_size: int | None, max_buffer_size: int | None
+    ) -> None:
+        if buffer_size is not None and buffer_size < 1:
+            raise ValueError(f"buffer_size must be >= 1, got {buffer_size}")
+        if max_buffer_size is not None and max_buffer_size < 1:
+            raise ValueError(f"max_buffer_size must be >= 1, got {max_buffer_size}")
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        Return statistics about the data written so far by a :sql:`COPY FROM`.
+        """
+        elapsed = int((monotonic() - self._start_time) * 1000)
+        write_ms = int(self._write_time * 1000)
+        return {
+            self._ROWS: self.formatter._rows,
+            self._BYTES_WRITTEN: self._bytes_written,
+            self._WRITE_MS: write_ms,
+            self._OTHER_MS: max(elapsed - write_ms, 0),
+        }
+
     def set_types(self, types: Sequence[int | str]) -> None:
         """
         Set the types expected in a COPY operation.
@@ -134,6 +205,7 @@ class BaseCopy(Generic[ConnectionType]):
 
         if self._direction == COPY_IN:
             self.formatter.transformer.set_dumper_types(oids, self.formatter.format)
+            self.formatter._types = oids
         else:
             self.formatter.transformer.set_loader_types(oids, self.formatter.format)
 
@@ -148,6 +220,47 @@ class BaseCopy(Generic[ConnectionType]):
             return res
 
         # res is the final PGresult
+        self._end_copy_out(res)
+        return memoryview(b"")
+
+    def _read_into_gen(self, file: int | IO[bytes]) -> PQGen[int]:
+        if self._finished:
+            return 0
+
+        write = _writev_fd(file) if isinstance(file, int) else _write_file(file)
+        nbytes, res = yield from copy_from_into(
+            self._pgconn, write, READ_BUFFER_SIZE, READ_MAX_CHUNKS
+        )
+        self._end_copy_out(res)
+        return nbytes
+
+    def _read_chunks_gen(self) -> PQGen[list[memoryview]]:
+        """
+        Receive about `READ_BUFFER_SIZE` bytes of data of a :sql:`COPY TO`.
+
+        Return an empty list when the data is finished.
+        """
+        if self._read_error:
+            ex, self._read_error = self._read_error, None
+            raise ex
+
+        chunks: list[memoryview] = []
+        size = 0
+        try:
+            while size < READ_BUFFER_SIZE and len(chunks) < READ_MAX_CHUNKS:
+                if not (data := (yield from self._read_gen())):
+                    break
+                chunks.append(memoryview(data))
+                size += len(data)
+        except e.Error as ex:
+            if not chunks:
+                raise
+            # Return the data received before the error: raise it next time.
+            self._read_error = ex
+
+        return chunks
+
+    def _end_copy_out(self, res: PGresult) -> None:
         self._finished = True
 
         # This result is a COMMAND_OK which has info about the number of rows
@@ -156,7 +269,6 @@ class BaseCopy(Generic[ConnectionType]):
         # So, don't replace the results in the cursor, just update the rowcount.
         nrows = res.command_tuples
         self.cursor._rowcount = nrows if nrows is not None else -1
-        return memoryview(b"")
 
     def _read_row_gen(self) -> PQGen[tuple[Any, ...] | None]:
         if not (data := (yield from self._read_gen())):
@@ -187,8 +299,12 @@ class Formatter(ABC):
 
     def __init__(self, transformer: Transformer):
         self.transformer = transformer
+        self.buffer_size = BUFFER_SIZE
+        self.max_buffer_size = MAX_BUFFER_SIZE
         self._write_buffer = bytearray()
+        self._rows = 0  # number of records formatted
         self._row_mode = False  # true if the user is using write_row()
+        self._types: Sequence[int] | None = None  # set by Copy.set_types()
 
     @abstractmethod
     def parse_row(self, data: Buffer) -> tuple[Any, ...] | None: ...
@@ -199,9 +315,251 @@ class Formatter(ABC):
     @abstractmethod
     def write_row(self, row: Sequence[Any]) -> Buffer: ...
 
+    def write_columns(self, columns: Sequence[Any]) -> Iterator[Buffer]:
+        """
+        Format the records passed as a sequence of columns.
+
+        Yield the buffers ready to be written.
+        """
+        if len({len(col) for col in columns}) > 1:
+            raise e.DataError("all the columns must have the same length")
+
+        for row in zip(*map(column_values, columns)):
+            if data := self.write_row(row):
+                yield data
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> Iterator[Buffer]:
+        """
+        Format several records.
+
+        Yield the buffers ready to be written.
+        """
+        if data := self._start_rows():
+            self._write_buffer += data
+
+        format_rows = format_rows_binary if self.format else format_rows_text
+        it = iter(rows)
+        while True:
+            nrows = format_rows(
+                it, self.transformer, self._write_buffer, self.buffer_size
+            )
+            if not nrows:
+                break
+            self._rows += nrows
+            if len(self._write_buffer) < self.buffer_size:
+                break
+            buffer, self._write_buffer = self._write_buffer, bytearray()
+            yield buffer
+
     @abstractmethod
     def end(self) -> Buffer: ...
 
+    def _start_rows(self) -> Buffer:
+        """
+        Enter row mode and return the data to send before the first record.
+        """
+        self._row_mode = True
+        return b""
+
+
+class FormatPool:
+    """
+    Format the records of a COPY FROM operation using a pool of threads.
+
+    The records are formatted in batches, each one by a worker thread. The
+    data is returned in the same order the records were received.
+    """
+
+    def __init__(
+        self,
+        formatter: Formatter,
+        context: AdaptContext,
+        workers: int,
+        batch_size: int = FORMAT_BATCH_SIZE,
+    ):
+        self.formatter = formatter
+        self._context = context
+        self._batch_size = batch_size
+        # Number of batches in flight before waiting for the first to complete
+        self._max_pending = 2 * workers
+
+        self._batch: list[Sequence[Any]] = []
+        self._pending: deque[Future[Buffer]] = deque()
+        self._executor = ThreadPoolExecutor(
+            workers, thread_name_prefix="psycopg-copy-format"
+        )
+
+    def write_row(self, row: Sequence[Any]) -> list[Future[Buffer]]:
+        """
+        Add a record to format.
+
+        Return the results of the batches completed, in order. If too many
+        batches are being formatted, return at least the first one, which the
+        caller should wait for.
+        """
+        self._batch.append(row)
+        if len(self._batch) < self._batch_size:
+            return []
+
+        self._submit()
+        rv = []
+        pending = self._pending
+        while pending and (pending[0].done() or len(pending) > self._max_pending):
+            rv.append(pending.popleft())
+        return rv
+
+    def flush(self) -> list[Future[Buffer]]:
+        """
+        Format the records received so far.
+
+        Return the results of all the batches not returned yet, in order.
+        """
+        if self._batch:
+            self._submit()
+        rv = list(self._pending)
+        self._pending.clear()
+        return rv
+
+    def close(self) -> None:
+        """
+        Terminate the worker threads, discarding the records not formatted.
+        """
+        self._batch.clear()
+        self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self) -> None:
+        batch, self._batch = self._batch, []
+        self.formatter._rows += len(batch)
+        header = b"" if self.formatter._row_mode else self.formatter._start_rows()
+        self._pending.append(self._executor.submit(self._format, batch, header))
+
+    def _format(self, batch: list[Sequence[Any]], header: Buffer) -> Buffer:
+        # The transformer is not thread-safe: use a new one for each batch.
+        tx = adapt.Transformer(self._context)
+        if (types := self.formatter._types) is not None:
+            tx.set_dumper_types(types, self.formatter.format)
+
+        format_rows = format_rows_binary if self.formatter.format else format_rows_text
+        out = bytearray(header)
+        format_rows(iter(batch), tx, out, sys.maxsize)
+        return out
+
+
+class ReadAhead:
+    """
+    Read the data of a file to copy, decompressing it if requested.
+
+    Reading happens in a worker thread: the caller can request the next chunk
+    of data before writing the previous one, so that reading and writing
+    overlap, while keeping only a couple of chunks in memory.
+    """
+
+    def __init__(
+        self, file: int | IO[bytes], compression: str | None = None, size: int = 0
+    ):
+        self._size = size or MAX_BUFFER_SIZE
+        # The file objects created here, to close in order.
+        self._owned: list[IO[bytes] | BufferedIOBase] = []
+
+        if isinstance(file, int):
+            file = open(file, "rb", closefd=False)
+            self._owned.append(file)
+
+        self._file: IO[bytes] | BufferedIOBase = file
+        if compression:
+            self._file = open_compressed(file, compression, "rb")
+            self._owned.insert(0, self._file)
+
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="psycopg-copy-read")
+
+    def read(self) -> Future[bytes]:
+        """
+        Start reading the next chunk of data.
+
+        The result of the future is an empty string at the end of the file.
+        """
+        return self._executor.submit(self._file.read, self._size)
+
+    def close(self) -> Future[None]:
+        """
+        Close the file objects created, after the pending reads, and terminate
+        the worker thread.
+
+        Return a future completed when the files are closed.
+        """
+        future = self._executor.submit(self._close_files)
+        self._executor.shutdown(wait=False)
+        return future
+
+    def _close_files(self) -> None:
+        for f in self._owned:
+            f.close()
+
+
+class WriteBehind:
+    """
+    Write the data received by a copy into a file, compressing it if requested.
+
+    Compressing and writing happen in a worker thread: the caller can receive
+    the next chunks of data while writing the previous ones, so that receiving
+    and compressing overlap, without blocking the caller (or an event loop).
+    """
+
+    def __init__(self, file: int | IO[bytes], compression: str | None = None):
+        # The file objects created here, to close in order.
+        self._owned: list[IO[bytes] | BufferedIOBase] = []
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="psycopg-copy-write")
+
+        self._opened: Future[None] | None = None
+        if not compression:
+            self._write = (
+                _writev_fd(file) if isinstance(file, int) else _write_file(file)
+            )
+            return
+
+        if isinstance(file, int):
+            file = open(file, "wb", closefd=False)
+            self._owned.append(file)
+
+        # Opening the compressed file may write a header already: do it in the
+        # worker thread too, before the writes.
+        self._opened = self._executor.submit(self._open, file, compression)
+
+    def write(self, chunks: list[memoryview]) -> Future[None]:
+        """
+        Start writing a list of chunks of data.
+        """
+        return self._executor.submit(self._write_chunks, chunks)
+
+    def close(self) -> Future[None]:
+        """
+        Close the file objects created, after the pending writes, and terminate
+        the worker thread.
+
+        Return a future completed when the files are closed.
+        """
+        # Closing the compressed file flushes the last data.
+        future = self._executor.submit(self._close_files)
+        self._executor.shutdown(wait=False)
+        return future
+
+    def _open(self, file: IO[bytes], compression: str) -> None:
+        zfile = open_compressed(file, compression, "wb")
+        self._owned.insert(0, zfile)
+        self._write = _write_file(zfile)
+
+    def _write_chunks(self, chunks: list[memoryview]) -> None:
+        if self._opened:
+            self._opened.result()  # raise the error opening the file, if any
+        self._write(chunks)
+
+    def _close_files(self) -> None:
+        for f in self._owned:
+            f.close()
+        if self._opened:
+            self._opened.result()
+
 
 class TextFormatter(Formatter):
     format = TEXT
@@ -228,7 +586,8 @@ class TextFormatter(Formatter):
         self._row_mode = True
 
         format_row_text(row, self.transformer, self._write_buffer)
-        if len(self._write_buffer) > BUFFER_SIZE:
+        self._rows += 1
+        if len(self._write_buffer) > self.buffer_size:
             buffer, self._write_buffer = self._write_buffer, bytearray()
             return buffer
         else:
@@ -286,12 +645,39 @@ class BinaryFormatter(Formatter):
             self._signature_sent = True
 
         format_row_binary(row, self.transformer, self._write_buffer)
-        if len(self._write_buffer) > BUFFER_SIZE:
+        self._rows += 1
+        if len(self._write_buffer) > self.buffer_size:
             buffer, self._write_buffer = self._write_buffer, bytearray()
             return buffer
         else:
             return b""
 
+    def _start_rows(self) -> Buffer:
+        self._row_mode = True
+        if self._signature_sent:
+            return b""
+        self._signature_sent = True
+        return _binary_signature
+
+    def write_columns(self, columns: Sequence[Any]) -> Iterator[Buffer]:
+        # Try to format numpy arrays in bulk, otherwise fall back to row by row.
+        chunks = format_binary_columns(columns, self._types, self.max_buffer_size)
+        if chunks is None:
+            yield from super().write_columns(columns)
+            return
+
+        self._row_mode = True
+        self._rows += len(columns[0])
+        if not self._signature_sent:
+            self._write_buffer += _binary_signature
+            self._signature_sent = True
+
+        if self._write_buffer:
+            buffer, self._write_buffer = self._write_buffer, bytearray()
+            yield buffer
+
+        yield from chunks
+
     def end(self) -> Buffer:
         # If we have sent no data we need to send the signature
         # and the trailer
@@ -347,6 +733,40 @@ def _format_row_binary(row: Sequence[Any], tx: Transformer, out: bytearray) -> N
             out += _binary_null
 
 
+def _format_rows_text(
+    rows: Iterator[Sequence[Any]], tx: Transformer, out: bytearray, size: int
+) -> int:
+    """
+    Convert rows to the data to send for copy until `!out` reaches `!size`.
+
+    Return the number of rows converted.
+    """
+    nrows = 0
+    for row in rows:
+        _format_row_text(row, tx, out)
+        nrows += 1
+        if len(out) >= size:
+            break
+    return nrows
+
+
+def _format_rows_binary(
+    rows: Iterator[Sequence[Any]], tx: Transformer, out: bytearray, size: int
+) -> int:
+    """
+    Convert rows to the data to send for binary copy until `!out` reaches `!size`.
+
+    Return the number of rows converted.
+    """
+    nrows = 0
+    for row in rows:
+        _format_row_binary(row, tx, out)
+        nrows += 1
+        if len(out) >= size:
+            break
+    return nrows
+
+
 def _parse_row_text(data: Buffer, tx: Transformer) -> tuple[Any, ...]:
     if not isinstance(data, bytes):
         data = bytes(data)
@@ -372,6 +792,97 @@ def _parse_row_binary(data: Buffer, tx: Transformer) -> tuple[Any, ...]:
     return tx.load_sequence(row)
 
 
+def _writev_fd(fd: int) -> Callable[[list[memoryview]], None]:
+    """Return a function writing lists of buffers to a file descriptor."""
+    if not hasattr(os, "writev"):  # Windows
+        return lambda chunks: _write_fd(fd, b"".join(chunks))
+
+    def writev(chunks: list[memoryview]) -> None:
+        try:
+            n = os.writev(fd, chunks)
+        except BlockingIOError:
+            n = 0
+        if n < sum(map(len, chunks)):
+            # Partial write: write the rest
+            _write_fd(fd, memoryview(b"".join(chunks))[n:])
+
+    return writev
+
+
+def _write_fd(fd: int, data: Buffer) -> None:
+    view = memoryview(data)
+    while view:
+        try:
+            view = view[os.write(fd, view) :]
+        except BlockingIOError:
+            # A non-blocking file descriptor, such as a socket, is full.
+            _wait_writable(fd)
+
+
+def _wait_writable(fd: int) -> None:
+    with selectors.DefaultSelector() as sel:
+        sel.register(fd, selectors.EVENT_WRITE)
+        sel.select()
+
+
+def _write_file(
+    f: IO[bytes] | BufferedIOBase,
+) -> Callable[[list[memoryview]], None]:
+    """Return a function writing lists of buffers to a file object."""
+
+    def write(chunks: list[memoryview]) -> None:
+        f.write(chunks[0] if len(chunks) == 1 else b"".join(chunks))
+
+    return write
+
+
+def open_compressed(
+    file: IO[bytes], compression: str, mode: Literal["rb", "wb"]
+) -> BufferedIOBase:
+    """
+    Return a file object compressing or decompressing data from `!file`.
+
+    :param compression: one of `COMPRESSIONS`.
+
+    Closing the returned object doesn't close `!file`.
+    """
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=file, mode=mode)
+
+    elif compression == "zstd":
+        zfile: BufferedIOBase
+        try:
+            from compression import zstd  # Python >= 3.14
+        except ImportError:
+            pass
+        else:
+            zfile = zstd.ZstdFile(file, mode)
+            return zfile
+
+        try:
+            import zstandard
+        except ImportError:
+            raise e.NotSupportedError(
+                "zstd compression requires Python 3.14 or the 'zstandard' package"
+            ) from None
+
+        # The zstandard objects implement the file interface without
+        # subclassing the io classes.
+        if mode == "rb":
+            zobj: Any = zstandard.ZstdDecompressor().stream_reader(
+                file, read_across_frames=True, closefd=False
+            )
+        else:
+            zobj = zstandard.ZstdCompressor().stream_writer(file, closefd=False)
+        return cast(BufferedIOBase, zobj)
+
+    else:
+        raise ValueError(
+            f"compression must be one of {', '.join(COMPRESSIONS)};"
+            f" got {compression!r}"
+        )
+
+
 _pack_int2 = struct.Struct("!h").pack
 _pack_int4 = struct.Struct("!i").pack
 _unpack_int2 = struct.Struct("!h").unpack_from
@@ -413,11 +924,15 @@ def _load_sub(m: re.Match[bytes], __map: dict[bytes, bytes] = _load_repl) -> byt
 if _psycopg:
     format_row_text = _psycopg.format_row_text
     format_row_binary = _psycopg.format_row_binary
+    format_rows_text = _psycopg.format_rows_text
+    format_rows_binary = _psycopg.format_rows_binary
     parse_row_text = _psycopg.parse_row_text
     parse_row_binary = _psycopg.parse_row_binary
 
 else:
     format_row_text = _format_row_text
     format_row_binary = _format_row_binary
+    format_rows_text = _format_rows_text
+    format_rows_binary = _format_rows_binary
     parse_row_text = _parse_row_text
     parse_row_binary = _parse_row_binary
@@ -6,6 +6,7 @@ Psycopg BaseCursor object
 
 from __future__ import annotations
 
+from time import monotonic
 from typing import TYPE_CHECKING, Any, Generic, NoReturn
 from weakref import ReferenceType, ref
 from functools import partial
@@ -17,9 +18,10 @@ from . import pq
 from .abc import ConnectionType, Loader, Params, PQGen, Query
 from .rows import Row, RowMaker
 from ._column import Column
-from ._compat import Template
+from ._compat import Template, batched
 from .pq.misc import connection_summary
-from ._queries import PostgresClientQuery, PostgresQuery
+from ._queries import CompiledQuery, PostgresBatchQuery, PostgresClientQuery
+from ._queries import PostgresCompiledQuery, PostgresQuery
 from ._preparing import Prepare
 from .generators import execute, fetch, send
 from ._capabilities import capabilities
@@ -44,6 +46,10 @@ PIPELINE_ABORTED = pq.ExecStatus.PIPELINE_ABORTED
 
 ACTIVE = pq.TransactionStatus.ACTIVE
 
+# Max number of results executemany() can wait for in pipeline mode before
+# stopping to send queries and fetching them.
+EXECMANY_MAX_PENDING = 1000
+
 
 class BaseCursor(Generic[ConnectionType, Row]):
     __slots__ = """
@@ -65,7 +71,7 @@ class BaseCursor(Generic[ConnectionType, Row]):
         self._adapters = adapt.AdaptersMap(connection.adapters)
         self.arraysize = 1
         self._closed = False
-        self._last_query: Query | None = None
+        self._last_query: Query | CompiledQuery | None = None
         self._reset()
 
         # Set up a callback to allow changing loaders on already returned result.
@@ -194,63 +200,79 @@ class BaseCursor(Generic[ConnectionType, Row]):
 
     def _execute_gen(
         self,
-        query: Query,
+        query: Query | CompiledQuery,
         params: Params | None = None,
         *,
         prepare: bool | None = None,
         binary: bool | None = None,
     ) -> PQGen[None]:
         """Generator implementing `Cursor.execute()`."""
-        yield from self._start_query(query)
-        pgq = self._convert_query(query, params)
-        yield from self._maybe_prepare_gen(pgq, prepare=prepare, binary=binary)
+        yield from self._execute_send_gen(query, params, prepare=prepare, binary=binary)
         if self._conn._pipeline:
             yield from self._conn._pipeline._communicate_gen()
 
         self._last_query = query
         yield from self._conn._prepared.maintain_gen(self._conn)
 
-    def _executemany_gen_pipeline(
-        self, query: Query, params_seq: Iterable[Params], returning: bool
+    def _execute_send_gen(
+        self,
+        query: Query | CompiledQuery,
+        params: Params | None = None,
+        *,
+        prepare: bool | None = None,
+        binary: bool | None = None,
     ) -> PQGen[None]:
         """
-        Generator implementing `Cursor.executemany()` with pipelines available.
-        """
-        pipeline = self._conn._pipeline
-        assert pipeline
+        Execute a query, without processing further pipeline results.
 
+        In pipeline mode the query is only queued.
+        """
         yield from self._start_query(query)
-        if not returning:
-            self._rowcount = 0
-
-        assert self._execmany_returning is None
-        self._execmany_returning = returning
-
-        first = True
-        for params in params_seq:
-            if first:
-                pgq = self._convert_query(query, params)
-                self._query = pgq
-                first = False
-            else:
-                pgq.dump(params)
+        pgq = self._convert_query(query, params)
+        yield from self._maybe_prepare_gen(pgq, prepare=prepare, binary=binary)
 
-            yield from self._maybe_prepare_gen(pgq, prepare=True)
-            yield from pipeline._communicate_gen()
+    def _executemany_gen(
+        self,
+        query: Query | CompiledQuery,
+        params_seq: Iterable[Params],
+        returning: bool,
+        batch_rows: int | None = None,
+    ) -> PQGen[None]:
+        """
+        Generator implementing `Cursor.executemany()`.
 
-        self._last_query = query
+        If the connection is in pipeline mode the queries are pipelined,
+        otherwise they are executed one at time.
+        """
+        yield from self._executemany_start_gen(query, returning, batch_rows)
 
-        if returning:
-            yield from pipeline._fetch_gen(flush=True)
+        pgq = None
+        if batch_rows is None:
+            for params in params_seq:
+                pgq = self._executemany_dump(query, params, pgq, False)
+                yield from self._executemany_send_gen(pgq)
+        else:
+            for rows in batched(params_seq, batch_rows):
+                pgq = self._executemany_dump(query, rows, pgq, True)
+                yield from self._executemany_send_gen(pgq)
 
-        yield from self._conn._prepared.maintain_gen(self._conn)
+        yield from self._executemany_end_gen(query, returning)
 
-    def _executemany_gen_no_pipeline(
-        self, query: Query, params_seq: Iterable[Params], returning: bool
+    def _executemany_start_gen(
+        self, query: Query | CompiledQuery, returning: bool, batch_rows: int | None
     ) -> PQGen[None]:
-        """
-        Generator implementing `Cursor.executemany()` with pipelines not available.
-        """
+        if batch_rows is not None:
+            if batch_rows < 1:
+                raise ValueError(f"batch_rows must be >= 1, got {batch_rows}")
+            if isinstance(query, CompiledQuery):
+                raise e.NotSupportedError(
+                    "batch_rows is not supported by compiled queries"
+                )
+            if self._query_cls is not PostgresQuery:
+                raise e.NotSupportedError(
+                    f"{type(self).__name__} doesn't support batch_rows"
+                )
+
         yield from self._start_query(query)
         if not returning:
             self._rowcount = 0
@@ -258,18 +280,53 @@ class BaseCursor(Generic[ConnectionType, Row]):
         assert self._execmany_returning is None
         self._execmany_returning = returning
 
-        first = True
-        for params in params_seq:
-            if first:
-                pgq = self._convert_query(query, params)
-                self._query = pgq
-                first = False
+    def _executemany_dump(
+        self,
+        query: Query | CompiledQuery,
+        item: Any,
+        pgq: PostgresQuery | None,
+        batch: bool,
+    ) -> PostgresQuery:
+        """
+        Return the query to execute for an item of `!executemany()`.
+
+        `!item` is a set of parameters or, if `!batch` is true, a sequence of
+        them to insert in a single query. The first time, when `!pgq` is
+        `!None`, the query is converted; then the same object is updated with
+        the new parameters and returned.
+        """
+        if pgq is None:
+            if batch:
+                assert not isinstance(query, CompiledQuery)
+                bpgq = PostgresBatchQuery(self._tx)
+                bpgq.convert_batch(query, item)
+                pgq = bpgq
             else:
-                pgq.dump(params)
+                pgq = self._convert_query(query, item)
+            self._query = pgq
+        elif isinstance(pgq, PostgresBatchQuery):
+            pgq.dump_batch(item)
+        else:
+            pgq.dump(item)
+        return pgq
 
-            yield from self._maybe_prepare_gen(pgq, prepare=True)
+    def _executemany_send_gen(self, pgq: PostgresQuery) -> PQGen[None]:
+        yield from self._maybe_prepare_gen(pgq, prepare=True)
+        if pipeline := self._conn._pipeline:
+            yield from pipeline._communicate_gen()
+            # Don't let the results to receive grow unbounded if the server
+            # is slower than the client.
+            if len(pipeline.result_queue) >= EXECMANY_MAX_PENDING:
+                yield from pipeline._fetch_gen(flush=True)
 
+    def _executemany_end_gen(
+        self, query: Query | CompiledQuery, returning: bool
+    ) -> PQGen[None]:
         self._last_query = query
+
+        if returning and (pipeline := self._conn._pipeline):
+            yield from pipeline._fetch_gen(flush=True)
+
         yield from self._conn._prepared.maintain_gen(self._conn)
 
     def _maybe_prepare_gen(
@@ -281,6 +338,8 @@ class BaseCursor(Generic[ConnectionType, Row]):
     ) -> PQGen[None]:
         # Check if the query is prepared or needs preparing
         prep, name = self._get_prepared(pgq, prepare)
+        prepared = self._conn._prepared
+        t0 = monotonic() if prepared.policy else 0.0
         if prep is Prepare.NO:
             # The query must be executed without preparing
             self._execute_send(pgq, binary=binary)
@@ -298,20 +357,24 @@ class BaseCursor(Generic[ConnectionType, Row]):
         # Update the prepare state of the query.
         # If an operation requires to flush our prepared statements cache,
         # it will be added to the maintenance commands to execute later.
-        key = self._conn._prepared.maybe_add_to_cache(pgq, prep, name)
+        key = prepared.maybe_add_to_cache(pgq, prep, name)
 
         if self._conn._pipeline:
             queued = None
             if key is not None:
                 queued = (key, prep, name)
             self._conn._pipeline.result_queue.append((self, queued))
+            if prepared.policy:
+                prepared.record(pgq, prep, None)
             return
 
         # run the query
         results = yield from execute(self._pgconn)
+        if prepared.policy:
+            prepared.record(pgq, prep, monotonic() - t0)
 
         if key is not None:
-            self._conn._prepared.validate(key, prep, name, results)
+            prepared.validate(key, prep, name, results)
 
         self._check_results(results)
         self._set_results(results)
@@ -370,7 +433,7 @@ class BaseCursor(Generic[ConnectionType, Row]):
             # Errors, unexpected values
             return self._raise_for_result(res)
 
-    def _start_query(self, query: Query | None = None) -> PQGen[None]:
+    def _start_query(self, query: Query | CompiledQuery | None = None) -> PQGen[None]:
         """Generator to start the processing of a query.
 
         It is implemented as generator because it may send additional queries,
@@ -458,8 +521,17 @@ class BaseCursor(Generic[ConnectionType, Row]):
             self._pgconn.send_query(query.query)
 
     def _convert_query(
-        self, query: Query, params: Params | None = None
+        self, query: Query | CompiledQuery, params: Params | None = None
     ) -> PostgresQuery:
+        if isinstance(query, CompiledQuery):
+            if issubclass(self._query_cls, PostgresClientQuery):
+                raise e.NotSupportedError(
+                    f"{type(self).__name__} doesn't support compiled queries"
+                )
+            cpgq = PostgresCompiledQuery(self._tx)
+            cpgq.convert_compiled(query, params)
+            return cpgq
+
         pgq = self._query_cls(self._tx)
         pgq.convert(query, params)
         return pgq
@@ -14,12 +14,15 @@ from types import TracebackType
 from typing import TYPE_CHECKING, Any
 
 from . import errors as e
+from .abc import Params, Query
 from ._compat import Self
-from ._pipeline_base import BasePipeline
+from ._queries import CompiledQuery
+from ._pipeline_base import BasePipeline, BasePipelineResult
 
 if TYPE_CHECKING:
     from .connection import Connection
 
+
 logger = logging.getLogger("psycopg")
 
 
@@ -43,8 +46,13 @@ class Pipeline(BasePipeline):
     __module__ = "psycopg"
     _conn: Connection[Any]
 
-    def __init__(self, conn: Connection[Any], _no_lock: bool = False) -> None:
-        super().__init__(conn)
+    def __init__(
+        self,
+        conn: Connection[Any],
+        max_pending: int | None = None,
+        _no_lock: bool = False,
+    ) -> None:
+        super().__init__(conn, max_pending)
         self._lock = _DummyLock() if _no_lock else conn.lock
 
     def sync(self) -> None:
@@ -57,6 +65,32 @@ class Pipeline(BasePipeline):
         except e._NO_TRACEBACK as ex:
             raise ex.with_traceback(None)
 
+    def submit(
+        self,
+        query: Query | CompiledQuery,
+        params: Params | None = None,
+        *,
+        prepare: bool | None = None,
+        binary: bool | None = None,
+    ) -> PipelineResult:
+        """
+        Send a query to the pipeline and return a handle to its result.
+
+        The query is executed without using a cursor. The result is available
+        once the pipeline is synced.
+        """
+        result = PipelineResult(self)
+        try:
+            with self._lock:
+                self._conn.wait(
+                    self._submit_gen(
+                        result, query, params, prepare=prepare, binary=binary
+                    )
+                )
+        except e._NO_TRACEBACK as ex:
+            raise ex.with_traceback(None)
+        return result
+
     def __enter__(self) -> Self:
         with self._lock:
             self._conn.wait(self._enter_gen())
@@ -79,3 +113,29 @@ class Pipeline(BasePipeline):
                 raise exc2.with_traceback(None)
         finally:
             self._exit(exc_val)
+
+
+class PipelineResult(BasePipelineResult):
+    """
+    The result of a query submitted with `~Pipeline.submit()`.
+    """
+
+    __module__ = "psycopg"
+    __slots__ = ()
+    _pipeline: Pipeline
+
+    def result(self) -> list[tuple[Any, ...]]:
+        """
+        Return the records returned by the query.
+
+        If the result was not received yet, flush the pipeline and wait for it.
+        Raise the error received if the query failed.
+        """
+        if not self.done():
+            p = self._pipeline
+            try:
+                with p._lock:
+                    p._conn.wait(p._fetch_gen(flush=True))
+            except e._NO_TRACEBACK as ex:
+                raise ex.with_traceback(None)
+        return self._get_rows()
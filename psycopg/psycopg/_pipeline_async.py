@@ -11,12 +11,17 @@ from types import TracebackType
 from typing import TYPE_CHECKING, Any
 
 from . import errors as e
+from .abc import Params, Query
 from ._compat import Self
-from ._pipeline_base import BasePipeline
+from ._queries import CompiledQuery
+from ._pipeline_base import BasePipeline, BasePipelineResult
 
 if TYPE_CHECKING:
     from .connection_async import AsyncConnection
 
+if True:  # ASYNC
+    from collections.abc import Generator
+
 logger = logging.getLogger("psycopg")
 
 
@@ -39,8 +44,13 @@ class AsyncPipeline(BasePipeline):
     __module__ = "psycopg"
     _conn: AsyncConnection[Any]
 
-    def __init__(self, conn: AsyncConnection[Any], _no_lock: bool = False) -> None:
-        super().__init__(conn)
+    def __init__(
+        self,
+        conn: AsyncConnection[Any],
+        max_pending: int | None = None,
+        _no_lock: bool = False,
+    ) -> None:
+        super().__init__(conn, max_pending)
         self._lock = _DummyLock() if _no_lock else conn.lock
 
     async def sync(self) -> None:
@@ -53,6 +63,32 @@ class AsyncPipeline(BasePipeline):
         except e._NO_TRACEBACK as ex:
             raise ex.with_traceback(None)
 
+    async def submit(
+        self,
+        query: Query | CompiledQuery,
+        params: Params | None = None,
+        *,
+        prepare: bool | None = None,
+        binary: bool | None = None,
+    ) -> AsyncPipelineResult:
+        """
+        Send a query to the pipeline and return a handle to its result.
+
+        The query is executed without using a cursor. The result is available
+        once the pipeline is synced.
+        """
+        result = AsyncPipelineResult(self)
+        try:
+            async with self._lock:
+                await self._conn.wait(
+                    self._submit_gen(
+                        result, query, params, prepare=prepare, binary=binary
+                    )
+                )
+        except e._NO_TRACEBACK as ex:
+            raise ex.with_traceback(None)
+        return result
+
     async def __aenter__(self) -> Self:
         async with self._lock:
             await self._conn.wait(self._enter_gen())
@@ -75,3 +111,34 @@ class AsyncPipeline(BasePipeline):
                 raise exc2.with_traceback(None)
         finally:
             self._exit(exc_val)
+
+
+class AsyncPipelineResult(BasePipelineResult):
+    """
+    The result of a query submitted with `~AsyncPipeline.submit()`.
+    """
+
+    __module__ = "psycopg"
+    __slots__ = ()
+    _pipeline: AsyncPipeline
+
+    async def result(self) -> list[tuple[Any, ...]]:
+        """
+        Return the records returned by the query.
+
+        If the result was not received yet, flush the pipeline and wait for it.
+        Raise the error received if the query failed.
+        """
+        if not self.done():
+            p = self._pipeline
+            try:
+                async with p._lock:
+                    await p._conn.wait(p._fetch_gen(flush=True))
+            except e._NO_TRACEBACK as ex:
+                raise ex.with_traceback(None)
+        return self._get_rows()
+
+    if True:  # ASYNC
+
+        def __await__(self) -> Generator[Any, None, list[tuple[Any, ...]]]:
+            return self.result().__await__()
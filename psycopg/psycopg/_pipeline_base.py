@@ -8,26 +8,39 @@ from __future__ import annotations
 
 import logging
 from typing import TYPE_CHECKING, Any, TypeAlias
+from functools import partial
 from collections import deque
+from collections.abc import Sequence
 
+from . import adapt
 from . import errors as e
 from . import pq
-from .abc import PipelineCommand, PQGen
+from .abc import Params, PipelineCommand, PQGen, Query
 from .pq.misc import connection_summary
+from ._queries import CompiledQuery, PostgresCompiledQuery, PostgresQuery
+from ._preparing import Prepare
 from .generators import fetch_many, pipeline_communicate, send
 from ._capabilities import capabilities
 
 if TYPE_CHECKING:
+    from .abc import Transformer
     from .pq.abc import PGresult
-    from ._preparing import Key, Prepare  # noqa: F401
+    from ._preparing import Key  # noqa: F401
     from ._cursor_base import BaseCursor  # noqa: F401
     from ._connection_base import BaseConnection
 
 
 PendingResult: TypeAlias = (
-    "tuple[BaseCursor[Any, Any], tuple[Key, Prepare, bytes] | None] | None"
+    "tuple[BaseCursor[Any, Any] | BasePipelineResult,"
+    " tuple[Key, Prepare, bytes] | None] | None"
 )
 
+TEXT = pq.Format.TEXT
+BINARY = pq.Format.BINARY
+
+COMMAND_OK = pq.ExecStatus.COMMAND_OK
+TUPLES_OK = pq.ExecStatus.TUPLES_OK
+EMPTY_QUERY = pq.ExecStatus.EMPTY_QUERY
 FATAL_ERROR = pq.ExecStatus.FATAL_ERROR
 PIPELINE_ABORTED = pq.ExecStatus.PIPELINE_ABORTED
 BAD = pq.ConnStatus.BAD
@@ -41,12 +54,34 @@ class BasePipeline:
     command_queue: deque[PipelineCommand]
     result_queue: deque[PendingResult]
 
-    def __init__(self, conn: BaseConnection[Any]) -> None:
+    def __init__(
+        self, conn: BaseConnection[Any], max_pending: int | None = None
+    ) -> None:
         self._conn = conn
         self.pgconn = conn.pgconn
         self.command_queue = deque[PipelineCommand]()
         self.result_queue = deque[PendingResult]()
         self.level = 0
+        self.max_pending = max_pending
+        self._tx: Transformer | None = None
+        self._ctx: Transformer | None = None
+
+    @property
+    def max_pending(self) -> int | None:
+        """
+        The maximum number of results the pipeline can wait for.
+
+        When the number of results not received yet reaches this number, the
+        pipeline is flushed and the results are fetched. If `!None` the
+        number of pending results is not limited.
+        """
+        return self._max_pending
+
+    @max_pending.setter
+    def max_pending(self, value: int | None) -> None:
+        if value is not None and value < 1:
+            raise ValueError(f"max_pending must be >= 1 or None, got {value}")
+        self._max_pending = value
 
     def __repr__(self) -> str:
         cls = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
@@ -121,6 +156,140 @@ class BasePipeline:
         if exception is not None:
             raise exception
 
+        if self._max_pending and len(self.result_queue) >= self._max_pending:
+            yield from self._fetch_gen(flush=True)
+
+    def _submit_gen(
+        self,
+        result: BasePipelineResult,
+        query: Query | CompiledQuery,
+        params: Params | None = None,
+        *,
+        prepare: bool | None = None,
+        binary: bool | None = None,
+    ) -> PQGen[None]:
+        """Generator implementing `Pipeline.submit()`."""
+        if not self.level:
+            raise e.ProgrammingError("submit() can only be used in a pipeline block")
+
+        yield from self._conn._start_query()
+
+        # The transformers are shared by all the queries submitted to the
+        # pipeline. Compiled queries use a different one because they set
+        # fixed dumpers on it.
+        pgq: PostgresQuery
+        if isinstance(query, CompiledQuery):
+            if not (ctx := self._ctx):
+                ctx = self._ctx = adapt.Transformer(self._conn)
+            pgq = PostgresCompiledQuery(ctx)
+            pgq.convert_compiled(query, params)
+        else:
+            pgq = PostgresQuery(self._get_tx())
+            pgq.convert(query, params)
+
+        fmt = BINARY if binary else TEXT
+        prepared = self._conn._prepared
+        prep, name = prepared.get(pgq, prepare)
+        if prep is Prepare.NO:
+            self.command_queue.append(
+                partial(
+                    self.pgconn.send_query_params,
+                    pgq.query,
+                    pgq.params,
+                    param_formats=pgq.formats,
+                    param_types=pgq.types,
+                    result_format=fmt,
+                )
+            )
+        else:
+            if prep is Prepare.SHOULD:
+                self.command_queue.append(
+                    partial(
+                        self.pgconn.send_prepare,
+                        name,
+                        pgq.query,
+                        param_types=pgq.types,
+                    )
+                )
+                self.result_queue.append(None)
+            self.command_queue.append(
+                partial(
+                    self.pgconn.send_query_prepared,
+                    name,
+                    pgq.params,
+                    param_formats=pgq.formats,
+                    result_format=fmt,
+                )
+            )
+
+        key = prepared.maybe_add_to_cache(pgq, prep, name)
+        queued = (key, prep, name) if key is not None else None
+        self.result_queue.append((result, queued))
+        if prepared.policy:
+            prepared.record(pgq, prep, None)
+
+        yield from self._communicate_gen()
+        yield from prepared.maintain_gen(self._conn)
+
+    def _batch_gen(self, sends: Sequence[PQGen[None]]) -> PQGen[list[Exception | None]]:
+        """
+        Run several independent commands in a single pipeline round trip.
+
+        Every generator in 'sends' queues a command; each one is followed by a
+        Sync, so that an error doesn't abort the following commands (unless
+        they are in the same transaction). Return, for each command, the error
+        it caused, if any, instead of raising it.
+        """
+        yield from self._enter_gen()
+        try:
+            errors = yield from self._batch_items_gen(sends)
+        except BaseException as ex:
+            self._exit(ex)
+            raise
+        self._exit(None)
+        return errors
+
+    def _batch_items_gen(
+        self, sends: Sequence[PQGen[None]]
+    ) -> PQGen[list[Exception | None]]:
+        errors: list[Exception | None] = [None] * len(sends)
+        # The index of the command each item in the result queue belongs to.
+        owners = deque[int]([-1] * len(self.result_queue))
+        for i, gen in enumerate(sends):
+            try:
+                yield from gen
+            except Exception as ex:
+                errors[i] = ex
+            self._enqueue_sync()
+            owners.extend([i] * (len(self.result_queue) - len(owners)))
+
+        def process(results: list[PGresult]) -> None:
+            queued = self.result_queue.popleft()
+            i = owners.popleft()
+            try:
+                self._process_results(queued, results)
+            except e.Error as ex:
+                if i >= 0 and errors[i] is None:
+                    errors[i] = ex
+
+        # Put all the commands in the libpq output buffer and send them
+        # together, rather than waiting for the socket before each command.
+        while self.command_queue:
+            self.command_queue.popleft()()
+        yield from send(self.pgconn)
+
+        while self.result_queue:
+            if not (results := (yield from fetch_many(self.pgconn))):
+                break
+            process(results)
+
+        return errors
+
+    def _get_tx(self) -> Transformer:
+        if not (tx := self._tx):
+            tx = self._tx = adapt.Transformer(self._conn)
+        return tx
+
     def _fetch_gen(self, *, flush: bool) -> PQGen[None]:
         """Fetch available results from the connection and process them with
         pipeline queued items.
@@ -158,7 +327,8 @@ class BasePipeline:
         This matches 'results' with its respective element in the pipeline
         queue. For commands (None value in the pipeline queue), results are
         checked directly. For prepare statement creation requests, update the
-        cache. Otherwise, results are attached to their respective cursor.
+        cache. Otherwise, results are attached to their respective cursor or
+        submitted result.
         """
         if queued is None:
             (result,) = results
@@ -179,3 +349,106 @@ class BasePipeline:
         """Enqueue a PQpipelineSync() command."""
         self.command_queue.append(self.pgconn.pipeline_sync)
         self.result_queue.append(None)
+
+
+class BasePipelineResult:
+    """
+    Base implementation of the result of a query submitted to a pipeline.
+    """
+
+    __slots__ = ("_pipeline", "_conn", "_results", "_error", "_rows")
+
+    def __init__(self, pipeline: BasePipeline):
+        self._pipeline = pipeline
+        self._conn = pipeline._conn
+        self._results: list[PGresult] | None = None
+        self._error: e.Error | None = None
+        self._rows: list[tuple[Any, ...]] | None = None
+
+    def __repr__(self) -> str:
+        cls = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
+        if self._error:
+            status = "error"
+        elif self._results is not None:
+            status = "done"
+        else:
+            status = "pending"
+        return f"<{cls} [{status}] at 0x{id(self):x}>"
+
+    def done(self) -> bool:
+        """
+        Return `!True` if the result of the query was received.
+        """
+        return self._results is not None or self._error is not None
+
+    @property
+    def pgresult(self) -> PGresult | None:
+        """The result of the query, `!None` if not received yet."""
+        return self._results[-1] if self._results else None
+
+    @property
+    def rowcount(self) -> int:
+        """
+        Number of records returned or affected by the query.
+
+        -1 if the result was not received yet or if it is not available.
+        """
+        if not (res := self.pgresult):
+            return -1
+        if res.status == TUPLES_OK:
+            return res.ntuples
+        return nrows if (nrows := res.command_tuples) is not None else -1
+
+    @property
+    def statusmessage(self) -> str | None:
+        """
+        The status tag of the query, `!None` if the result was not received yet.
+        """
+        msg = res.command_status if (res := self.pgresult) else None
+        return msg.decode() if msg else None
+
+    def _check_results(self, results: list[PGresult]) -> None:
+        """
+        Verify that the results received are valid; store and raise the error if not.
+        """
+        try:
+            if not results:
+                raise e.InternalError("got no result from the query")
+
+            for res in results:
+                if (status := res.status) == FATAL_ERROR:
+                    raise e.error_from_result(res, encoding=self._conn.pgconn._encoding)
+                elif status == PIPELINE_ABORTED:
+                    raise e.PipelineAborted("pipeline aborted")
+                elif (
+                    status != TUPLES_OK
+                    and status != COMMAND_OK
+                    and status != EMPTY_QUERY
+                ):
+                    raise e.InternalError(
+                        "unexpected result status from query:"
+                        f" {pq.ExecStatus(status).name}"
+                    )
+        except e.Error as ex:
+            self._error = ex
+            raise
+
+    def _set_results(self, results: list[PGresult]) -> None:
+        self._results = results
+
+    def _get_rows(self) -> list[tuple[Any, ...]]:
+        if self._error:
+            raise self._error.with_traceback(None)
+        if (rows := self._rows) is not None:
+            return rows
+        if not (res := self.pgresult):
+            raise e.ProgrammingError("the query result was not received")
+        if res.status != TUPLES_OK:
+            raise e.ProgrammingError("the query didn't produce records")
+
+        # Don't use the pipeline Transformer: the results may be loaded by
+        # different threads, without holding the connection lock.
+        tx = adapt.Transformer(self._conn)
+        tx.set_pgresult(res)
+        rows = self._rows = tx.load_rows(0, res.ntuples, tuple)
+        return rows
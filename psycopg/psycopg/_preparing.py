@@ -6,8 +6,9 @@ Support for prepared statements
 
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
 from enum import IntEnum, auto
-from typing import TYPE_CHECKING, Any, TypeAlias
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeAlias
 from collections import OrderedDict, deque
 from collections.abc import Sequence
 
@@ -31,6 +32,146 @@ class Prepare(IntEnum):
     SHOULD = auto()
 
 
+class PreparePolicy(ABC):
+    """
+    Base class to decide which queries to prepare on a connection.
+
+    Subclasses must implement `should_prepare()` and may extend `record()`
+    to take into account the executions of the queries.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def should_prepare(self, key: Key) -> bool:
+        """
+        Return `!True` if the query identified by *key* should be prepared.
+        """
+        ...
+
+    def should_deallocate(self, key: Key) -> bool:
+        """
+        Return `!True` if the prepared statement for *key* should be dropped.
+        """
+        return False
+
+    def record(self, key: Key, prepared: bool, elapsed: float | None) -> None:
+        """
+        Record the execution of a query.
+
+        *prepared* is `!True` if an existing prepared statement was used.
+        *elapsed* is the round-trip time of the execution, in seconds, or
+        `!None` if it could not be measured (for instance in pipeline mode).
+        """
+        if prepared:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+
+class _KeyStats:
+    __slots__ = ("count", "ucount", "utime", "pcount", "ptime", "rejected")
+
+    def __init__(self) -> None:
+        # Number of executions without preparing
+        self.count = 0
+        # Number and total time of the timed executions, unprepared/prepared
+        self.ucount = 0
+        self.utime = 0.0
+        self.pcount = 0
+        self.ptime = 0.0
+        # True if the query didn't benefit from being prepared
+        self.rejected = False
+
+
+class CostPreparePolicy(PreparePolicy):
+    """
+    Prepare the queries for which preparing is measured to pay off.
+
+    A query is prepared after it was executed *min_count* times. Its
+    round-trip time is then compared before and after being prepared: if,
+    after *trials* executions, the prepared statement is not at least
+    *min_gain* faster (as a fraction of the unprepared time) it is deallocated
+    and the query is not prepared again.
+
+    The statistics of at most *max_keys* queries are kept.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_count: int = 2,
+        min_gain: float = 0.1,
+        trials: int = 5,
+        max_keys: int = 1000,
+    ):
+        super().__init__()
+        self.min_count = min_count
+        self.min_gain = min_gain
+        self.trials = trials
+        self.max_keys = max_keys
+        self._stats: OrderedDict[Key, _KeyStats] = OrderedDict()
+
+    def should_prepare(self, key: Key) -> bool:
+        if not (st := self._stats.get(key)):
+            return False
+        return not st.rejected and st.count >= self.min_count
+
+    def should_deallocate(self, key: Key) -> bool:
+        return (st := self._stats.get(key)) is not None and st.rejected
+
+    def record(self, key: Key, prepared: bool, elapsed: float | None) -> None:
+        super().record(key, prepared, elapsed)
+
+        if st := self._stats.get(key):
+            self._stats.move_to_end(key)
+        else:
+            st = self._stats[key] = _KeyStats()
+            if len(self._stats) > self.max_keys:
+                self._stats.popitem(last=False)
+
+        if not prepared:
+            st.count += 1
+        if elapsed is None:
+            return
+
+        if not prepared:
+            st.ucount += 1
+            st.utime += elapsed
+            return
+
+        st.pcount += 1
+        st.ptime += elapsed
+        if st.pcount == self.trials and st.utime:
+            gain = 1.0 - (st.ptime / st.pcount) / (st.utime / st.ucount)
+            st.rejected = gain < self.min_gain
+
+
+class PreparedStats(NamedTuple):
+    """
+    Statistics about the prepared statements on a connection.
+    """
+
+    #: Number of executions using an existing prepared statement.
+    hits: int
+    #: Number of executions not using an existing prepared statement.
+    misses: int
+    #: Number of statements prepared.
+    prepares: int
+    #: Number of prepared statements evicted from the cache.
+    evictions: int
+    #: Number of prepared statements deallocated one by one.
+    deallocations: int
+    #: Number of times all the prepared statements were deallocated, for
+    #: instance after a :sql:`ROLLBACK` or a :sql:`DROP` statement.
+    deallocations_all: int
+    #: The queries currently prepared, as (query, types) keys, from the most
+    #: to the least recently used.
+    keys: list[Key]
+
+
 class PrepareManager:
     # Number of times a query is executed before it is prepared.
     prepare_threshold: int | None = 5
@@ -38,6 +179,9 @@ class PrepareManager:
     # Maximum number of prepared statements on the connection.
     prepared_max: int = 100
 
+    # If True, don't deallocate evicted statements after every query.
+    defer_deallocate: bool = False
+
     def __init__(self) -> None:
         # Map (query, types) to the number of times the query was seen.
         self._counts: OrderedDict[Key, int] = OrderedDict()
@@ -50,6 +194,17 @@ class PrepareManager:
 
         self._to_flush = deque[bytes | None]()
 
+        # Policy deciding the queries to prepare, instead of prepare_threshold
+        self.policy: PreparePolicy | None = None
+
+        # Counters for stats()
+        self._hits = 0
+        self._misses = 0
+        self._prepares = 0
+        self._evictions = 0
+        self._deallocations = 0
+        self._deallocations_all = 0
+
     @staticmethod
     def key(query: PostgresQuery) -> Key:
         return (query.query, query.types)
@@ -64,12 +219,26 @@ class PrepareManager:
             # The user doesn't want this query to be prepared
             return Prepare.NO, b""
 
+        policy = self.policy
         if name := self._names.get(key := self.key(query)):
-            # The query was already prepared in this session
-            return Prepare.YES, name
+            if prepare or not policy or not policy.should_deallocate(key):
+                # The query was already prepared in this session
+                self._hits += 1
+                return Prepare.YES, name
 
-        count = self._counts.get(key, 0)
-        if count >= self.prepare_threshold or prepare:
+            # The policy doesn't want the query prepared anymore
+            del self._names[key]
+            self._to_flush.append(name)
+            self._evictions += 1
+            self._misses += 1
+            return Prepare.NO, b""
+
+        if policy:
+            should = policy.should_prepare(key)
+        else:
+            should = self._counts.get(key, 0) >= self.prepare_threshold
+        self._misses += 1
+        if should or prepare:
             # The query has been executed enough times and needs to be prepared
             name = f"_pg3_{self._prepared_idx}".encode()
             self._prepared_idx += 1
@@ -78,6 +247,60 @@ class PrepareManager:
             # The query is not to be prepared yet
             return Prepare.NO, b""
 
+    def keys(self) -> list[Key]:
+        """
+        Return the keys of the statements prepared in the session.
+
+        The keys are returned from the least to the most recently used.
+        """
+        return list(self._names)
+
+    def add(self, key: Key) -> bytes | None:
+        """
+        Add a statement to prepare without waiting for it to be executed.
+
+        Return the name to prepare the statement with, or `!None` if the
+        statement is already prepared or if prepared statements are disabled.
+        """
+        if self.prepare_threshold is None or key in self._names:
+            return None
+
+        name = f"_pg3_{self._prepared_idx}".encode()
+        self._prepared_idx += 1
+        self._counts.pop(key, None)
+        self._names[key] = name
+        self._prepares += 1
+        self._rotate()
+        return name
+
+    def stats(self) -> PreparedStats:
+        """
+        Return the statistics about the prepared statements.
+        """
+        return PreparedStats(
+            hits=self._hits,
+            misses=self._misses,
+            prepares=self._prepares,
+            evictions=self._evictions,
+            deallocations=self._deallocations,
+            deallocations_all=self._deallocations_all,
+            keys=list(reversed(self._names)),
+        )
+
+    def record(
+        self, query: PostgresQuery, prep: Prepare, elapsed: float | None
+    ) -> None:
+        """
+        Report the execution of a query to the prepare policy, if any.
+        """
+        if not (policy := self.policy):
+            return
+
+        if prep is Prepare.SHOULD:
+            # The time includes preparing the statement: not comparable.
+            elapsed = None
+        policy.record(self.key(query), prep is Prepare.YES, elapsed)
+
     def _should_discard(self, prep: Prepare, results: Sequence[PGresult]) -> bool:
         """Check if we need to discard our entire state: it should happen on
         rollback or on dropping objects, because the same object may get
@@ -117,6 +340,7 @@ class PrepareManager:
         if len(self._names) > self.prepared_max:
             name = self._names.popitem(last=False)[1]
             self._to_flush.append(name)
+            self._evictions += 1
 
     def maybe_add_to_cache(
         self, query: PostgresQuery, prep: Prepare, name: bytes
@@ -134,6 +358,7 @@ class PrepareManager:
             if prep is Prepare.SHOULD:
                 del self._counts[key]
                 self._names[key] = name
+                self._prepares += 1
             else:
                 self._counts[key] += 1
                 self._counts.move_to_end(key)
@@ -146,6 +371,7 @@ class PrepareManager:
         else:
             if prep is Prepare.SHOULD:
                 self._names[key] = name
+                self._prepares += 1
             else:
                 self._counts[key] = 1
             return key
@@ -181,13 +407,38 @@ class PrepareManager:
         else:
             return False
 
-    def maintain_gen(self, conn: BaseConnection[Any]) -> PQGen[None]:
+    def maintain_gen(
+        self, conn: BaseConnection[Any], force: bool = False
+    ) -> PQGen[None]:
         """
         Generator to send the commands to perform periodic maintenance
 
         Deallocate unneeded command in the server, or flush the prepared
         statements server state entirely if necessary.
+
+        If `defer_deallocate` is set, statements are only deallocated if
+        *force* is true, or if too many of them are pending. A DEALLOCATE ALL
+        is never deferred, because it would drop the statements prepared later.
         """
+        if (
+            self.defer_deallocate
+            and not force
+            and self._to_flush
+            and self._to_flush[0] is not None
+            and len(self._to_flush) <= self.prepared_max
+        ):
+            return
+
         while self._to_flush:
-            name = self._to_flush.popleft()
-            yield from conn._deallocate(name)
+            if self._to_flush[0] is None:
+                self._to_flush.popleft()
+                self._deallocations_all += 1
+                yield from conn._deallocate(None)
+                continue
+
+            names: list[bytes] = []
+            while self._to_flush and (name := self._to_flush[0]) is not None:
+                self._to_flush.popleft()
+                names.append(name)
+            self._deallocations += len(names)
+            yield from conn._deallocate_many(names)
@@ -7,9 +7,10 @@ Utility module to manipulate queries
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING, Any, NamedTuple, TypeAlias, TypeGuard
-from functools import lru_cache
-from collections.abc import Callable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeGuard, TypeVar
+from threading import Lock
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping, Sequence
 
 from . import errors as e
 from . import pq, sql
@@ -24,6 +25,11 @@ if TYPE_CHECKING:
 MAX_CACHED_STATEMENT_LENGTH = 4096
 MAX_CACHED_STATEMENT_PARAMS = 50
 
+# Default max size, in bytes, of the parsed queries cache
+QUERY_CACHE_SIZE = 2 * 1024 * 1024
+
+T = TypeVar("T")
+
 
 class QueryPart(NamedTuple):
     pre: bytes
@@ -69,21 +75,8 @@ class PostgresQuery:
         query = self._ensure_bytes(query)
 
         if vars is not None:
-            # Avoid caching queries extremely long or with a huge number of
-            # parameters. They are usually generated by ORMs and have poor
-            # cacheablility (e.g. INSERT ... VALUES (...), (...) with varying
-            # numbers of tuples.
-            # see https://github.com/psycopg/psycopg/discussions/628
-            if (
-                len(query) <= MAX_CACHED_STATEMENT_LENGTH
-                and len(vars) <= MAX_CACHED_STATEMENT_PARAMS
-            ):
-                f: _Query2Pg = _query2pg
-            else:
-                f = _query2pg_nocache
-
-            (self.query, self._want_formats, self._order, self._parts) = f(
-                query, self._tx.encoding
+            (self.query, self._want_formats, self._order, self._parts) = (
+                query_cache._parse(_query2pg, query, self._tx.encoding, len(vars))
             )
         else:
             self.query = query
@@ -189,13 +182,7 @@ class PostgresQuery:
             self.formats = None
 
 
-# The type of the _query2pg() and _query2pg_nocache() methods
-_Query2Pg: TypeAlias = Callable[
-    [bytes, str], "tuple[bytes, list[PyFormat], list[str] | None, list[QueryPart]]"
-]
-
-
-def _query2pg_nocache(
+def _query2pg(
     query: bytes, encoding: str
 ) -> tuple[bytes, list[PyFormat], list[str] | None, list[QueryPart]]:
     """
@@ -245,14 +232,6 @@ def _query2pg_nocache(
     return b"".join(chunks), formats, order, parts
 
 
-# Note: the cache size is 128 items, but someone has reported throwing ~12k
-# queries (of type `INSERT ... VALUES (...), (...)` with a varying amount of
-# records), and the resulting cache size is >100Mb. So, we will avoid to cache
-# large queries or queries with a large number of params. See
-# https://github.com/sqlalchemy/sqlalchemy/discussions/10270
-_query2pg = lru_cache(_query2pg_nocache)
-
-
 class PostgresClientQuery(PostgresQuery):
     """
     PostgresQuery subclass merging query and arguments client-side.
@@ -273,15 +252,9 @@ class PostgresClientQuery(PostgresQuery):
         query = self._ensure_bytes(query)
 
         if vars is not None:
-            if (
-                len(query) <= MAX_CACHED_STATEMENT_LENGTH
-                and len(vars) <= MAX_CACHED_STATEMENT_PARAMS
-            ):
-                f: _Query2PgClient = _query2pg_client
-            else:
-                f = _query2pg_client_nocache
-
-            (self.template, self._order, self._parts) = f(query, self._tx.encoding)
+            (self.template, self._order, self._parts) = query_cache._parse(
+                _query2pg_client, query, self._tx.encoding, len(vars)
+            )
         else:
             self.query = query
             self._order = None
@@ -315,12 +288,7 @@ class PostgresClientQuery(PostgresQuery):
         self.params = tp.params
 
 
-_Query2PgClient: TypeAlias = Callable[
-    [bytes, str], "tuple[bytes, list[str] | None, list[QueryPart]]"
-]
-
-
-def _query2pg_client_nocache(
+def _query2pg_client(
     query: bytes, encoding: str
 ) -> tuple[bytes, list[str] | None, list[QueryPart]]:
     """
@@ -357,7 +325,101 @@ def _query2pg_client_nocache(
     return b"".join(chunks), order, parts
 
 
-_query2pg_client = lru_cache(_query2pg_client_nocache)
+class QueryCache:
+    """
+    Cache of the queries converted from Python to PostgreSQL format.
+
+    The least recently used queries are evicted when the approximate memory
+    used by the cache exceeds `max_size` bytes.
+    """
+
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE):
+        self._max_size = max_size
+
+        # Avoid caching queries extremely long or with a huge number of
+        # parameters. They are usually generated by ORMs and have poor
+        # cacheablility (e.g. INSERT ... VALUES (...), (...) with varying
+        # numbers of tuples.
+        # see https://github.com/psycopg/psycopg/discussions/628
+        # and https://github.com/sqlalchemy/sqlalchemy/discussions/10270
+        self.max_query_length = MAX_CACHED_STATEMENT_LENGTH
+        self.max_query_params = MAX_CACHED_STATEMENT_PARAMS
+
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+
+        # Map (function, query, encoding) to (result, size)
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__qualname__} {len(self._data)} queries,"
+            f" {self.size}/{self._max_size} bytes,"
+            f" {self.hits} hits, {self.misses} misses at 0x{id(self):x}>"
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def max_size(self) -> int:
+        """The maximum size of the cache, in bytes. 0 disables the cache."""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int) -> None:
+        with self._lock:
+            self._max_size = value
+            self._evict()
+
+    def clear(self) -> None:
+        """Empty the cache and reset its counters."""
+        with self._lock:
+            self._data.clear()
+            self.size = self.hits = self.misses = 0
+
+    def _parse(
+        self, func: Callable[[bytes, str], T], query: bytes, encoding: str, nparams: int
+    ) -> T:
+        """Return `!func(query, encoding)`, using the cache if possible."""
+        if (
+            len(query) > self.max_query_length
+            or nparams > self.max_query_params
+            or not self._max_size
+        ):
+            return func(query, encoding)
+
+        # Updating the LRU order mutates the dict, so it needs the lock too.
+        # Parsing a query not found happens outside the lock.
+        key = (func, query, encoding)
+        with self._lock:
+            if (item := self._data.get(key)) is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                rv: T = item[0]
+                return rv
+
+        rv = func(query, encoding)
+
+        # Approximate the memory used by the query, the converted query and
+        # the parts it was split into.
+        size = 3 * len(query) + 100 * (nparams + 1)
+        with self._lock:
+            self.misses += 1
+            if key not in self._data:
+                self._data[key] = (rv, size)
+                self.size += size
+                self._evict()
+        return rv
+
+    def _evict(self) -> None:
+        while self.size > self._max_size and self._data:
+            self.size -= self._data.popitem(last=False)[1][1]
+
+
+query_cache = QueryCache()
 
 
 _re_placeholder = re.compile(
@@ -482,3 +544,264 @@ class PostgresRawQuery(PostgresQuery):
         raise e.NotSupportedError(
             f"{type(self).__name__} doesn't support template strings"
         )
+
+
+class CompiledQuery:
+    """
+    A query with a fixed parameters layout, obtained by `Connection.compile()`.
+    """
+
+    __module__ = "psycopg"
+    __slots__ = ("query", "types", "format", "_pgquery", "_order")
+
+    def __init__(
+        self,
+        query: QueryNoTemplate,
+        types: Sequence[int | str] | Mapping[str, int | str],
+        format: pq.Format,
+        tx: Transformer,
+    ):
+        self.query = query
+        self.format = format
+
+        pgq = PostgresQuery(tx)
+        self._pgquery, formats, self._order, _ = _query2pg(
+            pgq._ensure_bytes(query), tx.encoding
+        )
+
+        if isinstance(types, Mapping):
+            if not self._order:
+                raise TypeError("positional placeholders require a sequence of types")
+            if set(types) != set(self._order):
+                raise e.ProgrammingError(
+                    f"the query has placeholders {', '.join(self._order)}"
+                    f" but types were specified for {', '.join(types)}"
+                )
+            types = [types[name] for name in self._order]
+
+        if len(types) != len(formats):
+            raise e.ProgrammingError(
+                f"the query has {len(formats)} placeholders but"
+                f" {len(types)} types were specified"
+            )
+
+        registry = tx.adapters.types
+        self.types = tuple(
+            t if isinstance(t, int) else registry.get_oid(t) for t in types
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__qualname__} {self._pgquery!r}"
+            f" types={self.types} at 0x{id(self):x}>"
+        )
+
+
+class PostgresCompiledQuery(PostgresQuery):
+    """
+    PostgresQuery subclass executing a `CompiledQuery`.
+
+    The query is not parsed and the dumpers are chosen only once, according
+    to the compiled types, so dumping every set of parameters is cheaper.
+    """
+
+    __slots__ = ()
+
+    def convert_compiled(self, query: CompiledQuery, vars: Params | None) -> None:
+        """
+        Set up the compiled query and the parameters to convert.
+        """
+        self.query = query._pgquery
+        self._order = query._order
+        self._tx.set_dumper_types(query.types, query.format)
+        self.dump(vars)
+
+    def dump(self, vars: Params | None) -> None:
+        tx = self._tx
+        assert tx.types is not None
+        if vars is None:
+            if tx.types:
+                raise e.ProgrammingError(
+                    f"the query has {len(tx.types)} placeholders but"
+                    " no parameters were passed"
+                )
+            self.params = None
+            self.types = ()
+            self.formats = None
+            return
+
+        if self.is_params_sequence(vars):
+            if self._order:
+                raise TypeError("named placeholders require a mapping of parameters")
+            if len(vars) != len(tx.types):
+                raise e.ProgrammingError(
+                    f"the query has {len(tx.types)} placeholders but"
+                    f" {len(vars)} parameters were passed"
+                )
+        elif (order := self._order) is None:
+            if vars:
+                raise TypeError(
+                    "positional placeholders (%s) require a sequence of parameters"
+                )
+            vars = ()
+        else:
+            try:
+                vars = [vars[item] for item in order]  # type: ignore[call-overload]
+            except KeyError:
+                raise e.ProgrammingError(
+                    "query parameter missing:"
+                    f" {', '.join(sorted(i for i in order if i not in vars))}"
+                )
+
+        self.params = tx.dump_sequence(vars, tx.formats)  # type: ignore[arg-type]
+        self.types = tx.types
+        self.formats = tx.formats
+
+
+# Max number of parameters PostgreSQL accepts in a statement
+MAX_PARAMS = 65535
+
+
+class PostgresBatchQuery(PostgresQuery):
+    """
+    PostgresQuery subclass inserting several records in a single statement.
+
+    A query in the form :sql:`INSERT ... VALUES (...)` is rewritten into a
+    query inserting several rows, each one with its own parameters.
+    """
+
+    __slots__ = ("_head", "_row", "_tail", "_nrows", "_batch_formats")
+
+    def convert_batch(self, query: Query, rows: Sequence[Params]) -> None:
+        """
+        Set up the query to insert many rows and the parameters of the first batch.
+        """
+        if isinstance(query, Template):
+            raise e.NotSupportedError(
+                "executemany() with batch_rows doesn't support template strings"
+            )
+        bquery = self._ensure_bytes(query)
+        (pgquery, self._want_formats, self._order, self._parts) = query_cache._parse(
+            _query2pg, bquery, self._tx.encoding, len(rows[0])
+        )
+        self._head, self._row, self._tail = _split_insert_values(
+            self._parts, self._order
+        )
+        self._nrows = 0
+        self.dump_batch(rows)
+
+    def dump_batch(self, rows: Sequence[Params]) -> None:
+        """
+        Process a new batch of rows on the query processed by `convert_batch()`.
+        """
+        assert self._want_formats is not None
+        if (nrows := len(rows)) != self._nrows:
+            self._set_nrows(nrows)
+
+        params: list[Any] = []
+        for row in rows:
+            params.extend(
+                self.validate_and_reorder_params(self._parts, row, self._order)
+            )
+
+        self.params = self._tx.dump_sequence(params, self._batch_formats)
+        self.types = self._tx.types or ()
+        self.formats = self._tx.formats
+
+    def _set_nrows(self, nrows: int) -> None:
+        assert self._want_formats is not None
+        if (nparams := len(self._want_formats) * nrows) > MAX_PARAMS:
+            raise e.ProgrammingError(
+                f"batches of {nrows} rows would require {nparams} parameters"
+                f" but the maximum is {MAX_PARAMS}: please use fewer rows"
+            )
+
+        ncols = len(self._want_formats)
+        values = []
+        for i in range(nrows):
+            offset = i * ncols + 1
+            row = [
+                chunk if isinstance(chunk, bytes) else b"$%d" % (chunk + offset)
+                for chunk in self._row
+            ]
+            values.append(b"".join(row))
+        self.query = b"".join((self._head, b", ".join(values), self._tail))
+        self._batch_formats = self._want_formats * nrows
+        self._nrows = nrows
+
+
+_re_insert_values = re.compile(rb"(?is)^\s*INSERT\b.*?\bVALUES\s*\(")
+
+# Tokens to recognise looking for the end of the values: parentheses, and
+# the tokens in which parentheses don't count.
+_re_values_token = re.compile(
+    rb"""(?xs)
+        [eE]'(?:[^'\\]|''|\\.)*'           # escape string
+        | '(?:[^']|'')*'                    # string
+        | "(?:[^"]|"")*"                    # quoted identifier
+        | \$([A-Za-z_][A-Za-z_0-9]*|)\$.*?\$\1\$  # dollar-quoted string
+        | --[^\n]*                          # comment
+        | /\*.*?\*/                          # block comment
+        | [()]
+    """
+)
+
+
+def _split_insert_values(
+    parts: list[QueryPart], order: list[str] | None
+) -> tuple[bytes, list[bytes | int], bytes]:
+    """
+    Split an :sql:`INSERT ... VALUES (...)` query around its values.
+
+    Return the query before the values, the values in parentheses and the
+    query after them. The values are returned as a list of query chunks and
+    0-based numbers of the parameters.
+    """
+    # The query with the placeholders replaced by a separator.
+    query = b"\0".join(part.pre for part in parts)
+    if not (m := _re_insert_values.match(query)):
+        raise e.ProgrammingError(
+            "batch_rows is only supported with queries in the form"
+            " 'INSERT ... VALUES (...)'"
+        )
+
+    # Look for the parenthesis closing the values, skipping literals and
+    # comments.
+    start = m.end() - 1
+    depth = 0
+    for tm in _re_values_token.finditer(query, start):
+        if (token := tm.group()) == b"(":
+            depth += 1
+        elif token == b")":
+            depth -= 1
+            if not depth:
+                end = tm.end()
+                break
+    else:
+        raise e.ProgrammingError("unbalanced parentheses in the query values")
+
+    if start >= len(parts[0].pre) or end <= len(query) - len(parts[-1].pre):
+        raise e.ProgrammingError(
+            "batch_rows requires all the query placeholders in the values"
+        )
+
+    tail = query[end:]
+    if tail.lstrip().startswith(b","):
+        raise e.ProgrammingError(
+            "batch_rows requires a query inserting a single row of values"
+        )
+
+    # Build the values from the query parts, so that only the placeholders
+    # can be renumbered, not what looks like them, e.g. in strings.
+    if len(parts) == 1:
+        return query[:start], [query[start:end]], tail
+
+    numbers = {name: i for i, name in enumerate(order)} if order else {}
+    row: list[bytes | int] = [parts[0].pre[start:]]
+    for i, part in enumerate(parts[:-1]):
+        if i:
+            row.append(part.pre)
+        row.append(part.item if isinstance(part.item, int) else numbers[part.item])
+    last = parts[-1].pre
+    row.append(last[: len(last) - len(tail)])
+    return query[:start], row, tail
@@ -6,19 +6,40 @@ psycopg server-side cursor (async).
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, overload
-from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, TypeAlias, overload
+from weakref import ReferenceType, ref
 
 from . import errors as e
-from .abc import Params, Query
+from . import pq
+from .abc import AsyncParamsSeq, Params, Query
 from .rows import AsyncRowFactory, Row
 from ._compat import Self
+from ._acompat import AQueue, AWorker, agather, aspawn
+from ._queries import CompiledQuery
+from .types.numpy import load_columns
 from .cursor_async import AsyncCursor
 from ._server_cursor_base import ServerCursorMixin
 
+if True:  # ASYNC
+    import asyncio
+else:
+    from queue import Full
+
 if TYPE_CHECKING:
+    from .pq.abc import PGresult
     from .connection_async import AsyncConnection
 
+INTRANS = pq.TransactionStatus.INTRANS
+
+# Interval to check if the prefetch worker should stop while the queue is full.
+PREFETCH_CHECK_INTERVAL = 1.0
+
+# A page of records as returned by _prefetch_page_gen(), an exception to
+# propagate to the iterating task, or None if the transaction has ended.
+_PrefetchItem: TypeAlias = (
+    "tuple[list[Any], bool, PGresult, int] | BaseException | None"
+)
+
 
 class AsyncServerCursor(
     ServerCursorMixin["AsyncConnection[Any]", Row], AsyncCursor[Row]
@@ -26,6 +47,9 @@ class AsyncServerCursor(
     __module__ = "psycopg"
     __slots__ = ()
 
+    _prefetcher: AWorker | None
+    _prefetch_queue: AQueue[_PrefetchItem] | None
+
     @overload
     def __init__(
         self,
@@ -65,6 +89,7 @@ class AsyncServerCursor(
         """
         Close the current cursor and free associated resources.
         """
+        await self._stop_prefetch()
         async with self._conn.lock:
             if self.closed:
                 return
@@ -74,7 +99,7 @@ class AsyncServerCursor(
 
     async def execute(
         self,
-        query: Query,
+        query: Query | CompiledQuery,
         params: Params | None = None,
         *,
         binary: bool | None = None,
@@ -90,6 +115,7 @@ class AsyncServerCursor(
                 "server-side cursors not supported in pipeline mode"
             )
 
+        await self._stop_prefetch()
         try:
             async with self._conn.lock:
                 await self._conn.wait(self._declare_gen(query, params, binary))
@@ -99,12 +125,18 @@ class AsyncServerCursor(
         return self
 
     async def executemany(
-        self, query: Query, params_seq: Iterable[Params], *, returning: bool = True
+        self,
+        query: Query | CompiledQuery,
+        params_seq: AsyncParamsSeq,
+        *,
+        returning: bool = True,
+        batch_rows: int | None = None,
     ) -> None:
         """Method not implemented for server-side cursors."""
         raise e.NotSupportedError("executemany not supported on server-side cursors")
 
     async def fetchone(self) -> Row | None:
+        await self._stop_prefetch()
         async with self._conn.lock:
             recs = await self._conn.wait(self._fetch_gen(1))
         if recs:
@@ -116,29 +148,44 @@ class AsyncServerCursor(
     async def fetchmany(self, size: int = 0) -> list[Row]:
         if not size:
             size = self.arraysize
+        await self._stop_prefetch()
         async with self._conn.lock:
             recs = await self._conn.wait(self._fetch_gen(size))
         self._pos += len(recs)
         return recs
 
     async def fetchall(self) -> list[Row]:
+        await self._stop_prefetch()
         async with self._conn.lock:
             recs = await self._conn.wait(self._fetch_gen(None))
         self._pos += len(recs)
         return recs
 
+    async def fetchall_numpy(self) -> list[Any]:
+        await self._stop_prefetch()
+        async with self._conn.lock:
+            res = await self._conn.wait(self._fetch_result_gen(None))
+        self._pos += res.ntuples
+        return load_columns(res, self._tx, 0, res.ntuples)
+
     def __aiter__(self) -> Self:
         return self
 
     async def __anext__(self) -> Row:
         # Fetch a new page if we never fetched any, or we are at the end of
-        # a page of size itersize, meaning there is likely a following one.
+        # a complete page, meaning there is likely a following one.
         if self._iter_rows is None or (
-            self._page_pos >= len(self._iter_rows) >= self.itersize
+            self._page_pos >= len(self._iter_rows) and self._iter_more
         ):
-            async with self._conn.lock:
-                self._iter_rows = await self._conn.wait(self._fetch_gen(self.itersize))
-                self._page_pos += 0
+            if self.prefetch > 0:
+                rows, self._iter_more = await self._prefetch_page()
+            else:
+                async with self._conn.lock:
+                    rows, self._iter_more = await self._conn.wait(
+                        self._fetch_page_gen()
+                    )
+            self._iter_rows = rows
+            self._page_pos = 0
 
         if self._page_pos >= len(self._iter_rows):
             raise StopAsyncIteration("no more records to return")
@@ -148,7 +195,139 @@ class AsyncServerCursor(
         self._pos += 1
         return rec
 
+    async def _prefetch_page(self) -> tuple[list[Row], bool]:
+        """
+        Return the next page of records fetched by the prefetch worker.
+
+        Also return whether more records may follow.
+        """
+        if not self._prefetcher:
+            # Describe a cursor not declared by us before the worker starts
+            # fetching, as the worker doesn't change the cursor state.
+            async with self._conn.lock:
+                await self._conn.wait(self._ensure_described_gen())
+            self._prefetch_queue = AQueue(maxsize=self.prefetch)
+            # The worker only keeps a weak reference to the cursor, in order
+            # to terminate if the cursor is deleted without being closed.
+            self._prefetcher = aspawn(
+                self._prefetch_worker, (ref(self), self._prefetch_queue)
+            )
+
+        assert self._prefetch_queue
+        page = await self._prefetch_queue.get()
+        if page is None:
+            # The transaction has ended: fetch without the worker, so that
+            # the outcome is the same as without prefetching.
+            await self._stop_prefetch()
+            async with self._conn.lock:
+                return await self._conn.wait(self._fetch_page_gen())
+        if isinstance(page, BaseException):
+            await self._stop_prefetch()
+            raise page
+
+        rows, more, res, itersize = page
+        self.pgresult = res
+        self._tx.set_pgresult(res, set_loaders=False)
+        if self.itersize_bytes:
+            self.itersize = itersize
+        if not more:
+            # The last page: the worker has terminated.
+            await self._stop_prefetch()
+        return rows, more
+
+    @staticmethod
+    async def _prefetch_worker(
+        wself: ReferenceType[AsyncServerCursor[Any]], queue: AQueue[_PrefetchItem]
+    ) -> None:
+        """Fetch pages of records in advance and put them in the prefetch queue.
+
+        Terminate after fetching an incomplete page, on error, when the
+        transaction holding the cursor ends, when `_stop_prefetch()` is
+        called, or when the cursor is deleted.
+
+        The function is designed to be run in a separate task.
+        """
+        item: tuple[list[Any], bool, PGresult, int] | None
+        itersize = 0
+        try:
+            while True:
+                if not (cur := wself()):
+                    break
+                # The size of the pages is tracked here if it's adaptive, as
+                # the cursor itersize is only updated when pages are consumed.
+                if not itersize or not cur.itersize_bytes:
+                    itersize = cur.itersize
+                async with cur._conn.lock:
+                    if cur._prefetch_stop:
+                        break
+                    if (
+                        not cur._withhold
+                        and cur._conn.pgconn.transaction_status != INTRANS
+                    ):
+                        item = None
+                    else:
+                        gen = cur._prefetch_page_gen(itersize)
+                        item = await cur._conn.wait(gen)
+                        itersize = item[3]
+                del cur
+                if not await AsyncServerCursor._prefetch_put(wself, queue, item):
+                    break
+                if not item or not item[1]:
+                    break
+        except BaseException as ex:
+            # Propagate the error to the iterating task.
+            cur = None  # don't keep the cursor alive while waiting
+            await AsyncServerCursor._prefetch_put(wself, queue, ex)
+
+    @staticmethod
+    async def _prefetch_put(
+        wself: ReferenceType[AsyncServerCursor[Any]],
+        queue: AQueue[_PrefetchItem],
+        item: _PrefetchItem,
+    ) -> bool:
+        """
+        Put an item in the prefetch queue, waiting for room if needed.
+
+        Return False, without putting the item, if the prefetching is stopped
+        or the cursor is deleted while waiting.
+        """
+        while True:
+            if True:  # ASYNC
+                try:
+                    await asyncio.wait_for(queue.put(item), PREFETCH_CHECK_INTERVAL)
+                    return True
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                try:
+                    queue.put(item, timeout=PREFETCH_CHECK_INTERVAL)
+                    return True
+                except Full:
+                    pass
+
+            if not (cur := wself()) or cur._prefetch_stop:
+                return False
+            del cur
+
+    async def _stop_prefetch(self) -> None:
+        """
+        Terminate the prefetch worker, discarding the pages not consumed yet.
+        """
+        if not (worker := self._prefetcher):
+            return
+
+        assert self._prefetch_queue
+        self._prefetch_stop = True
+        # Make room in the queue in case the worker is waiting to put a page.
+        while not self._prefetch_queue.empty():
+            self._prefetch_queue.get_nowait()
+        await agather(worker)
+
+        self._prefetcher = self._prefetch_queue = None
+        self._prefetch_stop = False
+
     async def scroll(self, value: int, mode: str = "relative") -> None:
+        await self._stop_prefetch()
         async with self._conn.lock:
             await self._conn.wait(self._scroll_gen(value, mode))
         # Postgres doesn't have a reliable way to report a cursor out of bound
@@ -6,19 +6,30 @@ psycopg server-side cursor base objects.
 
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from warnings import warn
 
+from . import adapt
 from . import errors as e
 from . import pq, sql
 from .abc import ConnectionType, Params, PQGen, Query
 from .rows import Row
 from ._compat import Interpolation, Template
+from ._queries import CompiledQuery
 from .generators import execute
 from ._cursor_base import BaseCursor
 
+if TYPE_CHECKING:
+    from .pq.abc import PGresult
+
 DEFAULT_ITERSIZE = 100
 
+# Max factor by which an adaptive itersize can grow after each page
+ITERSIZE_GROWTH = 4
+
+# Max number of records of a page to inspect to estimate the records size
+ITERSIZE_SAMPLE = 32
+
 TEXT = pq.Format.TEXT
 BINARY = pq.Format.BINARY
 
@@ -33,7 +44,8 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
     """Mixin to add ServerCursor behaviour and implementation a BaseCursor."""
 
     __slots__ = """_name _scrollable _withhold _described itersize _format
-        _iter_rows _page_pos
+        _iter_rows _page_pos _iter_more itersize_bytes
+        prefetch _prefetcher _prefetch_queue _prefetch_stop
     """.split()
 
     def __init__(self, name: str, scrollable: bool | None, withhold: bool):
@@ -42,11 +54,21 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
         self._withhold = withhold
         self._described = False
         self.itersize: int = DEFAULT_ITERSIZE
+        self.itersize_bytes: int | None = None
         self._format = TEXT
 
-        # Hold the state during iteration: a fetched page and position within it
+        # Hold the state during iteration: a fetched page, position within it
+        # and whether more pages may follow.
         self._iter_rows: list[Row] | None = None
         self._page_pos = 0
+        self._iter_more = False
+
+        # Number of pages to fetch in advance during iteration, and the
+        # state of the worker fetching them.
+        self.prefetch = 0
+        self._prefetcher: Any = None
+        self._prefetch_queue: Any = None
+        self._prefetch_stop = False
 
     def __del__(self, __warn: Any = warn) -> None:
         if self.closed:
@@ -100,9 +122,16 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
         return self._pos if tuples else None
 
     def _declare_gen(
-        self, query: Query, params: Params | None = None, binary: bool | None = None
+        self,
+        query: Query | CompiledQuery,
+        params: Params | None = None,
+        binary: bool | None = None,
     ) -> PQGen[None]:
         """Generator implementing `ServerCursor.execute()`."""
+        if isinstance(query, CompiledQuery):
+            raise e.NotSupportedError(
+                "compiled queries not supported on server-side cursors"
+            )
 
         query = self._make_declare_statement(query)
 
@@ -163,12 +192,76 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
         yield from self._conn._exec_command(query)
 
     def _fetch_gen(self, num: int | None) -> PQGen[list[Row]]:
+        res = yield from self._fetch_result_gen(num)
+        return self._tx.load_rows(0, res.ntuples, self._make_row)
+
+    def _fetch_page_gen(self) -> PQGen[tuple[list[Row], bool]]:
+        """
+        Fetch a page of records iterating on the cursor.
+
+        Return the records and whether more records may follow.
+        """
+        num = self.itersize
+        res = yield from self._fetch_result_gen(num)
+        if self.itersize_bytes:
+            self.itersize = self._adapt_itersize(res, self.itersize_bytes, num)
+        rows = self._tx.load_rows(0, res.ntuples, self._make_row)
+        return rows, len(rows) >= num
+
+    def _prefetch_page_gen(
+        self, num: int
+    ) -> PQGen[tuple[list[Row], bool, PGresult, int]]:
+        """
+        Fetch a page of `!num` records for the prefetch worker.
+
+        Return the records, whether more records may follow, the result and
+        the number of records to fetch in the next page.
+
+        The state of the cursor is not changed, as it may be in use by another
+        thread: the records are loaded by their own Transformer, and the result
+        is set on the cursor when the page is consumed.
+        """
+        res = yield from self._fetch_pgresult_gen(num)
+        tx = adapt.Transformer(self)
+        tx.set_pgresult(res, format=self._format)
+        rows = tx.load_rows(0, res.ntuples, self._make_row)
+        more = len(rows) >= num
+        if self.itersize_bytes:
+            num = self._adapt_itersize(res, self.itersize_bytes, num)
+        return rows, more, res, num
+
+    def _adapt_itersize(self, res: PGresult, nbytes: int, itersize: int) -> int:
+        """
+        Return the itersize to fetch about `!nbytes` of data in the next page.
+
+        The size of the records is estimated on a sample of the ones in `!res`.
+        The itersize can shrink at once but it can only grow gradually, in case
+        the first records are not representative of the following ones.
+        """
+        if not (ntuples := res.ntuples):
+            return itersize
+
+        nfields = res.nfields
+        size = nsampled = 0
+        for i in range(0, ntuples, max(1, ntuples // ITERSIZE_SAMPLE)):
+            nsampled += 1
+            for j in range(nfields):
+                if (v := res.get_value(i, j)) is not None:
+                    size += len(v)
+
+        width = max(1.0, size / nsampled)
+        return max(1, min(int(nbytes / width), itersize * ITERSIZE_GROWTH))
+
+    def _fetch_result_gen(self, num: int | None) -> PQGen[PGresult]:
+        res = yield from self._fetch_pgresult_gen(num)
+        self.pgresult = res
+        self._tx.set_pgresult(res, set_loaders=False)
+        return res
+
+    def _fetch_pgresult_gen(self, num: int | None) -> PQGen[PGresult]:
         if self.closed:
             raise e.InterfaceError("the cursor is closed")
-        # If we are stealing the cursor, make sure we know its shape
-        if not self._described:
-            yield from self._start_query()
-            yield from self._describe_gen()
+        yield from self._ensure_described_gen()
 
         query = sql.SQL("FETCH FORWARD {} FROM {}").format(
             sql.SQL("ALL") if num is None else sql.Literal(num),
@@ -177,10 +270,13 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
         res = yield from self._conn._exec_command(query, result_format=self._format)
         # pipeline mode otherwise, unsupported here.
         assert res is not None
+        return res
 
-        self.pgresult = res
-        self._tx.set_pgresult(res, set_loaders=False)
-        return self._tx.load_rows(0, res.ntuples, self._make_row)
+    def _ensure_described_gen(self) -> PQGen[None]:
+        # If we are stealing the cursor, make sure we know its shape
+        if not self._described:
+            yield from self._start_query()
+            yield from self._describe_gen()
 
     def _scroll_gen(self, value: int, mode: str) -> PQGen[None]:
         if mode not in ("relative", "absolute"):
@@ -7,7 +7,8 @@ Protocol objects representing different implementations of the same classes.
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, Protocol, TypeAlias, Union
-from collections.abc import Callable, Generator, Mapping, Sequence
+from collections.abc import AsyncIterable, Callable, Generator, Iterable, Mapping
+from collections.abc import Sequence
 
 from . import pq
 from ._enums import PyFormat as PyFormat
@@ -29,6 +30,8 @@ Buffer: TypeAlias = Union[bytes, bytearray, memoryview]
 QueryNoTemplate: TypeAlias = Union[LiteralString, bytes, "sql.SQL", "sql.Composed"]
 Query: TypeAlias = Union[QueryNoTemplate, Template]
 Params: TypeAlias = Union[Sequence[Any], Mapping[str, Any]]
+ParamsSeq: TypeAlias = Iterable[Params]
+AsyncParamsSeq: TypeAlias = Union[Iterable[Params], AsyncIterable[Params]]
 ConnectionType = TypeVar("ConnectionType", bound="BaseConnection[Any]")
 PipelineCommand: TypeAlias = Callable[[], None]
 DumperKey: TypeAlias = Union[type, tuple["DumperKey", ...]]
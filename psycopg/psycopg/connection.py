@@ -15,12 +15,13 @@ from time import monotonic
 from types import TracebackType
 from typing import TYPE_CHECKING, Any, cast, overload
 from contextlib import contextmanager
-from collections.abc import Generator, Iterator
+from collections.abc import Generator, Iterable, Iterator, Sequence
 
 from . import errors as e
 from . import pq, waiting
 from .abc import RV, AdaptContext, ConnDict, ConnParam, Params, PQGen, Query
 from .abc import QueryNoTemplate
+from .sql import SQL, Composable
 from ._tpc import Xid
 from .rows import Row, RowFactory, args_row, tuple_row
 from .adapt import AdaptersMap
@@ -28,9 +29,11 @@ from ._enums import IsolationLevel
 from .cursor import Cursor
 from ._compat import Self, Template
 from ._acompat import Lock
+from ._queries import CompiledQuery
 from .conninfo import conninfo_attempts, conninfo_to_dict, make_conninfo
 from .conninfo import timeout_from_conninfo
 from ._pipeline import Pipeline
+from ._preparing import Key
 from .generators import notifies
 from .transaction import Transaction
 from ._capabilities import capabilities
@@ -261,7 +264,7 @@ class Connection(BaseConnection[Row]):
     @overload
     def execute(
         self,
-        query: QueryNoTemplate,
+        query: QueryNoTemplate | CompiledQuery,
         params: Params | None = None,
         *,
         prepare: bool | None = None,
@@ -275,7 +278,7 @@ class Connection(BaseConnection[Row]):
 
     def execute(
         self,
-        query: Query,
+        query: Query | CompiledQuery,
         params: Params | None = None,
         *,
         prepare: bool | None = None,
@@ -433,19 +436,30 @@ class Connection(BaseConnection[Row]):
                 self._notifies_backlog = d
 
     @contextmanager
-    def pipeline(self) -> Iterator[Pipeline]:
-        """Context manager to switch the connection into pipeline mode."""
+    def pipeline(self, *, max_pending: int | None = None) -> Iterator[Pipeline]:
+        """Context manager to switch the connection into pipeline mode.
+
+        :param max_pending: The maximum number of results to wait for before
+            fetching them. If `!None`, use the value of the outer pipeline
+            block, if any, otherwise don't limit them.
+        """
         with self.lock:
             self._check_connection_ok()
 
             if (pipeline := self._pipeline) is None:
                 # WARNING: reference loop, broken ahead.
-                pipeline = self._pipeline = Pipeline(self)
+                pipeline = self._pipeline = Pipeline(self, max_pending)
+                outer_max_pending = max_pending
+            else:
+                outer_max_pending = pipeline.max_pending
+                if max_pending is not None:
+                    pipeline.max_pending = max_pending
 
         try:
             with pipeline:
                 yield pipeline
         finally:
+            pipeline.max_pending = outer_max_pending
             if pipeline.level == 0:
                 with self.lock:
                     assert pipeline is self._pipeline
@@ -472,6 +486,96 @@ class Connection(BaseConnection[Row]):
             assert pipeline is self._pipeline
             self._pipeline = None
 
+    def bulk_upsert(
+        self,
+        table: str | Composable,
+        rows: Iterable[Sequence[Any]],
+        conflict_keys: Sequence[str],
+        *,
+        columns: Sequence[str],
+        update: Sequence[str] | None = None,
+        binary: bool = True,
+    ) -> int:
+        """
+        Insert records into a table, updating the ones already existing.
+
+        The records are copied into a temporary table using :sql:`COPY`, then
+        they are inserted into the table using :sql:`INSERT ... ON CONFLICT`.
+
+        :param table: The name of the table to insert into (use a `sql.Identifier`
+            for a qualified name).
+        :param rows: The records to insert, each one with a value for each of
+            the `!columns`.
+        :param conflict_keys: The columns identifying an existing record.
+        :param columns: The columns to insert.
+        :param update: The columns to update if the record already exists. If
+            `!None`, update all the `!columns` except the `!conflict_keys`; if
+            empty, don't update existing records.
+        :param binary: If `!True`, copy the records in binary format.
+        :return: The number of records inserted or updated.
+        """
+        if self._pipeline:
+            raise e.NotSupportedError("bulk_upsert() cannot be used in pipeline mode")
+        queries = self._bulk_upsert_queries(
+            table, columns, conflict_keys, update, binary
+        )
+        # The statements are executed as internal commands, so that they
+        # don't interfere with the prepared statements of the connection.
+        try:
+            with self.transaction():
+                with self.lock:
+                    res = self.wait(
+                        self._exec_command(
+                            SQL("; ").join([queries.create, queries.describe])
+                        )
+                    )
+                assert res
+                types = [res.ftype(i) for i in range(res.nfields)]
+
+                with self.cursor() as cur:
+                    with cur.copy(queries.copy) as copy:
+                        copy.set_types(types)
+                        for row in rows:
+                            copy.write_row(row)
+
+                with self.lock:
+                    res = self.wait(self._exec_command(queries.insert))
+                assert res
+        except e._NO_TRACEBACK as ex:
+            raise ex.with_traceback(None)
+
+        return res.command_tuples or 0
+
+    def flush_deallocations(self) -> None:
+        """
+        Deallocate the prepared statements evicted and not deallocated yet.
+
+        All the pending statements are deallocated in a single round trip.
+        """
+        try:
+            with self.lock:
+                self.wait(self._prepared.maintain_gen(self, force=True))
+        except e._NO_TRACEBACK as ex:
+            raise ex.with_traceback(None)
+
+    def _prepare_statements(self, keys: Sequence[Key]) -> None:
+        """
+        Prepare the statements identified by *keys*, without executing them.
+
+        If possible, send all the statements to the server in a single batch.
+        """
+        try:
+            with self.lock:
+                if not self._pipeline and Pipeline.is_supported():
+                    with self._pipeline_nolock():
+                        self.wait(self._prepare_statements_gen(keys))
+                else:
+                    self.wait(self._prepare_statements_gen(keys))
+        except e._NO_TRACEBACK as ex:
+            # We don't know which statements were prepared: discard them all.
+            self._prepared.clear()
+            raise ex.with_traceback(None)
+
     def wait(self, gen: PQGen[RV], interval: float = _WAIT_INTERVAL) -> RV:
         """
         Consume a generator operating on the connection.
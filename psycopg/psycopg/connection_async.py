@@ -12,20 +12,23 @@ from time import monotonic
 from types import TracebackType
 from typing import TYPE_CHECKING, Any, cast, overload
 from contextlib import asynccontextmanager
-from collections.abc import AsyncGenerator, AsyncIterator
+from collections.abc import AsyncGenerator, AsyncIterator, Iterable, Sequence
 
 from . import errors as e
 from . import pq, waiting
 from .abc import RV, AdaptContext, ConnDict, ConnParam, Params, PQGen, Query
 from .abc import QueryNoTemplate
+from .sql import SQL, Composable
 from ._tpc import Xid
 from .rows import AsyncRowFactory, Row, args_row, tuple_row
 from .adapt import AdaptersMap
 from ._enums import IsolationLevel
 from ._compat import Self, Template
 from ._acompat import ALock
+from ._queries import CompiledQuery
 from .conninfo import conninfo_attempts_async, conninfo_to_dict, make_conninfo
 from .conninfo import timeout_from_conninfo
+from ._preparing import Key
 from .generators import notifies
 from .transaction import AsyncTransaction
 from .cursor_async import AsyncCursor
@@ -38,6 +41,7 @@ from ._server_cursor_async import AsyncServerCursor
 if True:  # ASYNC
     import sys
     import asyncio
+    from typing import NamedTuple
 
 if TYPE_CHECKING:
     from .pq.abc import PGconn
@@ -58,6 +62,18 @@ else:
 
 logger = logging.getLogger("psycopg")
 
+if True:  # ASYNC
+
+    class _AutoItem(NamedTuple):
+        """A query waiting to be executed in an automatic pipeline."""
+
+        cursor: AsyncCursor[Any]
+        query: Query | CompiledQuery
+        params: Params | None
+        prepare: bool | None
+        binary: bool | None
+        future: asyncio.Future[None]
+
 
 class AsyncConnection(BaseConnection[Row]):
     """
@@ -81,6 +97,10 @@ class AsyncConnection(BaseConnection[Row]):
         self.lock = ALock()
         self.cursor_factory = AsyncCursor
         self.server_cursor_factory = AsyncServerCursor
+        if True:  # ASYNC
+            self._auto_pipeline = False
+            self._auto_queue: list[_AutoItem] = []
+            self._auto_flusher: asyncio.Task[None] | None = None
 
     @classmethod
     async def connect(
@@ -282,7 +302,7 @@ class AsyncConnection(BaseConnection[Row]):
     @overload
     async def execute(
         self,
-        query: QueryNoTemplate,
+        query: QueryNoTemplate | CompiledQuery,
         params: Params | None = None,
         *,
         prepare: bool | None = None,
@@ -300,7 +320,7 @@ class AsyncConnection(BaseConnection[Row]):
 
     async def execute(
         self,
-        query: Query,
+        query: Query | CompiledQuery,
         params: Params | None = None,
         *,
         prepare: bool | None = None,
@@ -468,19 +488,32 @@ class AsyncConnection(BaseConnection[Row]):
                 self._notifies_backlog = d
 
     @asynccontextmanager
-    async def pipeline(self) -> AsyncIterator[AsyncPipeline]:
-        """Context manager to switch the connection into pipeline mode."""
+    async def pipeline(
+        self, *, max_pending: int | None = None
+    ) -> AsyncIterator[AsyncPipeline]:
+        """Context manager to switch the connection into pipeline mode.
+
+        :param max_pending: The maximum number of results to wait for before
+            fetching them. If `!None`, use the value of the outer pipeline
+            block, if any, otherwise don't limit them.
+        """
         async with self.lock:
             self._check_connection_ok()
 
             if (pipeline := self._pipeline) is None:
                 # WARNING: reference loop, broken ahead.
-                pipeline = self._pipeline = AsyncPipeline(self)
+                pipeline = self._pipeline = AsyncPipeline(self, max_pending)
+                outer_max_pending = max_pending
+            else:
+                outer_max_pending = pipeline.max_pending
+                if max_pending is not None:
+                    pipeline.max_pending = max_pending
 
         try:
             async with pipeline:
                 yield pipeline
         finally:
+            pipeline.max_pending = outer_max_pending
             if pipeline.level == 0:
                 async with self.lock:
                     assert pipeline is self._pipeline
@@ -507,6 +540,214 @@ class AsyncConnection(BaseConnection[Row]):
             assert pipeline is self._pipeline
             self._pipeline = None
 
+    if True:  # ASYNC
+
+        @property
+        def auto_pipeline(self) -> bool:
+            """
+            Execute concurrent queries in a single pipeline.
+
+            If `!True`, the queries executed by `AsyncCursor.execute()` by
+            different tasks at the same time are sent to the server together
+            in pipeline mode, and each task receives its result.
+            """
+            return self._auto_pipeline
+
+        @auto_pipeline.setter
+        def auto_pipeline(self, value: bool) -> None:
+            if value:
+                capabilities.has_pipeline(check=True)
+            self._auto_pipeline = value
+
+        async def _auto_execute(
+            self,
+            cursor: AsyncCursor[Any],
+            query: Query | CompiledQuery,
+            params: Params | None,
+            prepare: bool | None,
+            binary: bool | None,
+        ) -> None:
+            """
+            Queue a query to execute in the next automatic pipeline.
+            """
+            fut = asyncio.get_running_loop().create_future()
+            self._auto_queue.append(
+                _AutoItem(cursor, query, params, prepare, binary, fut)
+            )
+            if not self._auto_flusher:
+                self._auto_flusher = asyncio.create_task(self._auto_flush())
+            await fut
+
+        async def _auto_flush(self) -> None:
+            """
+            Execute the queries queued by concurrent tasks.
+
+            The queries queued while waiting for the lock are executed in the
+            same pipeline.
+            """
+            try:
+                while self._auto_queue:
+                    async with self.lock:
+                        items = [i for i in self._auto_queue if not i.future.done()]
+                        self._auto_queue.clear()
+                        if items:
+                            await self._auto_flush_items(items)
+            finally:
+                self._auto_flusher = None
+
+        async def _auto_flush_items(self, items: list[_AutoItem]) -> None:
+            errors: list[Exception | None]
+            try:
+                if self._pipeline:
+                    # A pipeline was entered while the items were queued.
+                    # Execute them normally.
+                    errors = []
+                    for i in items:
+                        try:
+                            await self.wait(
+                                i.cursor._execute_gen(
+                                    i.query,
+                                    i.params,
+                                    prepare=i.prepare,
+                                    binary=i.binary,
+                                )
+                            )
+                        except Exception as ex:
+                            errors.append(ex)
+                        else:
+                            errors.append(None)
+                else:
+                    # WARNING: reference loop, broken ahead.
+                    pipeline = self._pipeline = AsyncPipeline(self, _no_lock=True)
+                    try:
+                        errors = await self.wait(
+                            pipeline._batch_gen(
+                                [
+                                    i.cursor._execute_send_gen(
+                                        i.query,
+                                        i.params,
+                                        prepare=i.prepare,
+                                        binary=i.binary,
+                                    )
+                                    for i in items
+                                ]
+                            )
+                        )
+                    finally:
+                        self._pipeline = None
+
+                    for i, error in zip(items, errors):
+                        if not error:
+                            i.cursor._last_query = i.query
+                    await self.wait(self._prepared.maintain_gen(self))
+
+            except BaseException as ex:
+                for i in items:
+                    if not i.future.done():
+                        i.future.set_exception(ex)
+                if not isinstance(ex, Exception):
+                    raise
+                return
+
+            for i, error in zip(items, errors):
+                if i.future.done():
+                    continue
+                if error:
+                    i.future.set_exception(error)
+                else:
+                    i.future.set_result(None)
+
+    async def bulk_upsert(
+        self,
+        table: str | Composable,
+        rows: Iterable[Sequence[Any]],
+        conflict_keys: Sequence[str],
+        *,
+        columns: Sequence[str],
+        update: Sequence[str] | None = None,
+        binary: bool = True,
+    ) -> int:
+        """
+        Insert records into a table, updating the ones already existing.
+
+        The records are copied into a temporary table using :sql:`COPY`, then
+        they are inserted into the table using :sql:`INSERT ... ON CONFLICT`.
+
+        :param table: The name of the table to insert into (use a `sql.Identifier`
+            for a qualified name).
+        :param rows: The records to insert, each one with a value for each of
+            the `!columns`.
+        :param conflict_keys: The columns identifying an existing record.
+        :param columns: The columns to insert.
+        :param update: The columns to update if the record already exists. If
+            `!None`, update all the `!columns` except the `!conflict_keys`; if
+            empty, don't update existing records.
+        :param binary: If `!True`, copy the records in binary format.
+        :return: The number of records inserted or updated.
+        """
+        if self._pipeline:
+            raise e.NotSupportedError("bulk_upsert() cannot be used in pipeline mode")
+        queries = self._bulk_upsert_queries(
+            table, columns, conflict_keys, update, binary
+        )
+        # The statements are executed as internal commands, so that they
+        # don't interfere with the prepared statements of the connection.
+        try:
+            async with self.transaction():
+                async with self.lock:
+                    res = await self.wait(
+                        self._exec_command(
+                            SQL("; ").join([queries.create, queries.describe])
+                        )
+                    )
+                assert res
+                types = [res.ftype(i) for i in range(res.nfields)]
+
+                async with self.cursor() as cur:
+                    async with cur.copy(queries.copy) as copy:
+                        copy.set_types(types)
+                        for row in rows:
+                            await copy.write_row(row)
+
+                async with self.lock:
+                    res = await self.wait(self._exec_command(queries.insert))
+                assert res
+
+        except e._NO_TRACEBACK as ex:
+            raise ex.with_traceback(None)
+
+        return res.command_tuples or 0
+
+    async def flush_deallocations(self) -> None:
+        """
+        Deallocate the prepared statements evicted and not deallocated yet.
+
+        All the pending statements are deallocated in a single round trip.
+        """
+        try:
+            async with self.lock:
+                await self.wait(self._prepared.maintain_gen(self, force=True))
+        except e._NO_TRACEBACK as ex:
+            raise ex.with_traceback(None)
+
+    async def _prepare_statements(self, keys: Sequence[Key]) -> None:
+        """
+        Prepare the statements identified by *keys*, without executing them.
+
+        If possible, send all the statements to the server in a single batch.
+        """
+        try:
+            async with self.lock:
+                if not self._pipeline and AsyncPipeline.is_supported():
+                    async with self._pipeline_nolock():
+                        await self.wait(self._prepare_statements_gen(keys))
+                else:
+                    await self.wait(self._prepare_statements_gen(keys))
+        except e._NO_TRACEBACK as ex:
+            # We don't know which statements were prepared: discard them all.
+            self._prepared.clear()
+            raise ex.with_traceback(None)
+
     async def wait(self, gen: PQGen[RV], interval: float = _WAIT_INTERVAL) -> RV:
         """
         Consume a generator operating on the connection.
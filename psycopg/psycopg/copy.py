@@ -2,10 +2,12 @@
 Module gathering the various parts of the copy subsystem.
 """
 
+from io import BufferedIOBase
 from typing import IO
 
 from . import _copy, _copy_async
 from .abc import Buffer
+from ._copy_base import open_compressed
 
 # re-exports
 
@@ -26,10 +28,20 @@ class FileWriter(Writer):
 
     :param file: the file where to write copy data. It must be open for writing
         in binary mode.
+    :param compression: if specified, compress the data written using this
+        format (``gzip`` or ``zstd``).
     """
 
-    def __init__(self, file: IO[bytes]):
+    def __init__(self, file: IO[bytes], *, compression: str | None = None):
         self.file = file
+        self._zfile: BufferedIOBase | None = None
+        if compression:
+            self._zfile = open_compressed(file, compression, "wb")
 
     def write(self, data: Buffer) -> None:
-        self.file.write(data)
+        (self._zfile or self.file).write(data)
+
+    def finish(self, exc: BaseException | None = None) -> None:
+        if self._zfile:
+            # Write the end of the compressed data; the file is not closed.
+            self._zfile.close()
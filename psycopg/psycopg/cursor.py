@@ -12,15 +12,17 @@ from __future__ import annotations
 from types import TracebackType
 from typing import TYPE_CHECKING, Any, overload
 from contextlib import contextmanager
-from collections.abc import Iterable, Iterator
+from collections.abc import Iterator
 
 from . import errors as e
 from . import pq
-from .abc import Params, Query, QueryNoTemplate
+from .abc import Params, ParamsSeq, Query, QueryNoTemplate
 from .copy import Copy, Writer
 from .rows import Row, RowFactory, RowMaker
 from ._compat import Self, Template
+from ._queries import CompiledQuery
 from ._pipeline import Pipeline
+from .types.numpy import load_columns
 from ._cursor_base import BaseCursor
 
 if TYPE_CHECKING:
@@ -81,7 +83,7 @@ class Cursor(BaseCursor["Connection[Any]", Row]):
     @overload
     def execute(
         self,
-        query: QueryNoTemplate,
+        query: QueryNoTemplate | CompiledQuery,
         params: Params | None = None,
         *,
         prepare: bool | None = None,
@@ -99,7 +101,7 @@ class Cursor(BaseCursor["Connection[Any]", Row]):
 
     def execute(
         self,
-        query: Query,
+        query: Query | CompiledQuery,
         params: Params | None = None,
         *,
         prepare: bool | None = None,
@@ -118,7 +120,12 @@ class Cursor(BaseCursor["Connection[Any]", Row]):
         return self
 
     def executemany(
-        self, query: Query, params_seq: Iterable[Params], *, returning: bool = False
+        self,
+        query: Query | CompiledQuery,
+        params_seq: ParamsSeq,
+        *,
+        returning: bool = False,
+        batch_rows: int | None = None,
     ) -> None:
         """
         Execute the same command with a sequence of input data.
@@ -129,24 +136,26 @@ class Cursor(BaseCursor["Connection[Any]", Row]):
                     # If there is already a pipeline, ride it, in order to avoid
                     # sending unnecessary Sync.
                     if self._conn._pipeline:
-                        self._conn.wait(
-                            self._executemany_gen_pipeline(query, params_seq, returning)
-                        )
+                        self._executemany(query, params_seq, returning, batch_rows)
                     else:
                         # Otherwise, make a new one
                         with self._conn._pipeline_nolock():
-                            self._conn.wait(
-                                self._executemany_gen_pipeline(
-                                    query, params_seq, returning
-                                )
-                            )
+                            self._executemany(query, params_seq, returning, batch_rows)
                 else:
-                    self._conn.wait(
-                        self._executemany_gen_no_pipeline(query, params_seq, returning)
-                    )
+                    self._executemany(query, params_seq, returning, batch_rows)
         except e._NO_TRACEBACK as ex:
             raise ex.with_traceback(None)
 
+    def _executemany(
+        self,
+        query: Query | CompiledQuery,
+        params_seq: ParamsSeq,
+        returning: bool,
+        batch_rows: int | None,
+    ) -> None:
+        """Implement `executemany()` once the lock is acquired."""
+        self._conn.wait(self._executemany_gen(query, params_seq, returning, batch_rows))
+
     def stream(
         self,
         query: Query,
@@ -178,22 +187,60 @@ class Cursor(BaseCursor["Connection[Any]", Row]):
             except e._NO_TRACEBACK as ex:
                 raise ex.with_traceback(None)
             finally:
-                if self._pgconn.transaction_status == ACTIVE:
-                    # Try to cancel the query, then consume the results
-                    # already received.
-                    self._conn._try_cancel()
-                    try:
-                        while self._conn.wait(self._stream_fetchone_gen(first=False)):
-                            pass
-                    except Exception:
-                        pass
-
-                    # Try to get out of ACTIVE state. Just do a single attempt, which
-                    # should work to recover from an error or query cancelled.
-                    try:
-                        self._conn.wait(self._stream_fetchone_gen(first=False))
-                    except Exception:
-                        pass
+                self._stream_terminate()
+
+    def stream_chunks(
+        self,
+        query: Query,
+        params: Params | None = None,
+        *,
+        binary: bool | None = None,
+        size: int = 1,
+    ) -> Iterator[list[Row]]:
+        """
+        Iterate on a result from the database by lists of rows.
+
+        :param size: the number of rows retrieved by the server in every
+            chunk; if greater than 1, this is only available from version 17
+            of the libpq.
+        """
+        if self._pgconn.pipeline_status:
+            raise e.ProgrammingError("stream_chunks() cannot be used in pipeline mode")
+
+        with self._conn.lock:
+            try:
+                self._conn.wait(
+                    self._stream_send_gen(query, params, binary=binary, size=size)
+                )
+                first = True
+                while res := self._conn.wait(self._stream_fetchone_gen(first)):
+                    yield self._tx.load_rows(0, res.ntuples, self._make_row)
+                    first = False
+            except e._NO_TRACEBACK as ex:
+                raise ex.with_traceback(None)
+            finally:
+                self._stream_terminate()
+
+    def _stream_terminate(self) -> None:
+        """
+        Bring the connection back to idle after a stream is interrupted.
+        """
+        if self._pgconn.transaction_status == ACTIVE:
+            # Try to cancel the query, then consume the results
+            # already received.
+            self._conn._try_cancel()
+            try:
+                while self._conn.wait(self._stream_fetchone_gen(first=False)):
+                    pass
+            except Exception:
+                pass
+
+            # Try to get out of ACTIVE state. Just do a single attempt, which
+            # should work to recover from an error or query cancelled.
+            try:
+                self._conn.wait(self._stream_fetchone_gen(first=False))
+            except Exception:
+                pass
 
     def results(self) -> Iterator[Self]:
         """
@@ -283,6 +330,18 @@ class Cursor(BaseCursor["Connection[Any]", Row]):
         self._pos = res.ntuples
         return records
 
+    def fetchall_numpy(self) -> list[Any]:
+        """
+        Return all the remaining records from the current result set as arrays.
+
+        Return a list of NumPy arrays, one per column of the result.
+        """
+        self._fetch_pipeline()
+        res = self._check_result_for_fetch()
+        columns = load_columns(res, self._tx, self._pos, res.ntuples)
+        self._pos = res.ntuples
+        return columns
+
     def __iter__(self) -> Self:
         return self
 
@@ -316,15 +375,27 @@ class Cursor(BaseCursor["Connection[Any]", Row]):
         params: Params | None = None,
         *,
         writer: Writer | None = None,
+        format_workers: int = 0,
+        buffer_size: int | None = None,
+        max_buffer_size: int | None = None,
+        prefer_flush: bool | None = None,
     ) -> Iterator[Copy]:
         """
         Initiate a :sql:`COPY` operation and return an object to manage it.
         """
+        Copy._check_buffer_sizes(buffer_size, max_buffer_size)
         try:
             with self._conn.lock:
                 self._conn.wait(self._start_copy_gen(statement, params))
 
-                with Copy(self, writer=writer) as copy:
+                with Copy(
+                    self,
+                    writer=writer,
+                    format_workers=format_workers,
+                    buffer_size=buffer_size,
+                    max_buffer_size=max_buffer_size,
+                    prefer_flush=prefer_flush,
+                ) as copy:
                     yield copy
         except e._NO_TRACEBACK as ex:
             raise ex.with_traceback(None)
@@ -9,17 +9,22 @@ from __future__ import annotations
 from types import TracebackType
 from typing import TYPE_CHECKING, Any, overload
 from contextlib import asynccontextmanager
-from collections.abc import AsyncIterator, Iterable
+from collections.abc import AsyncIterator
 
 from . import errors as e
 from . import pq
-from .abc import Params, Query, QueryNoTemplate
+from .abc import AsyncParamsSeq, Params, Query, QueryNoTemplate
 from .copy import AsyncCopy, AsyncWriter
 from .rows import AsyncRowFactory, Row, RowMaker
 from ._compat import Self, Template
+from ._queries import CompiledQuery
+from .types.numpy import load_columns
 from ._cursor_base import BaseCursor
 from ._pipeline_async import AsyncPipeline
 
+if True:  # ASYNC
+    from collections.abc import AsyncIterable
+
 if TYPE_CHECKING:
     from .connection_async import AsyncConnection
 
@@ -81,7 +86,7 @@ class AsyncCursor(BaseCursor["AsyncConnection[Any]", Row]):
     @overload
     async def execute(
         self,
-        query: QueryNoTemplate,
+        query: QueryNoTemplate | CompiledQuery,
         params: Params | None = None,
         *,
         prepare: bool | None = None,
@@ -99,7 +104,7 @@ class AsyncCursor(BaseCursor["AsyncConnection[Any]", Row]):
 
     async def execute(
         self,
-        query: Query,
+        query: Query | CompiledQuery,
         params: Params | None = None,
         *,
         prepare: bool | None = None,
@@ -109,6 +114,10 @@ class AsyncCursor(BaseCursor["AsyncConnection[Any]", Row]):
         Execute a query or command to the database.
         """
         try:
+            if True:  # ASYNC
+                if self._conn._auto_pipeline and not self._conn._pipeline:
+                    await self._conn._auto_execute(self, query, params, prepare, binary)
+                    return self
             async with self._conn.lock:
                 await self._conn.wait(
                     self._execute_gen(query, params, prepare=prepare, binary=binary)
@@ -118,7 +127,12 @@ class AsyncCursor(BaseCursor["AsyncConnection[Any]", Row]):
         return self
 
     async def executemany(
-        self, query: Query, params_seq: Iterable[Params], *, returning: bool = False
+        self,
+        query: Query | CompiledQuery,
+        params_seq: AsyncParamsSeq,
+        *,
+        returning: bool = False,
+        batch_rows: int | None = None,
     ) -> None:
         """
         Execute the same command with a sequence of input data.
@@ -129,24 +143,71 @@ class AsyncCursor(BaseCursor["AsyncConnection[Any]", Row]):
                     # If there is already a pipeline, ride it, in order to avoid
                     # sending unnecessary Sync.
                     if self._conn._pipeline:
-                        await self._conn.wait(
-                            self._executemany_gen_pipeline(query, params_seq, returning)
+                        await self._executemany(
+                            query, params_seq, returning, batch_rows
                         )
                     # Otherwise, make a new one
                     else:
                         async with self._conn._pipeline_nolock():
-                            await self._conn.wait(
-                                self._executemany_gen_pipeline(
-                                    query, params_seq, returning
-                                )
+                            await self._executemany(
+                                query, params_seq, returning, batch_rows
                             )
                 else:
-                    await self._conn.wait(
-                        self._executemany_gen_no_pipeline(query, params_seq, returning)
-                    )
+                    await self._executemany(query, params_seq, returning, batch_rows)
         except e._NO_TRACEBACK as ex:
             raise ex.with_traceback(None)
 
+    async def _executemany(
+        self,
+        query: Query | CompiledQuery,
+        params_seq: AsyncParamsSeq,
+        returning: bool,
+        batch_rows: int | None,
+    ) -> None:
+        """Implement `executemany()` once the lock is acquired."""
+        if True:  # ASYNC
+            if isinstance(params_seq, AsyncIterable):
+                await self._executemany_aiter(query, params_seq, returning, batch_rows)
+                return
+        await self._conn.wait(
+            self._executemany_gen(query, params_seq, returning, batch_rows)
+        )
+
+    if True:  # ASYNC
+
+        async def _executemany_aiter(
+            self,
+            query: Query | CompiledQuery,
+            params_seq: AsyncIterable[Params],
+            returning: bool,
+            batch_rows: int | None,
+        ) -> None:
+            """
+            Implement `executemany()` sending the queries while iterating
+            asynchronously on the parameters.
+            """
+            wait = self._conn.wait
+            await wait(self._executemany_start_gen(query, returning, batch_rows))
+
+            pgq = None
+            if batch_rows is None:
+                async for params in params_seq:
+                    pgq = self._executemany_dump(query, params, pgq, False)
+                    await wait(self._executemany_send_gen(pgq))
+            else:
+                rows: list[Params] = []
+                async for params in params_seq:
+                    rows.append(params)
+                    if len(rows) >= batch_rows:
+                        pgq = self._executemany_dump(query, rows, pgq, True)
+                        await wait(self._executemany_send_gen(pgq))
+                        rows = []
+                if rows:
+                    pgq = self._executemany_dump(query, rows, pgq, True)
+                    await wait(self._executemany_send_gen(pgq))
+
+            await wait(self._executemany_end_gen(query, returning))
+
     async def stream(
         self,
         query: Query,
@@ -178,24 +239,60 @@ class AsyncCursor(BaseCursor["AsyncConnection[Any]", Row]):
             except e._NO_TRACEBACK as ex:
                 raise ex.with_traceback(None)
             finally:
-                if self._pgconn.transaction_status == ACTIVE:
-                    # Try to cancel the query, then consume the results
-                    # already received.
-                    await self._conn._try_cancel()
-                    try:
-                        while await self._conn.wait(
-                            self._stream_fetchone_gen(first=False)
-                        ):
-                            pass
-                    except Exception:
-                        pass
-
-                    # Try to get out of ACTIVE state. Just do a single attempt, which
-                    # should work to recover from an error or query cancelled.
-                    try:
-                        await self._conn.wait(self._stream_fetchone_gen(first=False))
-                    except Exception:
-                        pass
+                await self._stream_terminate()
+
+    async def stream_chunks(
+        self,
+        query: Query,
+        params: Params | None = None,
+        *,
+        binary: bool | None = None,
+        size: int = 1,
+    ) -> AsyncIterator[list[Row]]:
+        """
+        Iterate on a result from the database by lists of rows.
+
+        :param size: the number of rows retrieved by the server in every
+            chunk; if greater than 1, this is only available from version 17
+            of the libpq.
+        """
+        if self._pgconn.pipeline_status:
+            raise e.ProgrammingError("stream_chunks() cannot be used in pipeline mode")
+
+        async with self._conn.lock:
+            try:
+                await self._conn.wait(
+                    self._stream_send_gen(query, params, binary=binary, size=size)
+                )
+                first = True
+                while res := await self._conn.wait(self._stream_fetchone_gen(first)):
+                    yield self._tx.load_rows(0, res.ntuples, self._make_row)
+                    first = False
+            except e._NO_TRACEBACK as ex:
+                raise ex.with_traceback(None)
+            finally:
+                await self._stream_terminate()
+
+    async def _stream_terminate(self) -> None:
+        """
+        Bring the connection back to idle after a stream is interrupted.
+        """
+        if self._pgconn.transaction_status == ACTIVE:
+            # Try to cancel the query, then consume the results
+            # already received.
+            await self._conn._try_cancel()
+            try:
+                while await self._conn.wait(self._stream_fetchone_gen(first=False)):
+                    pass
+            except Exception:
+                pass
+
+            # Try to get out of ACTIVE state. Just do a single attempt, which
+            # should work to recover from an error or query cancelled.
+            try:
+                await self._conn.wait(self._stream_fetchone_gen(first=False))
+            except Exception:
+                pass
 
     async def results(self) -> AsyncIterator[Self]:
         """
@@ -285,6 +382,18 @@ class AsyncCursor(BaseCursor["AsyncConnection[Any]", Row]):
         self._pos = res.ntuples
         return records
 
+    async def fetchall_numpy(self) -> list[Any]:
+        """
+        Return all the remaining records from the current result set as arrays.
+
+        Return a list of NumPy arrays, one per column of the result.
+        """
+        await self._fetch_pipeline()
+        res = self._check_result_for_fetch()
+        columns = load_columns(res, self._tx, self._pos, res.ntuples)
+        self._pos = res.ntuples
+        return columns
+
     def __aiter__(self) -> Self:
         return self
 
@@ -318,15 +427,27 @@ class AsyncCursor(BaseCursor["AsyncConnection[Any]", Row]):
         params: Params | None = None,
         *,
         writer: AsyncWriter | None = None,
+        format_workers: int = 0,
+        buffer_size: int | None = None,
+        max_buffer_size: int | None = None,
+        prefer_flush: bool | None = None,
     ) -> AsyncIterator[AsyncCopy]:
         """
         Initiate a :sql:`COPY` operation and return an object to manage it.
         """
+        AsyncCopy._check_buffer_sizes(buffer_size, max_buffer_size)
         try:
             async with self._conn.lock:
                 await self._conn.wait(self._start_copy_gen(statement, params))
 
-                async with AsyncCopy(self, writer=writer) as copy:
+                async with AsyncCopy(
+                    self,
+                    writer=writer,
+                    format_workers=format_workers,
+                    buffer_size=buffer_size,
+                    max_buffer_size=max_buffer_size,
+                    prefer_flush=prefer_flush,
+                ) as copy:
                     yield copy
         except e._NO_TRACEBACK as ex:
             raise ex.with_traceback(None)
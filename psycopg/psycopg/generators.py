@@ -25,6 +25,7 @@ from __future__ import annotations
 import logging
 from time import monotonic
 from collections import deque
+from collections.abc import Callable
 
 from . import errors as e
 from . import pq
@@ -331,6 +332,57 @@ def copy_from(pgconn: PGconn) -> PQGen[memoryview | PGresult]:
     return result
 
 
+def copy_from_into(
+    pgconn: PGconn, write: Callable[[list[memoryview]], None], size: int, nchunks: int
+) -> PQGen[tuple[int, PGresult]]:
+    """
+    Receive all the data of a COPY TO operation, passing it to `!write()`.
+
+    The data is passed as lists of chunks, of about `!size` bytes in total and
+    of at most `!nchunks` items, or less if more data is not available yet.
+
+    Return the number of bytes received and the final result of the copy.
+    """
+    chunks: list[memoryview] = []
+    nbytes = buffered = 0
+    while True:
+        n, data = pgconn.get_copy_data(1)
+        if n > 0:
+            chunks.append(data)
+            buffered += n
+            if buffered >= size or len(chunks) >= nchunks:
+                write(chunks)
+                nbytes += buffered
+                chunks = []
+                buffered = 0
+            continue
+
+        # Write what we have before blocking or terminating.
+        if chunks:
+            write(chunks)
+            nbytes += buffered
+            chunks = []
+            buffered = 0
+
+        if n < 0:
+            break
+
+        # would block
+        while not (yield WAIT_R):
+            continue
+        pgconn.consume_input()
+
+    # Retrieve the final result of copy
+
+    if len(results := (yield from _fetch_many(pgconn))) > 1:
+        raise e.ProgrammingError("you cannot mix COPY with other operations")
+
+    if (result := results[0]).status != COMMAND_OK:
+        raise e.error_from_result(result, encoding=pgconn._encoding)
+
+    return nbytes, result
+
+
 def copy_to(pgconn: PGconn, buffer: Buffer, flush: bool = True) -> PQGen[None]:
     # Retry enqueuing data until successful.
     #
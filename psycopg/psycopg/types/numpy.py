@@ -4,16 +4,26 @@ Adapters for numpy types.
 
 # Copyright (C) 2022 The Psycopg Team
 
-from typing import Any
+from __future__ import annotations
+
+import sys
+import struct
+from typing import TYPE_CHECKING, Any
+from collections.abc import Iterator, Sequence
 
 from .. import _oids
+from .. import errors as e
 from ..pq import Format
-from ..abc import AdaptContext, Buffer
+from ..abc import AdaptContext, Buffer, DumperKey, Transformer
 from .bool import BoolBinaryDumper, BoolDumper
+from ..adapt import PyFormat, RecursiveDumper
 from .numeric import Float4BinaryDumper, Float4Dumper, FloatBinaryDumper, FloatDumper
 from .numeric import _IntDumper, dump_int_to_numeric_binary
 from .._struct import pack_int2, pack_int4, pack_int8
 
+if TYPE_CHECKING:
+    from ..pq.abc import PGresult
+
 
 class NPInt16Dumper(_IntDumper):
     oid = _oids.INT2_OID
@@ -62,6 +72,110 @@ class NPNumericBinaryDumper(NPNumericDumper):
         return dump_int_to_numeric_binary(int(obj))
 
 
+# Array dumpers
+
+
+class _NPArrayDumper(RecursiveDumper):
+    """
+    Dump a `!numpy.ndarray` of numbers or booleans as a Postgres array.
+
+    The array type is chosen according to the array dtype.
+    """
+
+    element_oid = _oids.INVALID_OID
+
+    def get_key(self, obj: Any, format: PyFormat) -> DumperKey:
+        return (self.cls, obj.dtype.str)
+
+    def upgrade(self, obj: Any, format: PyFormat) -> _NPArrayDumper:
+        if self.element_oid:
+            return self
+
+        if not (oid := _dtype_oid(obj.dtype)):
+            raise e.DataError(f"cannot dump numpy arrays of dtype {obj.dtype}")
+
+        dumper = type(self)(self.cls, self._tx)
+        dumper.element_oid = oid
+        info = self._tx.adapters.types[oid]
+        dumper.oid = info.array_oid
+        return dumper
+
+    def _check_array(self, obj: Any) -> None:
+        if not obj.ndim:
+            raise e.DataError("cannot dump 0-dimensional numpy arrays")
+        if (mask := getattr(obj, "mask", None)) is not None and mask.any():
+            raise e.DataError("cannot dump numpy masked arrays with masked values")
+
+
+class NPArrayDumper(_NPArrayDumper):
+    def dump(self, obj: Any) -> Buffer | None:
+        self._check_array(obj)
+        if not obj.size:
+            return b"{}"
+
+        # numpy string representation of bools, nans and infinities
+        # are all understood by Postgres.
+        return _dump_text_array(obj.astype(str)).encode()
+
+
+class NPArrayBinaryDumper(_NPArrayDumper):
+    format = Format.BINARY
+
+    def dump(self, obj: Any) -> Buffer | None:
+        import numpy
+
+        self._check_array(obj)
+        if not obj.size:
+            return _pack_array_head(0, 0, self.element_oid)
+
+        dtype = _binary_dtypes[self.element_oid]
+        data = numpy.empty(obj.size, dtype=[("len", ">i4"), ("val", dtype)])
+        data["len"] = data.dtype["val"].itemsize
+        data["val"] = obj.ravel()
+
+        head = [_pack_array_head(obj.ndim, 0, self.element_oid)]
+        head.extend(_pack_array_dim(dim, 1) for dim in obj.shape)
+        head.append(data.tobytes())
+        return b"".join(head)
+
+
+def _dump_text_array(obj: Any) -> str:
+    if obj.ndim == 1:
+        return "{" + ",".join(obj.tolist()) + "}"
+    else:
+        return "{" + ",".join(_dump_text_array(sub) for sub in obj) + "}"
+
+
+def _dtype_oid(dtype: Any) -> int:
+    """
+    Return the oid of the Postgres type able to represent a numpy dtype.
+
+    Return 0 if the dtype is not supported.
+    """
+    kind = dtype.kind
+    size = dtype.itemsize
+    if kind == "b":
+        return _oids.BOOL_OID
+    elif kind == "i":
+        return _int_oids.get(size, 0)
+    elif kind == "u":
+        return _int_oids.get(size * 2, 0)
+    elif kind == "f":
+        return _float_oids.get(size, 0)
+    else:
+        return 0
+
+
+_int_oids = {1: _oids.INT2_OID, 2: _oids.INT2_OID, 4: _oids.INT4_OID}
+_int_oids[8] = _oids.INT8_OID
+_float_oids = {2: _oids.FLOAT4_OID, 4: _oids.FLOAT4_OID, 8: _oids.FLOAT8_OID}
+
+_struct_array_head = struct.Struct("!III")  # ndims, hasnull, elem oid
+_pack_array_head = _struct_array_head.pack
+_struct_array_dim = struct.Struct("!II")  # dim, lower bound
+_pack_array_dim = _struct_array_dim.pack
+
+
 def register_default_adapters(context: AdaptContext) -> None:
     adapters = context.adapters
 
@@ -80,6 +194,7 @@ def register_default_adapters(context: AdaptContext) -> None:
     adapters.register_dumper("numpy.float16", Float4Dumper)
     adapters.register_dumper("numpy.float32", Float4Dumper)
     adapters.register_dumper("numpy.float64", FloatDumper)
+    adapters.register_dumper("numpy.ndarray", NPArrayDumper)
 
     adapters.register_dumper("numpy.int8", NPInt16BinaryDumper)
     adapters.register_dumper("numpy.int16", NPInt16BinaryDumper)
@@ -96,3 +211,168 @@ def register_default_adapters(context: AdaptContext) -> None:
     adapters.register_dumper("numpy.float16", Float4BinaryDumper)
     adapters.register_dumper("numpy.float32", Float4BinaryDumper)
     adapters.register_dumper("numpy.float64", FloatBinaryDumper)
+    adapters.register_dumper("numpy.ndarray", NPArrayBinaryDumper)
+
+
+# Loading results into arrays
+
+# Numpy dtypes matching the binary representation of fixed-size types.
+# Results in binary format of these types can be converted into arrays in bulk,
+# without creating a Python object for each value.
+_binary_dtypes: dict[int, str] = {
+    _oids.BOOL_OID: "?",
+    _oids.INT2_OID: ">i2",
+    _oids.INT4_OID: ">i4",
+    _oids.INT8_OID: ">i8",
+    _oids.OID_OID: ">u4",
+    _oids.FLOAT4_OID: ">f4",
+    _oids.FLOAT8_OID: ">f8",
+    _oids.DATE_OID: ">i4",
+    _oids.TIMESTAMP_OID: ">i8",
+    _oids.TIMESTAMPTZ_OID: ">i8",
+    _oids.UUID_OID: "V16",
+}
+
+# Postgres dates and timestamps count from 2000-01-01, numpy from 1970-01-01
+_pg_date_epoch_days = 10_957
+_pg_timestamp_epoch_us = _pg_date_epoch_days * 86_400 * 1_000_000
+
+
+def load_columns(res: PGresult, tx: Transformer, row0: int, row1: int) -> list[Any]:
+    """
+    Load the records from `!row0` to `!row1` of a result into NumPy arrays.
+
+    Return a list of arrays, one per column. Binary columns of fixed-size
+    types are converted in bulk, dates and timestamps into `!datetime64`, uuid
+    into 16 bytes void values; NULLs are masked. Other columns are converted
+    using the `!tx` loaders into arrays of objects.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "loading results into arrays requires the package 'numpy'"
+            " to be installed"
+        )
+
+    return [_load_column(numpy, res, tx, col, row0, row1) for col in range(res.nfields)]
+
+
+def _load_column(
+    numpy: Any, res: PGresult, tx: Transformer, col: int, row0: int, row1: int
+) -> Any:
+    values = [res.get_value(row, col) for row in range(row0, row1)]
+    oid = res.ftype(col)
+    fmt = Format(res.fformat(col))
+
+    if not (fmt == Format.BINARY and (dtype := _binary_dtypes.get(oid))):
+        loader = tx.get_loader(oid, fmt)
+        rv = numpy.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            if value is not None:
+                rv[i] = loader.load(value)
+        return rv
+
+    dt = numpy.dtype(dtype)
+    if None in values:
+        mask = numpy.array([value is None for value in values], dtype=bool)
+        null = bytes(dt.itemsize)
+        data = b"".join(null if value is None else value for value in values)
+    else:
+        mask = None
+        data = b"".join(values)  # type: ignore[arg-type]
+
+    rv = numpy.frombuffer(data, dtype=dt).astype(dt.newbyteorder("="))
+
+    if oid == _oids.DATE_OID:
+        rv = _to_datetime64(numpy, rv, "D", _pg_date_epoch_days, 2**31 - 1)
+    elif oid == _oids.TIMESTAMP_OID or oid == _oids.TIMESTAMPTZ_OID:
+        rv = _to_datetime64(numpy, rv, "us", _pg_timestamp_epoch_us, 2**63 - 1)
+
+    if mask is not None:
+        rv = numpy.ma.masked_array(rv, mask=mask)
+    return rv
+
+
+def _to_datetime64(numpy: Any, arr: Any, unit: str, offset: int, inf: int) -> Any:
+    # Postgres infinities have no numpy representation: convert them to NaT.
+    special = (arr == inf) | (arr == -inf - 1)
+    with numpy.errstate(over="ignore"):
+        rv = (arr.astype("i8") + offset).astype(f"M8[{unit}]")
+    rv[special] = numpy.datetime64("NaT")
+    return rv
+
+
+# Copy support
+
+
+def format_binary_columns(
+    columns: Sequence[Any], types: Sequence[int] | None, chunk_size: int
+) -> Iterator[bytes] | None:
+    """
+    Format columns of numpy arrays into binary copy records in bulk.
+
+    Return an iterator of buffers of about `!chunk_size` bytes, or `!None` if
+    the columns cannot be formatted this way (e.g. they are not all 1-D arrays,
+    they contain masked values, or their dtype cannot be converted safely to
+    the Postgres type in `!types`, if specified).
+    """
+    if "numpy" not in sys.modules or not columns:
+        return None
+
+    import numpy
+
+    if types and len(types) != len(columns):
+        raise e.DataError(f"expected {len(types)} values in row, got {len(columns)}")
+
+    fields = [("nfields", ">i2")]
+    for i, col in enumerate(columns):
+        if not isinstance(col, numpy.ndarray) or col.ndim != 1:
+            return None
+        if numpy.ma.is_masked(col):
+            return None
+        oid = types[i] if types else _dtype_oid(col.dtype)
+        if oid not in _copy_oids:
+            return None
+        if not numpy.can_cast(col.dtype, dtype := _binary_dtypes[oid], "safe"):
+            return None
+        fields.append((f"len{i}", ">i4"))
+        fields.append((f"val{i}", dtype))
+
+    if len({len(col) for col in columns}) > 1:
+        raise e.DataError("all the columns must have the same length")
+
+    return _iter_binary_records(numpy, columns, numpy.dtype(fields), chunk_size)
+
+
+def column_values(col: Any) -> Any:
+    """
+    Return the values of a column, replacing numpy masked values with `!None`.
+    """
+    if "numpy" in sys.modules:
+        import numpy
+
+        if isinstance(col, numpy.ma.MaskedArray) and numpy.ma.is_masked(col):
+            return [
+                None if m else v for v, m in zip(col.data, numpy.ma.getmaskarray(col))
+            ]
+
+    return col
+
+
+# Postgres types which can be formatted in bulk in binary copy
+_copy_oids = {*_int_oids.values(), *_float_oids.values(), _oids.BOOL_OID}
+
+
+def _iter_binary_records(
+    numpy: Any, columns: Sequence[Any], dtype: Any, chunk_size: int
+) -> Iterator[bytes]:
+    nrows = len(columns[0])
+    step = max(1, chunk_size // dtype.itemsize)
+    for start in range(0, nrows, step):
+        records = numpy.empty(min(step, nrows - start), dtype=dtype)
+        records["nfields"] = len(columns)
+        for i, col in enumerate(columns):
+            records[f"len{i}"] = dtype[f"val{i}"].itemsize
+            records[f"val{i}"] = col[start : start + step]
+        yield records.tobytes()
@@ -9,7 +9,7 @@ information. Will submit a bug.
 
 from __future__ import annotations
 
-from typing import Any, Sequence
+from typing import Any, Iterator, Sequence
 from collections import deque
 
 from psycopg import BaseConnection, abc, pq
@@ -73,6 +73,12 @@ def format_row_text(
 def format_row_binary(
     row: Sequence[Any], tx: abc.Transformer, out: bytearray
 ) -> None: ...
+def format_rows_text(
+    rows: Iterator[Sequence[Any]], tx: abc.Transformer, out: bytearray, size: int
+) -> int: ...
+def format_rows_binary(
+    rows: Iterator[Sequence[Any]], tx: abc.Transformer, out: bytearray, size: int
+) -> int: ...
 def parse_row_text(data: abc.Buffer, tx: abc.Transformer) -> tuple[Any, ...]: ...
 def parse_row_binary(data: abc.Buffer, tx: abc.Transformer) -> tuple[Any, ...]: ...
 
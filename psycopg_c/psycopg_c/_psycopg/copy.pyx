@@ -104,6 +104,27 @@ def format_row_binary(row: Sequence[Any], tx: Transformer, out: bytearray) -> No
         raise e
 
 
+def format_rows_binary(
+    rows: Iterator[Sequence[Any]], tx: Transformer, out: bytearray, Py_ssize_t size
+) -> int:
+    cdef Py_ssize_t pos = PyByteArray_GET_SIZE(out)
+    cdef Py_ssize_t nrows = 0
+
+    try:
+        for row in rows:
+            _format_row_binary(row, tx, out)
+            nrows += 1
+            pos = PyByteArray_GET_SIZE(out)
+            if pos >= size:
+                break
+    except Exception as e:
+        # Drop the data of the row failed, keeping the ones already formatted.
+        PyByteArray_Resize(out, pos)
+        raise e
+
+    return nrows
+
+
 cdef int _append_binary_none(bytearray out, Py_ssize_t *pos) except -1:
     cdef char *target
     target = CDumper.ensure_size(out, pos[0], sizeof(_binary_null))
@@ -219,6 +240,27 @@ def format_row_text(row: Sequence[Any], tx: Transformer, out: bytearray) -> None
         raise e
 
 
+def format_rows_text(
+    rows: Iterator[Sequence[Any]], tx: Transformer, out: bytearray, Py_ssize_t size
+) -> int:
+    cdef Py_ssize_t pos = PyByteArray_GET_SIZE(out)
+    cdef Py_ssize_t nrows = 0
+
+    try:
+        for row in rows:
+            _format_row_text(row, tx, out)
+            nrows += 1
+            pos = PyByteArray_GET_SIZE(out)
+            if pos >= size:
+                break
+    except Exception as e:
+        # Drop the data of the row failed, keeping the ones already formatted.
+        PyByteArray_Resize(out, pos)
+        raise e
+
+    return nrows
+
+
 cdef int _append_text_none(bytearray out, Py_ssize_t *pos, int with_tab) except -1:
     cdef char *target
 
@@ -9,13 +9,14 @@ from __future__ import annotations
 from time import monotonic
 from random import random
 from typing import TYPE_CHECKING, Any
-from collections import Counter, deque
+from collections import Counter, OrderedDict, deque
 
 from psycopg import errors as e
 
 from .errors import PoolClosed
 
 if TYPE_CHECKING:
+    from psycopg._preparing import Key
     from psycopg._connection_base import BaseConnection
 
 
@@ -55,6 +56,7 @@ class BasePool:
         max_idle: float,
         reconnect_timeout: float,
         num_workers: int,
+        max_prepared: int,
     ):
         min_size, max_size = self._check_size(min_size, max_size)
 
@@ -65,6 +67,9 @@ class BasePool:
         if num_workers < 1:
             raise ValueError("num_workers must be at least 1")
 
+        if max_prepared < 0:
+            raise ValueError("max_prepared cannot be negative")
+
         self.name = name
         self.close_returns = close_returns
         self._min_size = min_size
@@ -75,12 +80,17 @@ class BasePool:
         self.max_lifetime = max_lifetime
         self.max_idle = max_idle
         self.num_workers = num_workers
+        self.max_prepared = max_prepared
 
         self._nconns = min_size  # currently in the pool, out, being prepared
         self._pool = deque()
         self._stats = Counter[str]()
         self._drained_at = 0.0
 
+        # Statements prepared on the pool connections, to prepare in advance
+        # on the new ones. Ordered from the least to the most recently seen.
+        self._prepared: OrderedDict[Key, None] = OrderedDict()
+
         # Min number of connections in the pool in a max_idle unit of time.
         # It is reset periodically by the ShrinkPool scheduled task.
         # It is used to shrink back the pool if maxcon > min_size and extra
@@ -200,6 +210,33 @@ class BasePool:
         conn._created_at = t = monotonic()
         conn._expire_at = t + self._jitter(self.max_lifetime, -0.05, 0.0)
 
+    def _collect_prepared(self, conn: BaseConnection[Any]) -> None:
+        """Remember the statements prepared on a connection returned.
+
+        The catalogue is replaced, not modified in place, so that it can be
+        read without holding the pool lock.
+        """
+        if not (keys := conn._prepared.keys()):
+            return
+
+        prepared = self._prepared.copy()
+        for key in keys:
+            prepared[key] = None
+            prepared.move_to_end(key)
+        while len(prepared) > self.max_prepared:
+            prepared.popitem(last=False)
+        self._prepared = prepared
+
+    def _get_prepared(self, conn: BaseConnection[Any]) -> list[Key]:
+        """Return the statements to prepare on a new connection."""
+        if conn.prepare_threshold is None:
+            return []
+
+        keys = list(self._prepared)
+        if (nmax := conn.prepared_max) is not None:
+            keys = keys[-nmax:] if nmax else []
+        return keys
+
 
 class AttemptWithBackoff:
     """
@@ -46,6 +46,7 @@ class AsyncNullConnectionPool(_BaseNullConnectionPool, AsyncConnectionPool[ACT])
         reconnect_timeout: float = 5 * 60.0,
         reconnect_failed: AsyncConnectFailedCB | None = None,
         num_workers: int = 3,
+        max_prepared: int = 0,
     ):
         super().__init__(
             conninfo,
@@ -65,6 +66,7 @@ class AsyncNullConnectionPool(_BaseNullConnectionPool, AsyncConnectionPool[ACT])
             max_idle=max_idle,
             reconnect_timeout=reconnect_timeout,
             num_workers=num_workers,
+            max_prepared=max_prepared,
         )
 
     async def wait(self, timeout: float = 30.0) -> None:
@@ -14,14 +14,15 @@ import warnings
 from abc import ABC, abstractmethod
 from time import monotonic
 from types import TracebackType
-from typing import Any, Generic, cast
+from typing import TYPE_CHECKING, Any, Generic, cast
 from weakref import ref
 from contextlib import contextmanager
-from collections import deque
-from collections.abc import Iterator
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator, Sequence
 
-from psycopg import Connection
+from psycopg import Connection, Rollback
 from psycopg import errors as e
+from psycopg import sql
 from psycopg.pq import TransactionStatus
 
 from .abc import CT, ConnectFailedCB, ConnectionCB, ConninfoParam, KwargsParam
@@ -32,6 +33,10 @@ from ._compat import PSYCOPG_VERSION, PoolConnection, Self
 from ._acompat import Condition, Event, Lock, Queue, Worker, current_thread_name
 from ._acompat import gather, sleep, spawn
 
+if TYPE_CHECKING:
+    from psycopg.abc import Params, QueryNoTemplate
+    from psycopg._preparing import Key
+
 CLIENT_EXCEPTIONS = Exception
 
 logger = logging.getLogger("psycopg.pool")
@@ -61,6 +66,7 @@ class ConnectionPool(Generic[CT], BasePool):
         reconnect_timeout: float = 5 * 60.0,
         reconnect_failed: ConnectFailedCB | None = None,
         num_workers: int = 3,
+        max_prepared: int = 0,
     ):
         if close_returns and PSYCOPG_VERSION < (3, 3):
             if connection_class is Connection:
@@ -103,6 +109,7 @@ class ConnectionPool(Generic[CT], BasePool):
             max_idle=max_idle,
             reconnect_timeout=reconnect_timeout,
             num_workers=num_workers,
+            max_prepared=max_prepared,
         )
 
         if open is None:
@@ -187,6 +194,229 @@ class ConnectionPool(Generic[CT], BasePool):
             t1 = monotonic()
             self._stats[self._USAGE_MS] += int(1000.0 * (t1 - t0))
 
+    def parallel_fetch(
+        self,
+        query: QueryNoTemplate,
+        partitions: Iterable[Params | None],
+        *,
+        concurrency: int | None = None,
+        timeout: float | None = None,
+    ) -> Iterator[Any]:
+        """Run a query once per partition on several connections concurrently.
+
+        Execute *query* once for each parameters set in *partitions*, using up
+        to *concurrency* connections of the pool at the same time (by default,
+        and at most, as many as the connections the pool can provide without
+        waiting for the ones already in use), and return an iterator on the
+        records of all the results. The records of each partition are returned
+        together, but the partitions are returned in the order they complete.
+        """
+        if not (todo := deque(partitions)):
+            return
+        if not concurrency:
+            concurrency = self.max_size or len(todo)
+        # The workers hold a connection until there is no partition left:
+        # don't wait for the connections already checked out.
+        if self.max_size:
+            concurrency = min(concurrency, self._count_available())
+        nworkers = max(1, min(concurrency, len(todo)))
+
+        # The workers put lists of records in the results queue, and None or
+        # an exception when they terminate.
+        results: Queue[list[Any] | BaseException | None] = Queue(maxsize=nworkers)
+        stop = Event()
+        workers = [
+            spawn(self._parallel_fetch_worker, (query, todo, results, stop, timeout))
+            for _ in range(nworkers)
+        ]
+        running = nworkers
+        try:
+            while running:
+                item = results.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    running -= 1
+                    raise item
+                else:
+                    for rec in item:
+                        yield rec
+        finally:
+            # Let the workers terminate, discarding the results not consumed.
+            stop.set()
+            while running:
+                item = results.get()
+                if item is None or isinstance(item, BaseException):
+                    running -= 1
+            gather(*workers)
+
+    def _parallel_fetch_worker(
+        self,
+        query: QueryNoTemplate,
+        todo: deque[Params | None],
+        results: Queue[list[Any] | BaseException | None],
+        stop: Event,
+        timeout: float | None,
+    ) -> None:
+        try:
+            with self.connection(timeout=timeout) as conn:
+                while not stop.is_set():
+                    try:
+                        params = todo.popleft()
+                    except IndexError:
+                        break
+                    cur = conn.execute(query, params)
+                    results.put(cur.fetchall())
+        except BaseException as ex:
+            results.put(ex)
+        else:
+            results.put(None)
+
+    def copy_in_parallel(
+        self,
+        table: str | sql.Composable,
+        rows: Iterable[Sequence[Any]],
+        *,
+        columns: Sequence[str] | None = None,
+        workers: int | None = None,
+        batch_size: int = 1000,
+        binary: bool = True,
+        timeout: float | None = None,
+    ) -> int:
+        """Copy records into a table using several connections concurrently.
+
+        Split *rows* in batches of *batch_size* records and copy them into
+        *table* using :sql:`COPY FROM STDIN` on up to *workers* connections
+        of the pool at the same time (by default, and at most, as many as the
+        connections the pool can provide without waiting for the ones already
+        in use).
+
+        The records are committed only if every connection has copied its
+        records successfully, otherwise all the transactions are rolled back
+        and the first error is raised. The commits of the different
+        connections are not atomic though: if one of them fails, the records
+        copied by the others may have been committed already.
+
+        Return the number of records copied.
+        """
+        if isinstance(table, str):
+            table = sql.Identifier(table)
+        fields: sql.Composable = sql.SQL("*")
+        if columns:
+            fields = sql.SQL(", ").join(map(sql.Identifier, columns))
+        statement = sql.SQL("COPY {}{} FROM STDIN{}").format(
+            table,
+            sql.SQL(" ({})").format(fields) if columns else sql.SQL(""),
+            sql.SQL(" (FORMAT BINARY)" if binary else ""),
+        )
+        # Binary copy needs to know the types of the columns.
+        describe = None
+        if binary:
+            describe = sql.SQL("SELECT {} FROM {} LIMIT 0").format(fields, table)
+
+        # All the workers hold a connection until the end: don't use more
+        # than the pool can provide, counting the connections already checked
+        # out, or they would wait for each other.
+        nworkers = workers or self.max_size or 1
+        if self.max_size:
+            nworkers = max(1, min(nworkers, self._count_available()))
+
+        # The records are sent to the workers in batches via a bounded queue,
+        # terminated by a None per worker. The workers report the records
+        # copied and wait for the outcome of all the others before committing.
+        batches: Queue[list[Sequence[Any]] | None] = Queue(maxsize=2 * nworkers)
+        done: Queue[int] = Queue()
+        decided = Event()
+        errors: list[BaseException] = []
+        tasks = [
+            spawn(
+                self._copy_in_parallel_worker,
+                (statement, describe, batches, done, decided, errors, timeout),
+            )
+            for _ in range(nworkers)
+        ]
+
+        nrows = 0
+        try:
+            batch: list[Sequence[Any]] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    if errors:
+                        break
+                    batches.put(batch)
+                    batch = []
+            else:
+                if batch:
+                    batches.put(batch)
+        except BaseException as ex:
+            errors.append(ex)
+            raise
+        finally:
+            for _ in range(nworkers):
+                batches.put(None)
+            for _ in range(nworkers):
+                nrows += done.get()
+            decided.set()
+            gather(*tasks)
+
+        if errors:
+            raise errors[0]
+        return nrows
+
+    def _copy_in_parallel_worker(
+        self,
+        statement: sql.Composed,
+        describe: sql.Composed | None,
+        batches: Queue[list[Sequence[Any]] | None],
+        done: Queue[int],
+        decided: Event,
+        errors: list[BaseException],
+        timeout: float | None,
+    ) -> None:
+        # Track if the last batch was received and the outcome reported, so
+        # that, on error, the producer is not left waiting for the worker.
+        received = reported = False
+        try:
+            with self.connection(timeout=timeout) as conn:
+                with conn.transaction():
+                    cur = conn.cursor()
+                    if describe:
+                        cur.execute(describe)
+                        types = [col.type_code for col in cur.description or ()]
+
+                    nrows = 0
+                    with cur.copy(statement) as copy:
+                        if describe:
+                            copy.set_types(types)
+                        while (batch := batches.get()) is not None:
+                            for row in batch:
+                                copy.write_row(row)
+                            nrows += len(batch)
+                        received = True
+
+                    reported = True
+                    done.put(nrows)
+                    decided.wait()
+                    if errors:
+                        raise Rollback()
+        except BaseException as ex:
+            errors.append(ex)
+            if not received:
+                # Consume the batches left, so that the producer won't block.
+                while batches.get() is not None:
+                    pass
+            if not reported:
+                done.put(0)
+
+    def _count_available(self) -> int:
+        """
+        Return the number of connections obtainable without waiting for the
+        ones in use: the ones in the pool, plus the ones it can still create.
+        """
+        with self._lock:
+            return len(self._pool) + self.max_size - self._nconns
+
     def getconn(self, timeout: float | None = None) -> CT:
         """Obtain a connection from the pool.
 
@@ -320,6 +550,9 @@ class ConnectionPool(Generic[CT], BasePool):
         self._check_pool_putconn(conn)
 
         logger.info("returning connection to %r", self.name)
+        if self.max_prepared:
+            self._collect_prepared(conn)
+
         if self._maybe_close_connection(conn):
             return
 
@@ -642,10 +875,23 @@ class ConnectionPool(Generic[CT], BasePool):
                     f"connection left in status {sname} by configure function {self._configure}: discarded"
                 )
 
+        if keys := self._get_prepared(conn):
+            self._prepare_connection(conn, keys)
+
         # Set an expiry date, with some randomness to avoid mass reconnection
         self._set_connection_expiry_date(conn)
         return conn
 
+    def _prepare_connection(self, conn: CT, keys: list[Key]) -> None:
+        """Prepare on a new connection the statements in use in the pool."""
+        logger.info("preparing %s statements on %s", len(keys), conn)
+        try:
+            conn._prepare_statements(keys)
+        except CLIENT_EXCEPTIONS as ex:
+            # Probably some statement is no more valid: start from scratch.
+            logger.warning("error preparing statements on %s: %s", conn, ex)
+            self._prepared = OrderedDict()
+
     def _resolve_conninfo(self) -> str:
         """Resolve conninfo (static string, sync callable, or async callable)."""
         if callable(self.conninfo):
@@ -829,6 +1075,17 @@ class ConnectionPool(Generic[CT], BasePool):
                 logger.warning("error resetting connection: %s", ex)
                 self._close_connection(conn)
 
+        # Deallocate the prepared statements whose deallocation was deferred.
+        if (
+            conn._prepared._to_flush
+            and conn.pgconn.transaction_status == TransactionStatus.IDLE
+        ):
+            try:
+                conn.flush_deallocations()
+            except CLIENT_EXCEPTIONS as ex:
+                logger.warning("error deallocating prepared statements: %s", ex)
+                self._close_connection(conn)
+
     def _close_connection(self, conn: CT) -> None:
         conn._pool = None
         conn.close()
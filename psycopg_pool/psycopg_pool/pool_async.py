@@ -11,14 +11,15 @@ import warnings
 from abc import ABC, abstractmethod
 from time import monotonic
 from types import TracebackType
-from typing import Any, Generic, cast
+from typing import TYPE_CHECKING, Any, Generic, cast
 from weakref import ref
 from contextlib import asynccontextmanager
-from collections import deque
-from collections.abc import AsyncIterator
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterable, Sequence
 
-from psycopg import AsyncConnection
+from psycopg import AsyncConnection, Rollback
 from psycopg import errors as e
+from psycopg import sql
 from psycopg.pq import TransactionStatus
 
 from .abc import ACT, AsyncConnectFailedCB, AsyncConnectionCB, AsyncConninfoParam
@@ -30,6 +31,10 @@ from ._acompat import ACondition, AEvent, ALock, AQueue, AWorker, agather, aslee
 from ._acompat import aspawn, current_task_name, ensure_async
 from .sched_async import AsyncScheduler
 
+if TYPE_CHECKING:
+    from psycopg.abc import Params, QueryNoTemplate
+    from psycopg._preparing import Key
+
 if True:  # ASYNC
     import asyncio
 
@@ -67,6 +72,7 @@ class AsyncConnectionPool(Generic[ACT], BasePool):
         reconnect_timeout: float = 5 * 60.0,
         reconnect_failed: AsyncConnectFailedCB | None = None,
         num_workers: int = 3,
+        max_prepared: int = 0,
     ):
         if close_returns and PSYCOPG_VERSION < (3, 3):
             if connection_class is AsyncConnection:
@@ -112,6 +118,7 @@ class AsyncConnectionPool(Generic[ACT], BasePool):
             max_idle=max_idle,
             reconnect_timeout=reconnect_timeout,
             num_workers=num_workers,
+            max_prepared=max_prepared,
         )
 
         if True:  # ASYNC
@@ -223,6 +230,230 @@ class AsyncConnectionPool(Generic[ACT], BasePool):
             t1 = monotonic()
             self._stats[self._USAGE_MS] += int(1000.0 * (t1 - t0))
 
+    async def parallel_fetch(
+        self,
+        query: QueryNoTemplate,
+        partitions: Iterable[Params | None],
+        *,
+        concurrency: int | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[Any]:
+        """Run a query once per partition on several connections concurrently.
+
+        Execute *query* once for each parameters set in *partitions*, using up
+        to *concurrency* connections of the pool at the same time (by default,
+        and at most, as many as the connections the pool can provide without
+        waiting for the ones already in use), and return an iterator on the
+        records of all the results. The records of each partition are returned
+        together, but the partitions are returned in the order they complete.
+        """
+        if not (todo := deque(partitions)):
+            return
+        if not concurrency:
+            concurrency = self.max_size or len(todo)
+        # The workers hold a connection until there is no partition left:
+        # don't wait for the connections already checked out.
+        if self.max_size:
+            concurrency = min(concurrency, await self._count_available())
+        nworkers = max(1, min(concurrency, len(todo)))
+
+        # The workers put lists of records in the results queue, and None or
+        # an exception when they terminate.
+        results: AQueue[list[Any] | BaseException | None] = AQueue(maxsize=nworkers)
+        stop = AEvent()
+        workers = [
+            aspawn(self._parallel_fetch_worker, (query, todo, results, stop, timeout))
+            for _ in range(nworkers)
+        ]
+        running = nworkers
+        try:
+            while running:
+                item = await results.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, BaseException):
+                    running -= 1
+                    raise item
+                else:
+                    for rec in item:
+                        yield rec
+        finally:
+            # Let the workers terminate, discarding the results not consumed.
+            stop.set()
+            while running:
+                item = await results.get()
+                if item is None or isinstance(item, BaseException):
+                    running -= 1
+            await agather(*workers)
+
+    async def _parallel_fetch_worker(
+        self,
+        query: QueryNoTemplate,
+        todo: deque[Params | None],
+        results: AQueue[list[Any] | BaseException | None],
+        stop: AEvent,
+        timeout: float | None,
+    ) -> None:
+        try:
+            async with self.connection(timeout=timeout) as conn:
+                while not stop.is_set():
+                    try:
+                        params = todo.popleft()
+                    except IndexError:
+                        break
+                    cur = await conn.execute(query, params)
+                    await results.put(await cur.fetchall())
+        except BaseException as ex:
+            await results.put(ex)
+        else:
+            await results.put(None)
+
+    async def copy_in_parallel(
+        self,
+        table: str | sql.Composable,
+        rows: Iterable[Sequence[Any]],
+        *,
+        columns: Sequence[str] | None = None,
+        workers: int | None = None,
+        batch_size: int = 1000,
+        binary: bool = True,
+        timeout: float | None = None,
+    ) -> int:
+        """Copy records into a table using several connections concurrently.
+
+        Split *rows* in batches of *batch_size* records and copy them into
+        *table* using :sql:`COPY FROM STDIN` on up to *workers* connections
+        of the pool at the same time (by default, and at most, as many as the
+        connections the pool can provide without waiting for the ones already
+        in use).
+
+        The records are committed only if every connection has copied its
+        records successfully, otherwise all the transactions are rolled back
+        and the first error is raised. The commits of the different
+        connections are not atomic though: if one of them fails, the records
+        copied by the others may have been committed already.
+
+        Return the number of records copied.
+        """
+        if isinstance(table, str):
+            table = sql.Identifier(table)
+        fields: sql.Composable = sql.SQL("*")
+        if columns:
+            fields = sql.SQL(", ").join(map(sql.Identifier, columns))
+        statement = sql.SQL("COPY {}{} FROM STDIN{}").format(
+            table,
+            sql.SQL(" ({})").format(fields) if columns else sql.SQL(""),
+            sql.SQL(" (FORMAT BINARY)" if binary else ""),
+        )
+        # Binary copy needs to know the types of the columns.
+        describe = None
+        if binary:
+            describe = sql.SQL("SELECT {} FROM {} LIMIT 0").format(fields, table)
+
+        # All the workers hold a connection until the end: don't use more
+        # than the pool can provide, counting the connections already checked
+        # out, or they would wait for each other.
+        nworkers = workers or self.max_size or 1
+        if self.max_size:
+            nworkers = max(1, min(nworkers, await self._count_available()))
+
+        # The records are sent to the workers in batches via a bounded queue,
+        # terminated by a None per worker. The workers report the records
+        # copied and wait for the outcome of all the others before committing.
+        batches: AQueue[list[Sequence[Any]] | None] = AQueue(maxsize=2 * nworkers)
+        done: AQueue[int] = AQueue()
+        decided = AEvent()
+        errors: list[BaseException] = []
+        tasks = [
+            aspawn(
+                self._copy_in_parallel_worker,
+                (statement, describe, batches, done, decided, errors, timeout),
+            )
+            for _ in range(nworkers)
+        ]
+
+        nrows = 0
+        try:
+            batch: list[Sequence[Any]] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    if errors:
+                        break
+                    await batches.put(batch)
+                    batch = []
+            else:
+                if batch:
+                    await batches.put(batch)
+        except BaseException as ex:
+            errors.append(ex)
+            raise
+        finally:
+            for _ in range(nworkers):
+                await batches.put(None)
+            for _ in range(nworkers):
+                nrows += await done.get()
+            decided.set()
+            await agather(*tasks)
+
+        if errors:
+            raise errors[0]
+        return nrows
+
+    async def _copy_in_parallel_worker(
+        self,
+        statement: sql.Composed,
+        describe: sql.Composed | None,
+        batches: AQueue[list[Sequence[Any]] | None],
+        done: AQueue[int],
+        decided: AEvent,
+        errors: list[BaseException],
+        timeout: float | None,
+    ) -> None:
+        # Track if the last batch was received and the outcome reported, so
+        # that, on error, the producer is not left waiting for the worker.
+        received = reported = False
+        try:
+            async with self.connection(timeout=timeout) as conn:
+                async with conn.transaction():
+                    cur = conn.cursor()
+                    if describe:
+                        await cur.execute(describe)
+                        types = [col.type_code for col in cur.description or ()]
+
+                    nrows = 0
+                    async with cur.copy(statement) as copy:
+                        if describe:
+                            copy.set_types(types)
+                        while (batch := await batches.get()) is not None:
+                            for row in batch:
+                                await copy.write_row(row)
+                            nrows += len(batch)
+                        received = True
+
+                    reported = True
+                    await done.put(nrows)
+                    await decided.wait()
+                    if errors:
+                        raise Rollback()
+
+        except BaseException as ex:
+            errors.append(ex)
+            if not received:
+                # Consume the batches left, so that the producer won't block.
+                while await batches.get() is not None:
+                    pass
+            if not reported:
+                await done.put(0)
+
+    async def _count_available(self) -> int:
+        """
+        Return the number of connections obtainable without waiting for the
+        ones in use: the ones in the pool, plus the ones it can still create.
+        """
+        async with self._lock:
+            return len(self._pool) + self.max_size - self._nconns
+
     async def getconn(self, timeout: float | None = None) -> ACT:
         """Obtain a connection from the pool.
 
@@ -358,6 +589,9 @@ class AsyncConnectionPool(Generic[ACT], BasePool):
         self._check_pool_putconn(conn)
 
         logger.info("returning connection to %r", self.name)
+        if self.max_prepared:
+            self._collect_prepared(conn)
+
         if await self._maybe_close_connection(conn):
             return
 
@@ -698,10 +932,23 @@ class AsyncConnectionPool(Generic[ACT], BasePool):
                     f" {self._configure}: discarded"
                 )
 
+        if keys := self._get_prepared(conn):
+            await self._prepare_connection(conn, keys)
+
         # Set an expiry date, with some randomness to avoid mass reconnection
         self._set_connection_expiry_date(conn)
         return conn
 
+    async def _prepare_connection(self, conn: ACT, keys: list[Key]) -> None:
+        """Prepare on a new connection the statements in use in the pool."""
+        logger.info("preparing %s statements on %s", len(keys), conn)
+        try:
+            await conn._prepare_statements(keys)
+        except CLIENT_EXCEPTIONS as ex:
+            # Probably some statement is no more valid: start from scratch.
+            logger.warning("error preparing statements on %s: %s", conn, ex)
+            self._prepared = OrderedDict()
+
     async def _resolve_conninfo(self) -> str:
         """Resolve conninfo (static string, sync callable, or async callable)."""
         if callable(self.conninfo):
@@ -891,6 +1138,17 @@ class AsyncConnectionPool(Generic[ACT], BasePool):
                 logger.warning("error resetting connection: %s", ex)
                 await self._close_connection(conn)
 
+        # Deallocate the prepared statements whose deallocation was deferred.
+        if (
+            conn._prepared._to_flush
+            and conn.pgconn.transaction_status == TransactionStatus.IDLE
+        ):
+            try:
+                await conn.flush_deallocations()
+            except CLIENT_EXCEPTIONS as ex:
+                logger.warning("error deallocating prepared statements: %s", ex)
+                await self._close_connection(conn)
+
     async def _close_connection(self, conn: ACT) -> None:
         conn._pool = None
         await conn.close()
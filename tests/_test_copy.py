@@ -1,8 +1,13 @@
 import struct
+from io import BytesIO
 
+import pytest
+
+import psycopg
 from psycopg import pq
 from psycopg.copy import AsyncWriter
 from psycopg.copy import FileWriter as FileWriter  # noqa: F401
+from psycopg._copy_base import open_compressed
 
 sample_records = [(40010, 40020, "hello"), (40040, None, "world")]
 sample_values = "values (40010::int, 40020::int, 'hello'::text), (40040, NULL, 'world')"
@@ -55,9 +60,36 @@ def py_to_raw(item, fmt):
     return item
 
 
+def check_compression(compression):
+    """Skip the test if the compression is not available."""
+    if not compression:
+        return
+    try:
+        open_compressed(BytesIO(), compression, "rb")
+    except psycopg.NotSupportedError as ex:
+        pytest.skip(str(ex))
+
+
+def compress(data, compression):
+    f = BytesIO()
+    with open_compressed(f, compression, "wb") as zf:
+        zf.write(data)
+    return f.getvalue()
+
+
+def decompress(data, compression):
+    with open_compressed(BytesIO(data), compression, "rb") as zf:
+        return zf.read()
+
+
 class AsyncFileWriter(AsyncWriter):
-    def __init__(self, file):
+    def __init__(self, file, *, compression=None):
         self.file = file
+        self._zfile = open_compressed(file, compression, "wb") if compression else None
 
     async def write(self, data):
-        self.file.write(data)
+        (self._zfile or self.file).write(data)
+
+    async def finish(self, exc=None):
+        if self._zfile:
+            self._zfile.close()
@@ -235,6 +235,9 @@ class Faker:
                     cls = deep_import(cls)
                 except ImportError:
                     continue
+            if (cls.__module__, cls.__name__) == ("numpy", "ndarray"):
+                # Arrays of many dtypes/shapes, covered in test_numpy.
+                continue
             if issubclass(cls, Multirange) and self.conn.info.server_version < 140000:
                 continue
 
@@ -229,6 +229,26 @@ def test_reset(dsn):
         assert resets == 2
 
 
+def test_deferred_deallocate(dsn):
+
+    def configure(conn):
+        conn.defer_deallocate = True
+        conn.prepared_max = 2
+
+    with pool.ConnectionPool(
+        dsn, min_size=1, kwargs={"autocommit": True}, configure=configure
+    ) as p:
+        with p.connection() as conn:
+            for i in range(4):
+                conn.execute(f"select {i}", prepare=True)
+            cur = conn.execute("select count(*) from pg_prepared_statements")
+            assert cur.fetchone() == (4,)
+
+        with p.connection() as conn:
+            cur = conn.execute("select count(*) from pg_prepared_statements")
+            assert cur.fetchone() == (2,)
+
+
 @pytest.mark.crdb_skip("backend pid")
 def test_reset_badstate(dsn, caplog):
     caplog.set_level(logging.WARNING, logger="psycopg.pool")
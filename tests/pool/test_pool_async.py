@@ -229,6 +229,25 @@ async def test_reset(dsn):
         assert resets == 2
 
 
+async def test_deferred_deallocate(dsn):
+    async def configure(conn):
+        conn.defer_deallocate = True
+        conn.prepared_max = 2
+
+    async with pool.AsyncConnectionPool(
+        dsn, min_size=1, kwargs={"autocommit": True}, configure=configure
+    ) as p:
+        async with p.connection() as conn:
+            for i in range(4):
+                await conn.execute(f"select {i}", prepare=True)
+            cur = await conn.execute("select count(*) from pg_prepared_statements")
+            assert await cur.fetchone() == (4,)
+
+        async with p.connection() as conn:
+            cur = await conn.execute("select count(*) from pg_prepared_statements")
+            assert await cur.fetchone() == (2,)
+
+
 @pytest.mark.crdb_skip("backend pid")
 async def test_reset_badstate(dsn, caplog):
     caplog.set_level(logging.WARNING, logger="psycopg.pool")
@@ -7,6 +7,7 @@ import logging
 from time import time
 from typing import Any
 from asyncio import CancelledError
+from contextlib import closing
 
 import pytest
 
@@ -780,6 +781,274 @@ def test_drain(pool_cls, dsn):
             assert pids2 == pids3
 
 
+def test_max_prepared(pool_cls, dsn):
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=10) as p:
+        with p.connection() as conn:
+            conn.execute("select %s::int", [1], prepare=True)
+            conn.execute("select 'x'", prepare=True)
+            conn.execute("select 'y'")
+            pid1 = conn.info.backend_pid
+
+        p.drain()
+        with p.connection() as conn:
+            assert conn.info.backend_pid != pid1
+            cur = conn.execute(
+                "select statement from pg_prepared_statements order by name"
+            )
+            assert [r[0] for r in cur.fetchall()] == ["select $1::int", "select 'x'"]
+
+            # The statements are used, not prepared again
+            conn.execute("select %s::int", [2])
+            conn.execute("select 'x'")
+            cur = conn.execute("select count(*) from pg_prepared_statements")
+            assert cur.fetchone() == (2,)
+
+
+def test_max_prepared_limit(pool_cls, dsn):
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=2) as p:
+        with p.connection() as conn:
+            for i in range(4):
+                conn.execute(f"select {i}", prepare=True)
+
+        p.drain()
+        with p.connection() as conn:
+            cur = conn.execute(
+                "select statement from pg_prepared_statements order by name"
+            )
+            assert cur.fetchall() == [("select 2",), ("select 3",)]
+
+
+@pytest.mark.parametrize("prepared_max, want", [(1, 1), (0, 0)])
+def test_max_prepared_conn_limit(pool_cls, dsn, prepared_max, want):
+
+    def configure(conn):
+        conn.prepared_max = prepared_max
+
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=10) as p:
+        with p.connection() as conn:
+            for i in range(4):
+                conn.execute(f"select {i}", prepare=True)
+
+        p._configure = configure
+        p.drain()
+        with p.connection() as conn:
+            cur = conn.execute("select count(*) from pg_prepared_statements")
+            assert cur.fetchone() == (want,)
+
+
+def test_max_prepared_disabled(pool_cls, dsn):
+
+    def configure(conn):
+        conn.prepare_threshold = None
+
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=10) as p:
+        with p.connection() as conn:
+            conn.execute("select 1", prepare=True)
+
+        p._configure = configure
+        p.drain()
+        with p.connection() as conn:
+            cur = conn.execute("select count(*) from pg_prepared_statements")
+            assert cur.fetchone() == (0,)
+
+
+def test_max_prepared_error(pool_cls, dsn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg.pool")
+
+    with pool_cls(
+        dsn, min_size=min_size(pool_cls), kwargs={"autocommit": True}, max_prepared=10
+    ) as p:
+        with p.connection() as conn:
+            conn.execute("drop table if exists prepfail")
+            conn.execute("create table prepfail (id int)")
+            conn.execute("select 1", prepare=True)
+            conn.execute("select * from prepfail", prepare=True)
+            conn.execute("select 2", prepare=True)
+
+        with psycopg.Connection.connect(dsn, autocommit=True) as conn:
+            conn.execute("drop table prepfail")
+
+        p.drain()
+        with p.connection() as conn:
+            cur = conn.execute("select 1")
+            assert cur.fetchone() == (1,)
+            cur = conn.execute("select count(*) from pg_prepared_statements")
+            assert cur.fetchone() == (0,)
+
+        assert not p._prepared
+
+    assert "error preparing statements" in caplog.records[0].message
+
+
+@pytest.mark.parametrize("max_prepared", [-1])
+def test_bad_max_prepared(pool_cls, dsn, max_prepared):
+    with pytest.raises(ValueError):
+        pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=max_prepared)
+
+
+def test_parallel_fetch(pool_cls, dsn):
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        query = """
+            select x, pg_backend_pid() from generate_series(1, 100) as x
+            where x %% %s = %s
+            """
+        recs = list(p.parallel_fetch(query, [(4, i) for i in range(4)]))
+        assert sorted((rec[0] for rec in recs)) == list(range(1, 101))
+        assert 1 <= len({rec[1] for rec in recs}) <= 2
+
+
+def test_parallel_fetch_conns_used(pool_cls, dsn):
+    # Don't wait for the connection checked out by the caller.
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_size=3) as p:
+        with p.connection():
+            # The partitions last longer than the timeout of the third worker.
+            recs = list(
+                p.parallel_fetch(
+                    "select %s from pg_sleep(0.1)",
+                    [(i,) for i in range(6)],
+                    concurrency=3,
+                    timeout=0.2,
+                )
+            )
+            assert sorted(recs) == [(i,) for i in range(6)]
+
+
+def test_parallel_fetch_empty(pool_cls, dsn):
+    with pool_cls(dsn, min_size=min_size(pool_cls)) as p:
+        assert list(p.parallel_fetch("select 1", [])) == []
+        assert list(p.parallel_fetch("select 1", [None])) == [(1,)]
+
+
+@pytest.mark.slow
+@pytest.mark.timing
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_parallel_fetch_concurrency(pool_cls, dsn, concurrency):
+    with pool_cls(dsn, min_size=min_size(pool_cls, 4), max_size=4) as p:
+        p.wait()
+        t0 = time()
+        recs = list(
+            p.parallel_fetch(
+                "select %s from pg_sleep(0.2)",
+                [(i,) for i in range(4)],
+                concurrency=concurrency,
+            )
+        )
+        t1 = time()
+        assert sorted(recs) == [(i,) for i in range(4)]
+        want = 0.8 / concurrency
+        assert want <= t1 - t0 < want + 0.15
+
+
+def test_parallel_fetch_error(pool_cls, dsn):
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        with pytest.raises(psycopg.errors.DivisionByZero):
+            list(
+                p.parallel_fetch(
+                    "select 1 / %s from generate_series(1, 10)", [(1,), (0,), (2,)]
+                )
+            )
+
+        with p.connection() as conn:
+            cur = conn.execute("select 1")
+            assert cur.fetchone() == (1,)
+
+
+def test_parallel_fetch_close(pool_cls, dsn):
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        gen = p.parallel_fetch(
+            "select generate_series(1, 10)", [None] * 10, concurrency=2
+        )
+        with closing(gen):
+            for rec in gen:
+                break
+
+        stats = p.get_stats()
+        assert stats.get("pool_size", 0) == stats.get("pool_available", 0)
+
+
+@pytest.fixture
+def copy_table(conn):
+    conn.execute("drop table if exists copy_parallel")
+    conn.execute("create table copy_parallel (id int primary key, data text)")
+    conn.commit()
+    return "copy_parallel"
+
+
+def fetch_copy_table(conn):
+    cur = conn.execute("select * from copy_parallel order by id")
+    recs = cur.fetchall()
+    conn.commit()
+    return recs
+
+
+@pytest.mark.parametrize("binary", [True, False])
+def test_copy_in_parallel(pool_cls, dsn, conn, copy_table, binary):
+    rows = [(i, f"data {i}" if i % 3 else None) for i in range(1000)]
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_size=3) as p:
+        n = p.copy_in_parallel(copy_table, rows, batch_size=64, binary=binary)
+        assert n == 1000
+
+    assert fetch_copy_table(conn) == rows
+
+
+def test_copy_in_parallel_columns(pool_cls, dsn, conn, copy_table):
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        n = p.copy_in_parallel(
+            copy_table, iter([(2,), (1,)]), columns=["id"], workers=4, batch_size=1
+        )
+        assert n == 2
+
+    assert fetch_copy_table(conn) == [(1, None), (2, None)]
+
+
+def test_copy_in_parallel_conns_used(pool_cls, dsn, conn, copy_table):
+    # Don't wait for the connection checked out by the caller.
+    rows = [(i, None) for i in range(100)]
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_size=3) as p:
+        with p.connection():
+            n = p.copy_in_parallel(
+                copy_table, rows, workers=3, batch_size=10, timeout=1.0
+            )
+            assert n == 100
+
+    assert fetch_copy_table(conn) == rows
+
+
+def test_copy_in_parallel_empty(pool_cls, dsn, conn, copy_table):
+    with pool_cls(dsn, min_size=min_size(pool_cls)) as p:
+        assert p.copy_in_parallel(copy_table, [], workers=2) == 0
+
+    assert fetch_copy_table(conn) == []
+
+
+def test_copy_in_parallel_error(pool_cls, dsn, conn, copy_table):
+    # A record fails on one connection: all the copies are rolled back.
+    rows = [(i, None) for i in range(100)] + [(None, None)]
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        with pytest.raises(psycopg.errors.NotNullViolation):
+            p.copy_in_parallel(copy_table, rows, batch_size=10)
+
+        with p.connection() as pconn:
+            cur = pconn.execute("select 1")
+            assert cur.fetchone() == (1,)
+
+    assert fetch_copy_table(conn) == []
+
+
+def test_copy_in_parallel_rows_error(pool_cls, dsn, conn, copy_table):
+
+    def rows():
+        for i in range(100):
+            yield (i, None)
+        raise ZeroDivisionError
+
+    with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        with pytest.raises(ZeroDivisionError):
+            p.copy_in_parallel(copy_table, rows(), batch_size=10)
+
+    assert fetch_copy_table(conn) == []
+
+
 def min_size(pool_cls, num=1):
     """Return the minimum min_size supported by the pool class."""
     if pool_cls is pool.ConnectionPool:
@@ -4,13 +4,15 @@ import logging
 from time import time
 from typing import Any
 from asyncio import CancelledError
+from contextlib import aclosing
 
 import pytest
 
 import psycopg
 
 from ..utils import set_autocommit
-from ..acompat import AEvent, asleep, gather, is_alive, skip_async, skip_sync, spawn
+from ..acompat import AEvent, alist, asleep, gather, is_alive, skip_async, skip_sync
+from ..acompat import spawn
 
 try:
     import psycopg_pool as pool
@@ -793,6 +795,277 @@ async def test_drain(pool_cls, dsn):
             assert pids2 == pids3
 
 
+async def test_max_prepared(pool_cls, dsn):
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=10) as p:
+        async with p.connection() as conn:
+            await conn.execute("select %s::int", [1], prepare=True)
+            await conn.execute("select 'x'", prepare=True)
+            await conn.execute("select 'y'")
+            pid1 = conn.info.backend_pid
+
+        await p.drain()
+        async with p.connection() as conn:
+            assert conn.info.backend_pid != pid1
+            cur = await conn.execute(
+                "select statement from pg_prepared_statements order by name"
+            )
+            assert [r[0] for r in await cur.fetchall()] == [
+                "select $1::int",
+                "select 'x'",
+            ]
+
+            # The statements are used, not prepared again
+            await conn.execute("select %s::int", [2])
+            await conn.execute("select 'x'")
+            cur = await conn.execute("select count(*) from pg_prepared_statements")
+            assert await cur.fetchone() == (2,)
+
+
+async def test_max_prepared_limit(pool_cls, dsn):
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=2) as p:
+        async with p.connection() as conn:
+            for i in range(4):
+                await conn.execute(f"select {i}", prepare=True)
+
+        await p.drain()
+        async with p.connection() as conn:
+            cur = await conn.execute(
+                "select statement from pg_prepared_statements order by name"
+            )
+            assert await cur.fetchall() == [("select 2",), ("select 3",)]
+
+
+@pytest.mark.parametrize("prepared_max, want", [(1, 1), (0, 0)])
+async def test_max_prepared_conn_limit(pool_cls, dsn, prepared_max, want):
+    async def configure(conn):
+        conn.prepared_max = prepared_max
+
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=10) as p:
+        async with p.connection() as conn:
+            for i in range(4):
+                await conn.execute(f"select {i}", prepare=True)
+
+        p._configure = configure
+        await p.drain()
+        async with p.connection() as conn:
+            cur = await conn.execute("select count(*) from pg_prepared_statements")
+            assert await cur.fetchone() == (want,)
+
+
+async def test_max_prepared_disabled(pool_cls, dsn):
+    async def configure(conn):
+        conn.prepare_threshold = None
+
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=10) as p:
+        async with p.connection() as conn:
+            await conn.execute("select 1", prepare=True)
+
+        p._configure = configure
+        await p.drain()
+        async with p.connection() as conn:
+            cur = await conn.execute("select count(*) from pg_prepared_statements")
+            assert await cur.fetchone() == (0,)
+
+
+async def test_max_prepared_error(pool_cls, dsn, caplog):
+    caplog.set_level(logging.WARNING, logger="psycopg.pool")
+
+    async with pool_cls(
+        dsn,
+        min_size=min_size(pool_cls),
+        kwargs={"autocommit": True},
+        max_prepared=10,
+    ) as p:
+        async with p.connection() as conn:
+            await conn.execute("drop table if exists prepfail")
+            await conn.execute("create table prepfail (id int)")
+            await conn.execute("select 1", prepare=True)
+            await conn.execute("select * from prepfail", prepare=True)
+            await conn.execute("select 2", prepare=True)
+
+        async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+            await conn.execute("drop table prepfail")
+
+        await p.drain()
+        async with p.connection() as conn:
+            cur = await conn.execute("select 1")
+            assert await cur.fetchone() == (1,)
+            cur = await conn.execute("select count(*) from pg_prepared_statements")
+            assert await cur.fetchone() == (0,)
+
+        assert not p._prepared
+
+    assert "error preparing statements" in caplog.records[0].message
+
+
+@pytest.mark.parametrize("max_prepared", [-1])
+async def test_bad_max_prepared(pool_cls, dsn, max_prepared):
+    with pytest.raises(ValueError):
+        pool_cls(dsn, min_size=min_size(pool_cls), max_prepared=max_prepared)
+
+
+async def test_parallel_fetch(pool_cls, dsn):
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        query = """
+            select x, pg_backend_pid() from generate_series(1, 100) as x
+            where x %% %s = %s
+            """
+        recs = await alist(p.parallel_fetch(query, [(4, i) for i in range(4)]))
+        assert sorted(rec[0] for rec in recs) == list(range(1, 101))
+        assert 1 <= len({rec[1] for rec in recs}) <= 2
+
+
+async def test_parallel_fetch_conns_used(pool_cls, dsn):
+    # Don't wait for the connection checked out by the caller.
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_size=3) as p:
+        async with p.connection():
+            # The partitions last longer than the timeout of the third worker.
+            recs = await alist(
+                p.parallel_fetch(
+                    "select %s from pg_sleep(0.1)",
+                    [(i,) for i in range(6)],
+                    concurrency=3,
+                    timeout=0.2,
+                )
+            )
+            assert sorted(recs) == [(i,) for i in range(6)]
+
+
+async def test_parallel_fetch_empty(pool_cls, dsn):
+    async with pool_cls(dsn, min_size=min_size(pool_cls)) as p:
+        assert await alist(p.parallel_fetch("select 1", [])) == []
+        assert await alist(p.parallel_fetch("select 1", [None])) == [(1,)]
+
+
+@pytest.mark.slow
+@pytest.mark.timing
+@pytest.mark.parametrize("concurrency", [1, 4])
+async def test_parallel_fetch_concurrency(pool_cls, dsn, concurrency):
+    async with pool_cls(dsn, min_size=min_size(pool_cls, 4), max_size=4) as p:
+        await p.wait()
+        t0 = time()
+        recs = await alist(
+            p.parallel_fetch(
+                "select %s from pg_sleep(0.2)",
+                [(i,) for i in range(4)],
+                concurrency=concurrency,
+            )
+        )
+        t1 = time()
+        assert sorted(recs) == [(i,) for i in range(4)]
+        want = 0.8 / concurrency
+        assert want <= t1 - t0 < want + 0.15
+
+
+async def test_parallel_fetch_error(pool_cls, dsn):
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        with pytest.raises(psycopg.errors.DivisionByZero):
+            await alist(
+                p.parallel_fetch(
+                    "select 1 / %s from generate_series(1, 10)", [(1,), (0,), (2,)]
+                )
+            )
+
+        async with p.connection() as conn:
+            cur = await conn.execute("select 1")
+            assert await cur.fetchone() == (1,)
+
+
+async def test_parallel_fetch_close(pool_cls, dsn):
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        gen = p.parallel_fetch(
+            "select generate_series(1, 10)", [None] * 10, concurrency=2
+        )
+        async with aclosing(gen):
+            async for rec in gen:
+                break
+
+        stats = p.get_stats()
+        assert stats.get("pool_size", 0) == stats.get("pool_available", 0)
+
+
+@pytest.fixture
+async def copy_table(aconn):
+    await aconn.execute("drop table if exists copy_parallel")
+    await aconn.execute("create table copy_parallel (id int primary key, data text)")
+    await aconn.commit()
+    return "copy_parallel"
+
+
+async def fetch_copy_table(aconn):
+    cur = await aconn.execute("select * from copy_parallel order by id")
+    recs = await cur.fetchall()
+    await aconn.commit()
+    return recs
+
+
+@pytest.mark.parametrize("binary", [True, False])
+async def test_copy_in_parallel(pool_cls, dsn, aconn, copy_table, binary):
+    rows = [(i, f"data {i}" if i % 3 else None) for i in range(1000)]
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_size=3) as p:
+        n = await p.copy_in_parallel(copy_table, rows, batch_size=64, binary=binary)
+        assert n == 1000
+
+    assert await fetch_copy_table(aconn) == rows
+
+
+async def test_copy_in_parallel_columns(pool_cls, dsn, aconn, copy_table):
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        n = await p.copy_in_parallel(
+            copy_table, iter([(2,), (1,)]), columns=["id"], workers=4, batch_size=1
+        )
+        assert n == 2
+
+    assert await fetch_copy_table(aconn) == [(1, None), (2, None)]
+
+
+async def test_copy_in_parallel_conns_used(pool_cls, dsn, aconn, copy_table):
+    # Don't wait for the connection checked out by the caller.
+    rows = [(i, None) for i in range(100)]
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_size=3) as p:
+        async with p.connection():
+            n = await p.copy_in_parallel(
+                copy_table, rows, workers=3, batch_size=10, timeout=1.0
+            )
+            assert n == 100
+
+    assert await fetch_copy_table(aconn) == rows
+
+
+async def test_copy_in_parallel_empty(pool_cls, dsn, aconn, copy_table):
+    async with pool_cls(dsn, min_size=min_size(pool_cls)) as p:
+        assert await p.copy_in_parallel(copy_table, [], workers=2) == 0
+
+    assert await fetch_copy_table(aconn) == []
+
+
+async def test_copy_in_parallel_error(pool_cls, dsn, aconn, copy_table):
+    # A record fails on one connection: all the copies are rolled back.
+    rows = [(i, None) for i in range(100)] + [(None, None)]
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        with pytest.raises(psycopg.errors.NotNullViolation):
+            await p.copy_in_parallel(copy_table, rows, batch_size=10)
+
+        async with p.connection() as pconn:
+            cur = await pconn.execute("select 1")
+            assert await cur.fetchone() == (1,)
+
+    assert await fetch_copy_table(aconn) == []
+
+
+async def test_copy_in_parallel_rows_error(pool_cls, dsn, aconn, copy_table):
+    def rows():
+        for i in range(100):
+            yield (i, None)
+        raise ZeroDivisionError
+
+    async with pool_cls(dsn, min_size=min_size(pool_cls), max_size=2) as p:
+        with pytest.raises(ZeroDivisionError):
+            await p.copy_in_parallel(copy_table, rows(), batch_size=10)
+
+    assert await fetch_copy_table(aconn) == []
+
+
 def min_size(pool_cls, num=1):
     """Return the minimum min_size supported by the pool class."""
     if pool_cls is pool.AsyncConnectionPool:
@@ -13,7 +13,7 @@ import pytest
 
 import psycopg
 from psycopg import errors as e
-from psycopg import pq
+from psycopg import pq, sql
 from psycopg.rows import tuple_row
 from psycopg.conninfo import conninfo_to_dict, timeout_from_conninfo
 from psycopg._conninfo_utils import get_param
@@ -867,6 +867,131 @@ def test_connect_context_copy(conn_cls, dsn, conn):
     conn2.close()
 
 
+@pytest.fixture
+def upsert_table(conn):
+    conn.execute("drop table if exists upsert")
+    conn.execute("create table upsert (id int primary key, data text, n int)")
+    conn.execute("insert into upsert values (1, 'one', 1), (2, 'two', 2)")
+    conn.commit()
+    return "upsert"
+
+
+def fetch_upsert(conn):
+    cur = conn.execute("select * from upsert order by id")
+    return cur.fetchall()
+
+
+@pytest.mark.parametrize("binary", [True, False])
+def test_bulk_upsert(conn, upsert_table, binary):
+    rows = [(2, "TWO", 20), (3, "three", 30), (4, None, None)]
+    n = conn.bulk_upsert(
+        upsert_table, rows, ["id"], columns=["id", "data", "n"], binary=binary
+    )
+    assert n == 3
+    assert conn.info.transaction_status == pq.TransactionStatus.IDLE
+    assert fetch_upsert(conn) == [
+        (1, "one", 1),
+        (2, "TWO", 20),
+        (3, "three", 30),
+        (4, None, None),
+    ]
+
+
+def test_bulk_upsert_update(conn, upsert_table):
+    rows = [(1, "ONE", 10), (3, "three", 30)]
+    n = conn.bulk_upsert(
+        sql.Identifier("public", upsert_table),
+        iter(rows),
+        ["id"],
+        columns=["id", "data", "n"],
+        update=["n"],
+    )
+    assert n == 2
+    assert fetch_upsert(conn) == [(1, "one", 10), (2, "two", 2), (3, "three", 30)]
+
+
+def test_bulk_upsert_nothing(conn, upsert_table):
+    conn.set_autocommit(True)
+    rows = [(2, "TWO"), (3, "three")]
+    n = conn.bulk_upsert(upsert_table, rows, ["id"], columns=["id", "data"], update=[])
+    assert n == 1
+    assert fetch_upsert(conn) == [(1, "one", 1), (2, "two", 2), (3, "three", None)]
+
+
+def test_bulk_upsert_in_transaction(conn, upsert_table):
+    with conn.transaction():
+        for i in range(2):
+            n = conn.bulk_upsert(
+                upsert_table, [(1, f"v{i}")], ["id"], columns=["id", "data"]
+            )
+            assert n == 1
+    assert fetch_upsert(conn)[0] == (1, "v1", 1)
+
+
+def test_bulk_upsert_error(conn, upsert_table):
+    with pytest.raises(e.InvalidColumnReference):
+        conn.bulk_upsert(upsert_table, [(1, "x")], ["data"], columns=["id", "data"])
+    assert conn.info.transaction_status == pq.TransactionStatus.IDLE
+
+    with pytest.raises(e.DataError):
+        conn.bulk_upsert(
+            upsert_table, [(1, 2**40)], ["id"], columns=["id", "n"], binary=False
+        )
+
+    with pytest.raises(e.NotNullViolation):
+        conn.bulk_upsert(upsert_table, [(None, "x")], ["id"], columns=["id", "data"])
+
+    n = conn.bulk_upsert(upsert_table, [(1, "x")], ["id"], columns=["id", "data"])
+    assert n == 1
+
+
+def test_bulk_upsert_duplicate_keys(conn, upsert_table):
+    with pytest.raises(e.CardinalityViolation):
+        conn.bulk_upsert(
+            upsert_table, [(1, "x"), (1, "y")], ["id"], columns=["id", "data"]
+        )
+    assert conn.info.transaction_status == pq.TransactionStatus.IDLE
+
+
+def test_bulk_upsert_stage_name(conn, upsert_table):
+    conn.execute("create temp table _psycopg_bulk_upsert (x int)")
+    for i in range(2):
+        n = conn.bulk_upsert(upsert_table, [(i, "x")], ["id"], columns=["id", "data"])
+        assert n == 1
+    # The staging tables are dropped at the end of the transaction.
+    conn.commit()
+    cur = conn.execute(
+        "select count(*) from pg_class where relname like '_psycopg_upsert_%'"
+    )
+    assert cur.fetchone() == (0,)
+
+
+def test_bulk_upsert_prepared(conn, upsert_table):
+    conn.prepare_threshold = 0
+    for i in range(3):
+        conn.execute("select %s::int", (i,))
+    stats = conn.prepared_stats()
+    assert stats.keys
+    counts = dict(conn._prepared._counts)
+
+    for i in range(3):
+        n = conn.bulk_upsert(upsert_table, [(i, "x")], ["id"], columns=["id", "data"])
+        assert n == 1
+
+    assert conn.prepared_stats() == stats
+    assert conn._prepared._counts == counts
+    conn.execute("select %s::int", (10,))
+    assert conn.prepared_stats().hits == stats.hits + 1
+
+
+@pytest.mark.parametrize(
+    "columns, keys, update", [([], ["id"], None), (["id"], [], None)]
+)
+def test_bulk_upsert_bad_args(conn, columns, keys, update):
+    with pytest.raises(ValueError):
+        conn.bulk_upsert("upsert", [], keys, columns=columns, update=update)
+
+
 def test_cancel_closed(conn):
     conn.close()
     conn.cancel()
@@ -10,7 +10,7 @@ import pytest
 
 import psycopg
 from psycopg import errors as e
-from psycopg import pq
+from psycopg import pq, sql
 from psycopg.rows import tuple_row
 from psycopg.conninfo import conninfo_to_dict, timeout_from_conninfo
 from psycopg._conninfo_utils import get_param
@@ -870,6 +870,151 @@ async def test_connect_context_copy(aconn_cls, dsn, aconn):
     await conn2.close()
 
 
+@pytest.fixture
+async def upsert_table(aconn):
+    await aconn.execute("drop table if exists upsert")
+    await aconn.execute("create table upsert (id int primary key, data text, n int)")
+    await aconn.execute("insert into upsert values (1, 'one', 1), (2, 'two', 2)")
+    await aconn.commit()
+    return "upsert"
+
+
+async def fetch_upsert(aconn):
+    cur = await aconn.execute("select * from upsert order by id")
+    return await cur.fetchall()
+
+
+@pytest.mark.parametrize("binary", [True, False])
+async def test_bulk_upsert(aconn, upsert_table, binary):
+    rows = [(2, "TWO", 20), (3, "three", 30), (4, None, None)]
+    n = await aconn.bulk_upsert(
+        upsert_table, rows, ["id"], columns=["id", "data", "n"], binary=binary
+    )
+    assert n == 3
+    assert aconn.info.transaction_status == pq.TransactionStatus.IDLE
+    assert await fetch_upsert(aconn) == [
+        (1, "one", 1),
+        (2, "TWO", 20),
+        (3, "three", 30),
+        (4, None, None),
+    ]
+
+
+async def test_bulk_upsert_update(aconn, upsert_table):
+    rows = [(1, "ONE", 10), (3, "three", 30)]
+    n = await aconn.bulk_upsert(
+        sql.Identifier("public", upsert_table),
+        iter(rows),
+        ["id"],
+        columns=["id", "data", "n"],
+        update=["n"],
+    )
+    assert n == 2
+    assert await fetch_upsert(aconn) == [
+        (1, "one", 10),
+        (2, "two", 2),
+        (3, "three", 30),
+    ]
+
+
+async def test_bulk_upsert_nothing(aconn, upsert_table):
+    await aconn.set_autocommit(True)
+    rows = [(2, "TWO"), (3, "three")]
+    n = await aconn.bulk_upsert(
+        upsert_table, rows, ["id"], columns=["id", "data"], update=[]
+    )
+    assert n == 1
+    assert await fetch_upsert(aconn) == [
+        (1, "one", 1),
+        (2, "two", 2),
+        (3, "three", None),
+    ]
+
+
+async def test_bulk_upsert_in_transaction(aconn, upsert_table):
+    async with aconn.transaction():
+        for i in range(2):
+            n = await aconn.bulk_upsert(
+                upsert_table, [(1, f"v{i}")], ["id"], columns=["id", "data"]
+            )
+            assert n == 1
+    assert (await fetch_upsert(aconn))[0] == (1, "v1", 1)
+
+
+async def test_bulk_upsert_error(aconn, upsert_table):
+    with pytest.raises(e.InvalidColumnReference):
+        await aconn.bulk_upsert(
+            upsert_table, [(1, "x")], ["data"], columns=["id", "data"]
+        )
+    assert aconn.info.transaction_status == pq.TransactionStatus.IDLE
+
+    with pytest.raises(e.DataError):
+        await aconn.bulk_upsert(
+            upsert_table, [(1, 2**40)], ["id"], columns=["id", "n"], binary=False
+        )
+
+    with pytest.raises(e.NotNullViolation):
+        await aconn.bulk_upsert(
+            upsert_table, [(None, "x")], ["id"], columns=["id", "data"]
+        )
+
+    n = await aconn.bulk_upsert(
+        upsert_table, [(1, "x")], ["id"], columns=["id", "data"]
+    )
+    assert n == 1
+
+
+async def test_bulk_upsert_duplicate_keys(aconn, upsert_table):
+    with pytest.raises(e.CardinalityViolation):
+        await aconn.bulk_upsert(
+            upsert_table, [(1, "x"), (1, "y")], ["id"], columns=["id", "data"]
+        )
+    assert aconn.info.transaction_status == pq.TransactionStatus.IDLE
+
+
+async def test_bulk_upsert_stage_name(aconn, upsert_table):
+    await aconn.execute("create temp table _psycopg_bulk_upsert (x int)")
+    for i in range(2):
+        n = await aconn.bulk_upsert(
+            upsert_table, [(i, "x")], ["id"], columns=["id", "data"]
+        )
+        assert n == 1
+    # The staging tables are dropped at the end of the transaction.
+    await aconn.commit()
+    cur = await aconn.execute(
+        "select count(*) from pg_class where relname like '_psycopg_upsert_%'"
+    )
+    assert await cur.fetchone() == (0,)
+
+
+async def test_bulk_upsert_prepared(aconn, upsert_table):
+    aconn.prepare_threshold = 0
+    for i in range(3):
+        await aconn.execute("select %s::int", (i,))
+    stats = aconn.prepared_stats()
+    assert stats.keys
+    counts = dict(aconn._prepared._counts)
+
+    for i in range(3):
+        n = await aconn.bulk_upsert(
+            upsert_table, [(i, "x")], ["id"], columns=["id", "data"]
+        )
+        assert n == 1
+
+    assert aconn.prepared_stats() == stats
+    assert aconn._prepared._counts == counts
+    await aconn.execute("select %s::int", (10,))
+    assert aconn.prepared_stats().hits == stats.hits + 1
+
+
+@pytest.mark.parametrize(
+    "columns, keys, update", [([], ["id"], None), (["id"], [], None)]
+)
+async def test_bulk_upsert_bad_args(aconn, columns, keys, update):
+    with pytest.raises(ValueError):
+        await aconn.bulk_upsert("upsert", [], keys, columns=columns, update=update)
+
+
 async def test_cancel_closed(aconn):
     await aconn.close()
     aconn.cancel()
@@ -1,9 +1,14 @@
 # WARNING: this file is auto-generated by 'async_to_sync.py'
 # from the original file 'test_copy_async.py'
 # DO NOT CHANGE! Change the original file instead.
+import os
+import gzip
+import socket
 import string
 import hashlib
+import threading
 from io import BytesIO, StringIO
+from time import time
 from random import choice, randrange
 from itertools import cycle
 
@@ -16,15 +21,16 @@ from psycopg.abc import Buffer
 from psycopg.copy import Copy, LibpqWriter, QueuedLibpqWriter
 from psycopg.adapt import Dumper, PyFormat
 from psycopg.types import TypeInfo
+from psycopg.generators import copy_to
 from psycopg.types.hstore import register_hstore
 from psycopg.types.numeric import Int4
 
 from .utils import eur
-from .acompat import Event, gather, spawn
+from .acompat import Event, gather, skip_sync, sleep, spawn
 from ._test_copy import sample_binary  # noqa: F401
-from ._test_copy import FileWriter, ensure_table, py_to_raw, sample_binary_rows
-from ._test_copy import sample_records, sample_tabledef, sample_text, sample_values
-from ._test_copy import special_chars
+from ._test_copy import FileWriter, check_compression, compress, decompress
+from ._test_copy import ensure_table, py_to_raw, sample_binary_rows, sample_records
+from ._test_copy import sample_tabledef, sample_text, sample_values, special_chars
 from .test_adapt import StrNoneBinaryDumper, StrNoneDumper
 
 pytestmark = pytest.mark.crdb_skip("copy")
@@ -67,6 +73,168 @@ def test_copy_out_iter(conn, format, row_factory):
     assert conn.info.transaction_status == pq.TransactionStatus.INTRANS
 
 
+@pytest.mark.parametrize("format", pq.Format)
+def test_copy_out_read_into(conn, format):
+    if format == pq.Format.TEXT:
+        want = sample_text
+    else:
+        want = b"".join(sample_binary_rows)
+
+    f = BytesIO()
+    cur = conn.cursor()
+    with cur.copy(f"copy ({sample_values}) to stdout (format {format.name})") as copy:
+        assert copy.read_into(f) == len(want)
+        assert copy.read_into(f) == 0
+        assert copy.read() == b""
+
+    assert f.getvalue() == want
+    assert cur.rowcount == 2
+    assert conn.info.transaction_status == pq.TransactionStatus.INTRANS
+
+
+def test_copy_out_read_into_fd(conn, tmp_path):
+    nrows = 100000
+    fn = tmp_path / "copy.txt"
+    fd = os.open(fn, os.O_WRONLY | os.O_CREAT)
+    try:
+        cur = conn.cursor()
+        with cur.copy(f"copy (select generate_series(1, {nrows})) to stdout") as copy:
+            nbytes = copy.read_into(fd)
+    finally:
+        os.close(fd)
+
+    want = "".join((f"{i}\n" for i in range(1, nrows + 1))).encode()
+    assert nbytes == len(want)
+    assert fn.read_bytes() == want
+    assert cur.rowcount == nrows
+
+
+def test_copy_out_read_into_socket(conn):
+    # Writing into a non-blocking socket when its buffer is full.
+    nrows = 200000
+    wsock, rsock = socket.socketpair()
+    wsock.setblocking(False)
+    wsock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    received = BytesIO()
+
+    def consume():
+        while data := rsock.recv(1024):
+            received.write(data)
+
+    # Start reading late, so that the socket buffer is full by then.
+    t = threading.Timer(0.2, consume)
+    t.start()
+    try:
+        cur = conn.cursor()
+        with cur.copy(f"copy (select generate_series(1, {nrows})) to stdout") as copy:
+            nbytes = copy.read_into(wsock.fileno())
+    finally:
+        wsock.close()
+        t.join()
+        rsock.close()
+
+    want = "".join((f"{i}\n" for i in range(1, nrows + 1))).encode()
+    assert nbytes == len(want)
+    assert received.getvalue() == want
+
+
+@skip_sync
+def test_copy_out_read_into_thread(conn):
+    # The file is not written by the event loop, even without compression.
+    threads = set()
+
+    class SpyFile(BytesIO):
+
+        def write(self, data):
+            threads.add(threading.current_thread())
+            return super().write(data)
+
+    f = SpyFile()
+    cur = conn.cursor()
+    with cur.copy(f"copy ({sample_values}) to stdout") as copy:
+        assert copy.read_into(f) == len(sample_text)
+
+    assert f.getvalue() == sample_text
+    assert threads
+    assert threading.current_thread() not in threads
+
+
+def test_copy_out_read_into_server_error(conn):
+    f = BytesIO()
+    cur = conn.cursor()
+    with pytest.raises(e.DivisionByZero):
+        with cur.copy(
+            "copy (select 1/n from generate_series(-10, 10) x(n)) to stdout"
+        ) as copy:
+            copy.read_into(f)
+
+    assert f.getvalue().endswith(b"0\n-1\n")
+    assert conn.info.transaction_status == pq.TransactionStatus.INERROR
+
+
+@pytest.mark.parametrize("format", pq.Format)
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_copy_out_read_into_compressed(conn, format, compression):
+    check_compression(compression)
+    if format == pq.Format.TEXT:
+        want = sample_text
+    else:
+        want = b"".join(sample_binary_rows)
+
+    f = BytesIO()
+    cur = conn.cursor()
+    with cur.copy(f"copy ({sample_values}) to stdout (format {format.name})") as copy:
+        assert copy.read_into(f, compression=compression) == len(want)
+
+    assert f.getvalue() != want
+    assert decompress(f.getvalue(), compression) == want
+    assert cur.rowcount == 2
+
+
+def test_copy_out_read_into_compressed_fd(conn, tmp_path):
+    nrows = 100000
+    fn = tmp_path / "copy.txt.gz"
+    fd = os.open(fn, os.O_WRONLY | os.O_CREAT)
+    try:
+        cur = conn.cursor()
+        with cur.copy(f"copy (select generate_series(1, {nrows})) to stdout") as copy:
+            nbytes = copy.read_into(fd, compression="gzip")
+    finally:
+        os.close(fd)
+
+    want = "".join((f"{i}\n" for i in range(1, nrows + 1))).encode()
+    assert nbytes == len(want)
+    assert gzip.decompress(fn.read_bytes()) == want
+
+
+def test_copy_out_read_into_compressed_thread(conn):
+    # The data is compressed and written by a worker thread.
+    threads = set()
+
+    class SpyFile(BytesIO):
+
+        def write(self, data):
+            threads.add(threading.current_thread())
+            return super().write(data)
+
+    f = SpyFile()
+    cur = conn.cursor()
+    with cur.copy("copy (select generate_series(1, 100000)) to stdout") as copy:
+        copy.read_into(f, compression="gzip")
+
+    assert threads
+    assert threading.current_thread() not in threads
+    want = "".join((f"{i}\n" for i in range(1, 100001))).encode()
+    assert gzip.decompress(f.getvalue()) == want
+
+
+def test_copy_out_read_into_bad_compression(conn):
+    cur = conn.cursor()
+    with pytest.raises(ValueError, match="compression"):
+        with cur.copy(f"copy ({sample_values}) to stdout") as copy:
+            copy.read_into(BytesIO(), compression="zip")
+
+
 @pytest.mark.parametrize("format", pq.Format)
 @pytest.mark.parametrize("row_factory", ["tuple_row", "dict_row", "namedtuple_row"])
 def test_copy_out_no_result(conn, format, row_factory):
@@ -230,6 +398,91 @@ def test_copy_in_buffers(conn, format, buffer):
     assert data == sample_records
 
 
+@pytest.mark.parametrize(
+    "format, buffer",
+    [(pq.Format.TEXT, "sample_text"), (pq.Format.BINARY, "sample_binary")],
+)
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_copy_in_write_from(conn, format, buffer, compression):
+    check_compression(compression)
+    data = globals()[buffer]
+    f = BytesIO(compress(data, compression) if compression else data)
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        assert copy.write_from(f, compression=compression) == len(data)
+
+    cur.execute("select * from copy_in order by 1")
+    assert cur.fetchall() == sample_records
+
+
+def test_copy_in_write_from_fd(conn, tmp_path):
+    # A file made of several gzip members, larger than a buffer
+    nrows = 100000
+    fn = tmp_path / "copy.txt.gz"
+    half = nrows // 2
+    fn.write_bytes(
+        gzip.compress("".join((f"{i}\n" for i in range(half))).encode())
+        + gzip.compress("".join((f"{i}\n" for i in range(half, nrows))).encode())
+    )
+
+    cur = conn.cursor()
+    cur.execute("create temp table copy_nums (n int)")
+    fd = os.open(fn, os.O_RDONLY)
+    try:
+        with cur.copy("copy copy_nums from stdin") as copy:
+            copy.write_from(fd, compression="gzip")
+    finally:
+        os.close(fd)
+
+    assert cur.rowcount == nrows
+    cur.execute("select count(distinct n), max(n) from copy_nums")
+    assert cur.fetchone() == (nrows, nrows - 1)
+
+
+def test_copy_in_write_from_error(conn):
+    f = BytesIO(gzip.compress(sample_text)[:-20])
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with pytest.raises(EOFError):
+        with cur.copy("copy copy_in from stdin") as copy:
+            copy.write_from(f, compression="gzip")
+
+    assert conn.info.transaction_status == pq.TransactionStatus.INERROR
+
+
+@skip_sync
+def test_copy_in_write_from_cancel(conn):
+    # Cancelling write_from() while a read is in progress doesn't block the
+    # event loop waiting for the read to terminate.
+    reading = threading.Event()
+    release = threading.Event()
+
+    class SlowFile(BytesIO):
+
+        def read(self, size=-1):
+            if self.tell():
+                reading.set()
+                release.wait(2.0)
+            return super().read(size)
+
+    def release_later():
+        sleep(0.1)
+        release.set()
+
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy("copy copy_in from stdin") as copy:
+        t = spawn(copy.write_from, (SlowFile(sample_text),))
+        while not reading.is_set():
+            sleep(0.01)
+        t0 = time()
+        t.cancel()
+        gather(t, spawn(release_later), return_exceptions=True)
+        assert t.cancelled()
+        assert time() - t0 < 1.0
+
+
 def test_copy_in_buffers_pg_error(conn):
     cur = conn.cursor()
     ensure_table(cur, sample_tabledef)
@@ -458,6 +711,108 @@ def test_copy_in_records(conn, format):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", pq.Format)
+@pytest.mark.parametrize("nrecs", [0, 10, 20000])
+def test_copy_in_write_rows(conn, format, nrecs):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    records = [(i, i * 10 if i % 3 else None, f"data {i}") for i in range(nrecs)]
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.set_types(["int4", "int4", "text"])
+        copy.write_rows(iter(records))
+
+    assert cur.rowcount == nrecs
+    cur.execute("select * from copy_in order by 1")
+    assert cur.fetchall() == records
+
+
+@pytest.mark.parametrize("format", pq.Format)
+def test_copy_in_write_rows_mixed(conn, format):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.set_types(["int4", "int4", "text"])
+        copy.write_row((1, None, "hello"))
+        copy.write_rows([(2, 20, "a"), (3, 30, "b")])
+        copy.write_rows([])
+        copy.write_row((4, None, "world"))
+
+    cur.execute("select * from copy_in order by 1")
+    assert cur.fetchall() == [
+        (1, None, "hello"),
+        (2, 20, "a"),
+        (3, 30, "b"),
+        (4, None, "world"),
+    ]
+
+
+def test_copy_in_write_rows_error(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    records = ((i, None, object() if i == 1500 else "x") for i in range(3000))
+    with pytest.raises(e.ProgrammingError, match="cannot adapt"):
+        with cur.copy("copy copy_in from stdin") as copy:
+            copy.write_rows(records)
+
+    assert conn.info.transaction_status == pq.TransactionStatus.INERROR
+
+
+@pytest.mark.parametrize("format", pq.Format)
+@pytest.mark.parametrize("nrecs", [0, 10, 2500])
+def test_copy_in_format_workers(conn, format, nrecs):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    records = [(i, i * 10 if i % 3 else None, f"data {i}") for i in range(nrecs)]
+    with cur.copy(
+        f"copy copy_in from stdin (format {format.name})", format_workers=2
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        for rec in records:
+            copy.write_row(rec)
+
+    assert cur.rowcount == nrecs
+    cur.execute("select * from copy_in order by 1")
+    assert cur.fetchall() == records
+
+
+@pytest.mark.parametrize("format", pq.Format)
+def test_copy_in_format_workers_write(conn, format):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with cur.copy(
+        f"copy copy_in from stdin (format {format.name})", format_workers=2
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        copy.write_row((1, None, "hello"))
+        copy.write_columns([[2, 3], [20, 30], ["a", "b"]])
+        copy.write_row((4, None, "world"))
+
+    cur.execute("select * from copy_in order by 1")
+    assert cur.fetchall() == [
+        (1, None, "hello"),
+        (2, 20, "a"),
+        (3, 30, "b"),
+        (4, None, "world"),
+    ]
+
+
+def test_copy_in_format_workers_error(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with pytest.raises(e.ProgrammingError, match="cannot adapt"):
+        with cur.copy("copy copy_in from stdin", format_workers=2) as copy:
+            for i in range(3000):
+                copy.write_row((i, None, object() if i == 1500 else "x"))
+
+    assert conn.info.transaction_status == pq.TransactionStatus.INERROR
+
+
 @pytest.mark.parametrize("format", pq.Format)
 def test_copy_in_records_set_types(conn, format):
     cur = conn.cursor()
@@ -473,6 +828,29 @@ def test_copy_in_records_set_types(conn, format):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", pq.Format)
+def test_copy_in_columns(conn, format):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.set_types(["int4", "int4", "text"])
+        copy.write_columns(list(zip(*sample_records)))
+
+    cur.execute("select * from copy_in order by 1")
+    data = cur.fetchall()
+    assert data == sample_records
+
+
+def test_copy_in_columns_bad_length(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+
+    with pytest.raises(e.DataError):
+        with cur.copy("copy copy_in from stdin") as copy:
+            copy.write_columns([[1, 2], [3], ["a", "b"]])
+
+
 @pytest.mark.parametrize("format", pq.Format)
 def test_copy_in_records_binary(conn, format):
     cur = conn.cursor()
@@ -618,6 +996,24 @@ def test_file_writer(conn, format, buffer):
     assert got == want
 
 
+@pytest.mark.parametrize(
+    "format, buffer",
+    [(pq.Format.TEXT, "sample_text"), (pq.Format.BINARY, "sample_binary")],
+)
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_file_writer_compressed(conn, format, buffer, compression):
+    check_compression(compression)
+    file = BytesIO()
+    conn.execute("set client_encoding to utf8")
+    cur = conn.cursor()
+    with Copy(
+        cur, binary=format, writer=FileWriter(file, compression=compression)
+    ) as copy:
+        copy.write_rows(sample_records)
+
+    assert decompress(file.getvalue(), compression) == globals()[buffer]
+
+
 @pytest.mark.slow
 def test_copy_from_to(conn):
     # Roundtrip from file to database to file blockwise
@@ -805,6 +1201,46 @@ def test_worker_error_propagated(conn, monkeypatch):
             copy.write("a,b")
 
 
+def test_worker_error_queue_full(conn, monkeypatch):
+
+    def copy_to_broken(pgconn, buffer, flush=True):
+        raise ZeroDivisionError
+        yield
+
+    monkeypatch.setattr(psycopg._copy, "copy_to", copy_to_broken)
+    cur = conn.cursor()
+    cur.execute("create temp table wat (a text)")
+    with pytest.raises(ZeroDivisionError):
+        with cur.copy(
+            "copy wat from stdin", writer=QueuedLibpqWriter(cur, queue_size=1)
+        ) as copy:
+            for i in range(10):
+                copy.write("a\n")
+
+    # The copy was terminated on the server too
+    assert conn.info.transaction_status == pq.TransactionStatus.INERROR
+    conn.rollback()
+    assert conn.execute("select 1").fetchone() == (1,)
+
+
+@pytest.mark.parametrize("format", pq.Format)
+def test_queued_writer_rows(conn, format):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    records = [(i, i * 10 if i % 3 else None, f"data {i}") for i in range(20000)]
+    with cur.copy(
+        f"copy copy_in from stdin (format {format.name})", writer=QueuedLibpqWriter(cur)
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        copy.write_rows(records[:10000])
+        for rec in records[10000:]:
+            copy.write_row(rec)
+
+    assert cur.rowcount == 20000
+    cur.execute("select * from copy_in order by 1")
+    assert cur.fetchall() == records
+
+
 @pytest.mark.parametrize(
     "format, buffer",
     [(pq.Format.TEXT, "sample_text"), (pq.Format.BINARY, "sample_binary")],
@@ -825,6 +1261,118 @@ def test_connection_writer(conn, format, buffer):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", pq.Format)
+def test_copy_in_buffer_size(conn, format):
+    sizes = []
+
+    class SpyWriter(LibpqWriter):
+
+        def write(self, data):
+            sizes.append(len(data))
+            super().write(data)
+
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    records = [(i, i * 10, f"data {i}") for i in range(100)]
+    with cur.copy(
+        f"copy copy_in from stdin (format {format.name})",
+        writer=SpyWriter(cur),
+        buffer_size=100,
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        for rec in records[:50]:
+            copy.write_row(rec)
+        copy.write_rows(records[50:])
+
+    assert len(sizes) > 10
+    assert all((100 <= size < 200 for size in sizes[:-1]))
+    cur.execute("select * from copy_in order by 1")
+    assert cur.fetchall() == records
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"buffer_size": 0}, {"buffer_size": -1}, {"max_buffer_size": 0}]
+)
+def test_copy_in_bad_buffer_size(conn, kwargs):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with pytest.raises(ValueError):
+        with cur.copy("copy copy_in from stdin", **kwargs) as copy:
+            copy.write_rows([(1, 2, "x")])
+
+    assert conn.info.transaction_status == pq.TransactionStatus.INTRANS
+    cur.execute("select count(*) from copy_in")
+    assert cur.fetchone() == (0,)
+
+
+@pytest.mark.parametrize("queued", [False, True])
+def test_copy_in_max_buffer_size(conn, monkeypatch, queued):
+    sizes = []
+
+    def copy_to_spy(pgconn, buffer, flush=True):
+        sizes.append((len(buffer), flush))
+        return copy_to(pgconn, buffer, flush)
+
+    monkeypatch.setattr(psycopg._copy, "copy_to", copy_to_spy)
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    wcls = QueuedLibpqWriter if queued else LibpqWriter
+    writer = wcls(cur, max_buffer_size=10, prefer_flush=True)
+    with cur.copy("copy copy_in from stdin", writer=writer) as copy:
+        copy.write(sample_text)
+
+    assert len(sizes) == (len(sample_text) + 9) // 10
+    assert all((size <= 10 and flush for size, flush in sizes))
+    cur.execute("select * from copy_in order by 1")
+    assert cur.fetchall() == sample_records
+
+
+def test_copy_in_prefer_flush_writer(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with pytest.raises(e.ProgrammingError, match="prefer_flush"):
+        with cur.copy(
+            "copy copy_in from stdin", writer=LibpqWriter(cur), prefer_flush=True
+        ):
+            pass
+
+
+@pytest.mark.parametrize("format", pq.Format)
+def test_copy_stats(conn, format):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    with cur.copy(
+        f"copy copy_in from stdin (format {format.name})", buffer_size=100
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        copy.write_row((1, 10, "hello"))
+        copy.write_rows([(i, None, "x" * 20) for i in range(2, 100)])
+        stats = copy.get_stats()
+        assert stats["rows"] == 99
+        assert 0 < stats["bytes_written"] < 99 * 40
+
+    stats = copy.get_stats()
+    assert stats["rows"] == 99
+    assert stats["bytes_written"] > 99 * 20
+    assert stats["write_ms"] >= 0
+    assert stats["other_ms"] >= 0
+    assert "queue_max" not in stats
+    assert cur.rowcount == 99
+
+
+def test_copy_stats_queue(conn):
+    cur = conn.cursor()
+    ensure_table(cur, sample_tabledef)
+    writer = QueuedLibpqWriter(cur, queue_size=4)
+    with cur.copy("copy copy_in from stdin", writer=writer, buffer_size=100) as copy:
+        copy.write_rows([(i, None, "x" * 20) for i in range(1000)])
+
+    stats = copy.get_stats()
+    assert stats["rows"] == 1000
+    assert 1 <= stats["queue_max"] <= 4
+    assert cur.rowcount == 1000
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize(
     "fmt, set_types",
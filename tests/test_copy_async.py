@@ -1,6 +1,11 @@
+import os
+import gzip
+import socket
 import string
 import hashlib
+import threading
 from io import BytesIO, StringIO
+from time import time
 from random import choice, randrange
 from itertools import cycle
 
@@ -13,15 +18,17 @@ from psycopg.abc import Buffer
 from psycopg.copy import AsyncCopy, AsyncLibpqWriter, AsyncQueuedLibpqWriter
 from psycopg.adapt import Dumper, PyFormat
 from psycopg.types import TypeInfo
+from psycopg.generators import copy_to
 from psycopg.types.hstore import register_hstore
 from psycopg.types.numeric import Int4
 
 from .utils import eur
-from .acompat import AEvent, alist, gather, spawn
+from .acompat import AEvent, alist, asleep, gather, skip_sync, spawn
 from ._test_copy import sample_binary  # noqa: F401
-from ._test_copy import AsyncFileWriter, ensure_table_async, py_to_raw
-from ._test_copy import sample_binary_rows, sample_records, sample_tabledef
-from ._test_copy import sample_text, sample_values, special_chars
+from ._test_copy import AsyncFileWriter, check_compression, compress, decompress
+from ._test_copy import ensure_table_async, py_to_raw, sample_binary_rows
+from ._test_copy import sample_records, sample_tabledef, sample_text, sample_values
+from ._test_copy import special_chars
 from .test_adapt import StrNoneBinaryDumper, StrNoneDumper
 
 pytestmark = pytest.mark.crdb_skip("copy")
@@ -68,6 +75,176 @@ async def test_copy_out_iter(aconn, format, row_factory):
     assert aconn.info.transaction_status == pq.TransactionStatus.INTRANS
 
 
+@pytest.mark.parametrize("format", pq.Format)
+async def test_copy_out_read_into(aconn, format):
+    if format == pq.Format.TEXT:
+        want = sample_text
+    else:
+        want = b"".join(sample_binary_rows)
+
+    f = BytesIO()
+    cur = aconn.cursor()
+    async with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        assert await copy.read_into(f) == len(want)
+        assert await copy.read_into(f) == 0
+        assert await copy.read() == b""
+
+    assert f.getvalue() == want
+    assert cur.rowcount == 2
+    assert aconn.info.transaction_status == pq.TransactionStatus.INTRANS
+
+
+async def test_copy_out_read_into_fd(aconn, tmp_path):
+    nrows = 100_000
+    fn = tmp_path / "copy.txt"
+    fd = os.open(fn, os.O_WRONLY | os.O_CREAT)
+    try:
+        cur = aconn.cursor()
+        async with cur.copy(
+            f"copy (select generate_series(1, {nrows})) to stdout"
+        ) as copy:
+            nbytes = await copy.read_into(fd)
+    finally:
+        os.close(fd)
+
+    want = "".join(f"{i}\n" for i in range(1, nrows + 1)).encode()
+    assert nbytes == len(want)
+    assert fn.read_bytes() == want
+    assert cur.rowcount == nrows
+
+
+async def test_copy_out_read_into_socket(aconn):
+    # Writing into a non-blocking socket when its buffer is full.
+    nrows = 200_000
+    wsock, rsock = socket.socketpair()
+    wsock.setblocking(False)
+    wsock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    received = BytesIO()
+
+    def consume():
+        while data := rsock.recv(1024):
+            received.write(data)
+
+    # Start reading late, so that the socket buffer is full by then.
+    t = threading.Timer(0.2, consume)
+    t.start()
+    try:
+        cur = aconn.cursor()
+        async with cur.copy(
+            f"copy (select generate_series(1, {nrows})) to stdout"
+        ) as copy:
+            nbytes = await copy.read_into(wsock.fileno())
+    finally:
+        wsock.close()
+        t.join()
+        rsock.close()
+
+    want = "".join(f"{i}\n" for i in range(1, nrows + 1)).encode()
+    assert nbytes == len(want)
+    assert received.getvalue() == want
+
+
+@skip_sync
+async def test_copy_out_read_into_thread(aconn):
+    # The file is not written by the event loop, even without compression.
+    threads = set()
+
+    class SpyFile(BytesIO):
+        def write(self, data):
+            threads.add(threading.current_thread())
+            return super().write(data)
+
+    f = SpyFile()
+    cur = aconn.cursor()
+    async with cur.copy(f"copy ({sample_values}) to stdout") as copy:
+        assert await copy.read_into(f) == len(sample_text)
+
+    assert f.getvalue() == sample_text
+    assert threads
+    assert threading.current_thread() not in threads
+
+
+async def test_copy_out_read_into_server_error(aconn):
+    f = BytesIO()
+    cur = aconn.cursor()
+    with pytest.raises(e.DivisionByZero):
+        async with cur.copy(
+            "copy (select 1/n from generate_series(-10, 10) x(n)) to stdout"
+        ) as copy:
+            await copy.read_into(f)
+
+    assert f.getvalue().endswith(b"0\n-1\n")
+    assert aconn.info.transaction_status == pq.TransactionStatus.INERROR
+
+
+@pytest.mark.parametrize("format", pq.Format)
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+async def test_copy_out_read_into_compressed(aconn, format, compression):
+    check_compression(compression)
+    if format == pq.Format.TEXT:
+        want = sample_text
+    else:
+        want = b"".join(sample_binary_rows)
+
+    f = BytesIO()
+    cur = aconn.cursor()
+    async with cur.copy(
+        f"copy ({sample_values}) to stdout (format {format.name})"
+    ) as copy:
+        assert await copy.read_into(f, compression=compression) == len(want)
+
+    assert f.getvalue() != want
+    assert decompress(f.getvalue(), compression) == want
+    assert cur.rowcount == 2
+
+
+async def test_copy_out_read_into_compressed_fd(aconn, tmp_path):
+    nrows = 100_000
+    fn = tmp_path / "copy.txt.gz"
+    fd = os.open(fn, os.O_WRONLY | os.O_CREAT)
+    try:
+        cur = aconn.cursor()
+        async with cur.copy(
+            f"copy (select generate_series(1, {nrows})) to stdout"
+        ) as copy:
+            nbytes = await copy.read_into(fd, compression="gzip")
+    finally:
+        os.close(fd)
+
+    want = "".join(f"{i}\n" for i in range(1, nrows + 1)).encode()
+    assert nbytes == len(want)
+    assert gzip.decompress(fn.read_bytes()) == want
+
+
+async def test_copy_out_read_into_compressed_thread(aconn):
+    # The data is compressed and written by a worker thread.
+    threads = set()
+
+    class SpyFile(BytesIO):
+        def write(self, data):
+            threads.add(threading.current_thread())
+            return super().write(data)
+
+    f = SpyFile()
+    cur = aconn.cursor()
+    async with cur.copy("copy (select generate_series(1, 100000)) to stdout") as copy:
+        await copy.read_into(f, compression="gzip")
+
+    assert threads
+    assert threading.current_thread() not in threads
+    want = "".join(f"{i}\n" for i in range(1, 100001)).encode()
+    assert gzip.decompress(f.getvalue()) == want
+
+
+async def test_copy_out_read_into_bad_compression(aconn):
+    cur = aconn.cursor()
+    with pytest.raises(ValueError, match="compression"):
+        async with cur.copy(f"copy ({sample_values}) to stdout") as copy:
+            await copy.read_into(BytesIO(), compression="zip")
+
+
 @pytest.mark.parametrize("format", pq.Format)
 @pytest.mark.parametrize("row_factory", ["tuple_row", "dict_row", "namedtuple_row"])
 async def test_copy_out_no_result(aconn, format, row_factory):
@@ -239,6 +416,90 @@ async def test_copy_in_buffers(aconn, format, buffer):
     assert data == sample_records
 
 
+@pytest.mark.parametrize(
+    "format, buffer",
+    [(pq.Format.TEXT, "sample_text"), (pq.Format.BINARY, "sample_binary")],
+)
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+async def test_copy_in_write_from(aconn, format, buffer, compression):
+    check_compression(compression)
+    data = globals()[buffer]
+    f = BytesIO(compress(data, compression) if compression else data)
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    async with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        assert await copy.write_from(f, compression=compression) == len(data)
+
+    await cur.execute("select * from copy_in order by 1")
+    assert await cur.fetchall() == sample_records
+
+
+async def test_copy_in_write_from_fd(aconn, tmp_path):
+    # A file made of several gzip members, larger than a buffer
+    nrows = 100_000
+    fn = tmp_path / "copy.txt.gz"
+    half = nrows // 2
+    fn.write_bytes(
+        gzip.compress("".join(f"{i}\n" for i in range(half)).encode())
+        + gzip.compress("".join(f"{i}\n" for i in range(half, nrows)).encode())
+    )
+
+    cur = aconn.cursor()
+    await cur.execute("create temp table copy_nums (n int)")
+    fd = os.open(fn, os.O_RDONLY)
+    try:
+        async with cur.copy("copy copy_nums from stdin") as copy:
+            await copy.write_from(fd, compression="gzip")
+    finally:
+        os.close(fd)
+
+    assert cur.rowcount == nrows
+    await cur.execute("select count(distinct n), max(n) from copy_nums")
+    assert await cur.fetchone() == (nrows, nrows - 1)
+
+
+async def test_copy_in_write_from_error(aconn):
+    f = BytesIO(gzip.compress(sample_text)[:-20])
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    with pytest.raises(EOFError):
+        async with cur.copy("copy copy_in from stdin") as copy:
+            await copy.write_from(f, compression="gzip")
+
+    assert aconn.info.transaction_status == pq.TransactionStatus.INERROR
+
+
+@skip_sync
+async def test_copy_in_write_from_cancel(aconn):
+    # Cancelling write_from() while a read is in progress doesn't block the
+    # event loop waiting for the read to terminate.
+    reading = threading.Event()
+    release = threading.Event()
+
+    class SlowFile(BytesIO):
+        def read(self, size=-1):
+            if self.tell():
+                reading.set()
+                release.wait(2.0)
+            return super().read(size)
+
+    async def release_later():
+        await asleep(0.1)
+        release.set()
+
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    async with cur.copy("copy copy_in from stdin") as copy:
+        t = spawn(copy.write_from, (SlowFile(sample_text),))
+        while not reading.is_set():
+            await asleep(0.01)
+        t0 = time()
+        t.cancel()
+        await gather(t, spawn(release_later), return_exceptions=True)
+        assert t.cancelled()
+        assert time() - t0 < 1.0
+
+
 async def test_copy_in_buffers_pg_error(aconn):
     cur = aconn.cursor()
     await ensure_table_async(cur, sample_tabledef)
@@ -471,6 +732,108 @@ async def test_copy_in_records(aconn, format):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", pq.Format)
+@pytest.mark.parametrize("nrecs", [0, 10, 20000])
+async def test_copy_in_write_rows(aconn, format, nrecs):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+
+    records = [(i, i * 10 if i % 3 else None, f"data {i}") for i in range(nrecs)]
+    async with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.set_types(["int4", "int4", "text"])
+        await copy.write_rows(iter(records))
+
+    assert cur.rowcount == nrecs
+    await cur.execute("select * from copy_in order by 1")
+    assert await cur.fetchall() == records
+
+
+@pytest.mark.parametrize("format", pq.Format)
+async def test_copy_in_write_rows_mixed(aconn, format):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+
+    async with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.set_types(["int4", "int4", "text"])
+        await copy.write_row((1, None, "hello"))
+        await copy.write_rows([(2, 20, "a"), (3, 30, "b")])
+        await copy.write_rows([])
+        await copy.write_row((4, None, "world"))
+
+    await cur.execute("select * from copy_in order by 1")
+    assert await cur.fetchall() == [
+        (1, None, "hello"),
+        (2, 20, "a"),
+        (3, 30, "b"),
+        (4, None, "world"),
+    ]
+
+
+async def test_copy_in_write_rows_error(aconn):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+
+    records = ((i, None, object() if i == 1500 else "x") for i in range(3000))
+    with pytest.raises(e.ProgrammingError, match="cannot adapt"):
+        async with cur.copy("copy copy_in from stdin") as copy:
+            await copy.write_rows(records)
+
+    assert aconn.info.transaction_status == pq.TransactionStatus.INERROR
+
+
+@pytest.mark.parametrize("format", pq.Format)
+@pytest.mark.parametrize("nrecs", [0, 10, 2500])
+async def test_copy_in_format_workers(aconn, format, nrecs):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+
+    records = [(i, i * 10 if i % 3 else None, f"data {i}") for i in range(nrecs)]
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})", format_workers=2
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        for rec in records:
+            await copy.write_row(rec)
+
+    assert cur.rowcount == nrecs
+    await cur.execute("select * from copy_in order by 1")
+    assert await cur.fetchall() == records
+
+
+@pytest.mark.parametrize("format", pq.Format)
+async def test_copy_in_format_workers_write(aconn, format):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})", format_workers=2
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        await copy.write_row((1, None, "hello"))
+        await copy.write_columns([[2, 3], [20, 30], ["a", "b"]])
+        await copy.write_row((4, None, "world"))
+
+    await cur.execute("select * from copy_in order by 1")
+    assert await cur.fetchall() == [
+        (1, None, "hello"),
+        (2, 20, "a"),
+        (3, 30, "b"),
+        (4, None, "world"),
+    ]
+
+
+async def test_copy_in_format_workers_error(aconn):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+
+    with pytest.raises(e.ProgrammingError, match="cannot adapt"):
+        async with cur.copy("copy copy_in from stdin", format_workers=2) as copy:
+            for i in range(3000):
+                await copy.write_row((i, None, object() if i == 1500 else "x"))
+
+    assert aconn.info.transaction_status == pq.TransactionStatus.INERROR
+
+
 @pytest.mark.parametrize("format", pq.Format)
 async def test_copy_in_records_set_types(aconn, format):
     cur = aconn.cursor()
@@ -486,6 +849,29 @@ async def test_copy_in_records_set_types(aconn, format):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", pq.Format)
+async def test_copy_in_columns(aconn, format):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+
+    async with cur.copy(f"copy copy_in from stdin (format {format.name})") as copy:
+        copy.set_types(["int4", "int4", "text"])
+        await copy.write_columns(list(zip(*sample_records)))
+
+    await cur.execute("select * from copy_in order by 1")
+    data = await cur.fetchall()
+    assert data == sample_records
+
+
+async def test_copy_in_columns_bad_length(aconn):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+
+    with pytest.raises(e.DataError):
+        async with cur.copy("copy copy_in from stdin") as copy:
+            await copy.write_columns([[1, 2], [3], ["a", "b"]])
+
+
 @pytest.mark.parametrize("format", pq.Format)
 async def test_copy_in_records_binary(aconn, format):
     cur = aconn.cursor()
@@ -631,6 +1017,24 @@ async def test_file_writer(aconn, format, buffer):
     assert got == want
 
 
+@pytest.mark.parametrize(
+    "format, buffer",
+    [(pq.Format.TEXT, "sample_text"), (pq.Format.BINARY, "sample_binary")],
+)
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+async def test_file_writer_compressed(aconn, format, buffer, compression):
+    check_compression(compression)
+    file = BytesIO()
+    await aconn.execute("set client_encoding to utf8")
+    cur = aconn.cursor()
+    async with AsyncCopy(
+        cur, binary=format, writer=AsyncFileWriter(file, compression=compression)
+    ) as copy:
+        await copy.write_rows(sample_records)
+
+    assert decompress(file.getvalue(), compression) == globals()[buffer]
+
+
 @pytest.mark.slow
 async def test_copy_from_to(aconn):
     # Roundtrip from file to database to file blockwise
@@ -824,6 +1228,46 @@ async def test_worker_error_propagated(aconn, monkeypatch):
             await copy.write("a,b")
 
 
+async def test_worker_error_queue_full(aconn, monkeypatch):
+    def copy_to_broken(pgconn, buffer, flush=True):
+        raise ZeroDivisionError
+        yield
+
+    monkeypatch.setattr(psycopg._copy_async, "copy_to", copy_to_broken)
+    cur = aconn.cursor()
+    await cur.execute("create temp table wat (a text)")
+    with pytest.raises(ZeroDivisionError):
+        async with cur.copy(
+            "copy wat from stdin", writer=AsyncQueuedLibpqWriter(cur, queue_size=1)
+        ) as copy:
+            for i in range(10):
+                await copy.write("a\n")
+
+    # The copy was terminated on the server too
+    assert aconn.info.transaction_status == pq.TransactionStatus.INERROR
+    await aconn.rollback()
+    assert await (await aconn.execute("select 1")).fetchone() == (1,)
+
+
+@pytest.mark.parametrize("format", pq.Format)
+async def test_queued_writer_rows(aconn, format):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    records = [(i, i * 10 if i % 3 else None, f"data {i}") for i in range(20000)]
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})",
+        writer=AsyncQueuedLibpqWriter(cur),
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        await copy.write_rows(records[:10000])
+        for rec in records[10000:]:
+            await copy.write_row(rec)
+
+    assert cur.rowcount == 20000
+    await cur.execute("select * from copy_in order by 1")
+    assert await cur.fetchall() == records
+
+
 @pytest.mark.parametrize(
     "format, buffer",
     [(pq.Format.TEXT, "sample_text"), (pq.Format.BINARY, "sample_binary")],
@@ -844,6 +1288,119 @@ async def test_connection_writer(aconn, format, buffer):
     assert data == sample_records
 
 
+@pytest.mark.parametrize("format", pq.Format)
+async def test_copy_in_buffer_size(aconn, format):
+    sizes = []
+
+    class SpyWriter(AsyncLibpqWriter):
+        async def write(self, data):
+            sizes.append(len(data))
+            await super().write(data)
+
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    records = [(i, i * 10, f"data {i}") for i in range(100)]
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})",
+        writer=SpyWriter(cur),
+        buffer_size=100,
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        for rec in records[:50]:
+            await copy.write_row(rec)
+        await copy.write_rows(records[50:])
+
+    assert len(sizes) > 10
+    assert all(100 <= size < 200 for size in sizes[:-1])
+    await cur.execute("select * from copy_in order by 1")
+    assert await cur.fetchall() == records
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"buffer_size": 0}, {"buffer_size": -1}, {"max_buffer_size": 0}]
+)
+async def test_copy_in_bad_buffer_size(aconn, kwargs):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    with pytest.raises(ValueError):
+        async with cur.copy("copy copy_in from stdin", **kwargs) as copy:
+            await copy.write_rows([(1, 2, "x")])
+
+    assert aconn.info.transaction_status == pq.TransactionStatus.INTRANS
+    await cur.execute("select count(*) from copy_in")
+    assert await cur.fetchone() == (0,)
+
+
+@pytest.mark.parametrize("queued", [False, True])
+async def test_copy_in_max_buffer_size(aconn, monkeypatch, queued):
+    sizes = []
+
+    def copy_to_spy(pgconn, buffer, flush=True):
+        sizes.append((len(buffer), flush))
+        return copy_to(pgconn, buffer, flush)
+
+    monkeypatch.setattr(psycopg._copy_async, "copy_to", copy_to_spy)
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    wcls = AsyncQueuedLibpqWriter if queued else AsyncLibpqWriter
+    writer = wcls(cur, max_buffer_size=10, prefer_flush=True)
+    async with cur.copy("copy copy_in from stdin", writer=writer) as copy:
+        await copy.write(sample_text)
+
+    assert len(sizes) == (len(sample_text) + 9) // 10
+    assert all(size <= 10 and flush for size, flush in sizes)
+    await cur.execute("select * from copy_in order by 1")
+    assert await cur.fetchall() == sample_records
+
+
+async def test_copy_in_prefer_flush_writer(aconn):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    with pytest.raises(e.ProgrammingError, match="prefer_flush"):
+        async with cur.copy(
+            "copy copy_in from stdin", writer=AsyncLibpqWriter(cur), prefer_flush=True
+        ):
+            pass
+
+
+@pytest.mark.parametrize("format", pq.Format)
+async def test_copy_stats(aconn, format):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    async with cur.copy(
+        f"copy copy_in from stdin (format {format.name})", buffer_size=100
+    ) as copy:
+        copy.set_types(["int4", "int4", "text"])
+        await copy.write_row((1, 10, "hello"))
+        await copy.write_rows([(i, None, "x" * 20) for i in range(2, 100)])
+        stats = copy.get_stats()
+        assert stats["rows"] == 99
+        assert 0 < stats["bytes_written"] < 99 * 40
+
+    stats = copy.get_stats()
+    assert stats["rows"] == 99
+    assert stats["bytes_written"] > 99 * 20
+    assert stats["write_ms"] >= 0
+    assert stats["other_ms"] >= 0
+    assert "queue_max" not in stats
+    assert cur.rowcount == 99
+
+
+async def test_copy_stats_queue(aconn):
+    cur = aconn.cursor()
+    await ensure_table_async(cur, sample_tabledef)
+    writer = AsyncQueuedLibpqWriter(cur, queue_size=4)
+    async with cur.copy(
+        "copy copy_in from stdin", writer=writer, buffer_size=100
+    ) as copy:
+        await copy.write_rows([(i, None, "x" * 20) for i in range(1000)])
+
+    stats = copy.get_stats()
+    assert stats["rows"] == 1000
+    assert 1 <= stats["queue_max"] <= 4
+    assert cur.rowcount == 1000
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize(
     "fmt, set_types",
@@ -5,6 +5,8 @@
 Tests for psycopg.Cursor that are not supposed to pass for subclasses.
 """
 
+from decimal import Decimal
+
 import pytest
 
 import psycopg
@@ -12,6 +14,11 @@ from psycopg import errors as e
 from psycopg import pq, rows
 from psycopg.adapt import PyFormat
 
+from . import _test_cursor
+
+execmany = _test_cursor.execmany  # avoid F811 underneath
+_execmany = _test_cursor._execmany  # needed by the execmany fixture
+
 
 def test_default_cursor(conn):
     cur = conn.cursor()
@@ -64,6 +71,188 @@ def test_query_params_executemany(conn):
     assert cur._query.params == [b"3", b"4"]
 
 
+@pytest.mark.parametrize("binary", [False, True])
+def test_compiled_executemany(conn, execmany, binary):
+    query = conn.compile(
+        "insert into execmany(num, data) values (%s, %s)",
+        ["int4", "text"],
+        binary=binary,
+    )
+    assert query.types == (23, 25)
+    cur = conn.cursor()
+    cur.executemany(query, [(10, "hello"), (20, "world"), (None, None)])
+    assert cur._query.types == (23, 25)
+    cur.execute("select num, data from execmany order by 1")
+    assert cur.fetchall() == [(10, "hello"), (20, "world"), (None, None)]
+
+
+def test_compiled_execute(conn):
+    query = conn.compile("select %s, %s", [23, "numeric"])
+    cur = conn.execute(query, (1, Decimal("2")))
+    assert cur.fetchone() == (1, 2)
+    cur.execute(query, (3.0, Decimal("4.5")))
+    assert cur.fetchone() == (3, Decimal("4.5"))
+
+
+def test_compiled_named(conn):
+    query = conn.compile("select %(a)s, %(b)s, %(a)s", {"b": "text", "a": "int8"})
+    assert query.types == (20, 25)
+    cur = conn.execute(query, {"a": 1, "b": "x", "c": None})
+    assert cur.fetchone() == (1, "x", 1)
+
+    with pytest.raises(psycopg.ProgrammingError, match="missing: b"):
+        cur.execute(query, {"a": 1})
+    with pytest.raises(TypeError, match="mapping"):
+        cur.execute(query, (1, "x"))
+
+
+def test_compiled_no_params(conn):
+    query = conn.compile("select 1", [])
+    cur = conn.execute(query)
+    assert cur.fetchone() == (1,)
+
+
+def test_compiled_bad_params(conn):
+    with pytest.raises(psycopg.ProgrammingError, match="2 placeholders but 1 types"):
+        conn.compile("select %s, %s", ["int4"])
+    with pytest.raises(psycopg.ProgrammingError, match="placeholders a"):
+        conn.compile("select %(a)s", {"b": "int4"})
+    with pytest.raises(TypeError, match="sequence"):
+        conn.compile("select %s", {"a": "int4"})
+
+    query = conn.compile("select %s, %s", ["int4", "text"])
+    cur = conn.cursor()
+    with pytest.raises(psycopg.ProgrammingError, match="2 placeholders but 3"):
+        cur.execute(query, (1, "a", 3))
+    with pytest.raises(psycopg.ProgrammingError, match="no parameters"):
+        cur.execute(query)
+    with pytest.raises(TypeError, match="sequence"):
+        cur.execute(query, {"a": 1})
+
+
+@pytest.mark.parametrize("batch_rows", [1, 2, 3, 10])
+def test_executemany_batch_rows(conn, execmany, batch_rows):
+    cur = conn.cursor()
+    records = [(10, "hello"), (20, "world"), (30, None), (40, "x")]
+    cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        records,
+        batch_rows=batch_rows,
+    )
+    assert cur.rowcount == 4
+    cur.execute("select num, data from execmany order by 1")
+    assert cur.fetchall() == records
+
+
+def test_executemany_batch_rows_returning(conn, execmany):
+    cur = conn.cursor()
+    cur.executemany(
+        "insert into execmany(num, data) values (%(n)s, %(d)s || '!') returning *",
+        [{"n": i, "d": str(i)} for i in range(5)],
+        batch_rows=2,
+        returning=True,
+    )
+    assert (
+        cur._query.query
+        == b"insert into execmany(num, data) values ($1, $2 || '!') returning *"
+    )
+    ress = list((res.fetchall() for res in cur.results()))
+    assert [[r[1:] for r in res] for res in ress] == [
+        [(0, "0!"), (1, "1!")],
+        [(2, "2!"), (3, "3!")],
+        [(4, "4!")],
+    ]
+
+
+def test_executemany_batch_rows_literals(conn, execmany):
+    cur = conn.cursor()
+    cur.executemany(
+        "insert into execmany(num, data) values (%s, 'price $1 (%%s)')",
+        [(1,), (2,), (3,)],
+        batch_rows=3,
+    )
+    cur.execute("select num, data from execmany order by 1")
+    assert cur.fetchall() == [(i, "price $1 (%s)") for i in (1, 2, 3)]
+
+
+def test_executemany_batch_rows_no_data(conn, execmany):
+    cur = conn.cursor()
+    cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)", [], batch_rows=10
+    )
+    assert cur.rowcount == 0
+
+
+@pytest.mark.parametrize("batch_rows", [None, 2])
+def test_executemany_aiter(conn, execmany, batch_rows):
+
+    def records():
+        for i in range(5):
+            yield (i, str(i))
+
+    cur = conn.cursor()
+    cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        records(),
+        batch_rows=batch_rows,
+    )
+    assert cur.rowcount == 5
+    cur.execute("select num, data from execmany order by 1")
+    assert cur.fetchall() == [(i, str(i)) for i in range(5)]
+
+
+@pytest.mark.pipeline
+def test_executemany_max_pending(conn, execmany, monkeypatch):
+    monkeypatch.setattr(psycopg._cursor_base, "EXECMANY_MAX_PENDING", 3)
+
+    def records():
+        for i in range(20):
+            assert len(conn._pipeline.result_queue) < 3
+            yield (i, str(i))
+
+    cur = conn.cursor()
+    cur.executemany("insert into execmany(num, data) values (%s, %s)", records())
+    assert cur.rowcount == 20
+    cur.execute("select count(*) from execmany")
+    assert cur.fetchone() == (20,)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "select %s, %s",
+        "insert into execmany(num, data) values (%s, %s), (1, 'x')",
+        "insert into execmany(num, data) select %s, %s",
+        "insert into execmany(num, data) values (%s, 'x') returning %s",
+    ],
+)
+def test_executemany_batch_rows_bad_query(conn, execmany, query):
+    cur = conn.cursor()
+    with pytest.raises(psycopg.ProgrammingError, match="batch_rows|INSERT"):
+        cur.executemany(query, [(10, "hello")], batch_rows=10)
+
+
+def test_executemany_batch_rows_bad(conn, execmany):
+    cur = conn.cursor()
+    query = "insert into execmany(num, data) values (%s, %s)"
+    with pytest.raises(ValueError):
+        cur.executemany(query, [(10, "hello")], batch_rows=0)
+    with pytest.raises(psycopg.ProgrammingError, match="maximum"):
+        cur.executemany(query, [(10, "hello")] * 40000, batch_rows=40000)
+    with pytest.raises(psycopg.NotSupportedError):
+        psycopg.ClientCursor(conn).executemany(query, [(10, "hello")], batch_rows=10)
+
+
+def test_compiled_not_supported(conn):
+    query = conn.compile("select %s", ["int4"])
+    ccur = psycopg.ClientCursor(conn)
+    with pytest.raises(psycopg.NotSupportedError):
+        ccur.execute(query, (1,))
+    with psycopg.ServerCursor(conn, "test") as scur:
+        with pytest.raises(psycopg.NotSupportedError):
+            scur.execute(query, (1,))
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize("fmt", PyFormat)
 @pytest.mark.parametrize("fmt_out", pq.Format)
@@ -2,6 +2,8 @@
 Tests for psycopg.Cursor that are not supposed to pass for subclasses.
 """
 
+from decimal import Decimal
+
 import pytest
 
 import psycopg
@@ -9,6 +11,12 @@ from psycopg import errors as e
 from psycopg import pq, rows
 from psycopg.adapt import PyFormat
 
+from . import _test_cursor
+from .acompat import alist
+
+execmany = _test_cursor.execmany  # avoid F811 underneath
+_execmany = _test_cursor._execmany  # needed by the execmany fixture
+
 
 async def test_default_cursor(aconn):
     cur = aconn.cursor()
@@ -63,6 +71,188 @@ async def test_query_params_executemany(aconn):
     assert cur._query.params == [b"3", b"4"]
 
 
+@pytest.mark.parametrize("binary", [False, True])
+async def test_compiled_executemany(aconn, execmany, binary):
+    query = aconn.compile(
+        "insert into execmany(num, data) values (%s, %s)",
+        ["int4", "text"],
+        binary=binary,
+    )
+    assert query.types == (23, 25)
+    cur = aconn.cursor()
+    await cur.executemany(query, [(10, "hello"), (20, "world"), (None, None)])
+    assert cur._query.types == (23, 25)
+    await cur.execute("select num, data from execmany order by 1")
+    assert await cur.fetchall() == [(10, "hello"), (20, "world"), (None, None)]
+
+
+async def test_compiled_execute(aconn):
+    query = aconn.compile("select %s, %s", [23, "numeric"])
+    cur = await aconn.execute(query, (1, Decimal("2")))
+    assert await cur.fetchone() == (1, 2)
+    await cur.execute(query, (3.0, Decimal("4.5")))
+    assert await cur.fetchone() == (3, Decimal("4.5"))
+
+
+async def test_compiled_named(aconn):
+    query = aconn.compile("select %(a)s, %(b)s, %(a)s", {"b": "text", "a": "int8"})
+    assert query.types == (20, 25)
+    cur = await aconn.execute(query, {"a": 1, "b": "x", "c": None})
+    assert await cur.fetchone() == (1, "x", 1)
+
+    with pytest.raises(psycopg.ProgrammingError, match="missing: b"):
+        await cur.execute(query, {"a": 1})
+    with pytest.raises(TypeError, match="mapping"):
+        await cur.execute(query, (1, "x"))
+
+
+async def test_compiled_no_params(aconn):
+    query = aconn.compile("select 1", [])
+    cur = await aconn.execute(query)
+    assert await cur.fetchone() == (1,)
+
+
+async def test_compiled_bad_params(aconn):
+    with pytest.raises(psycopg.ProgrammingError, match="2 placeholders but 1 types"):
+        aconn.compile("select %s, %s", ["int4"])
+    with pytest.raises(psycopg.ProgrammingError, match="placeholders a"):
+        aconn.compile("select %(a)s", {"b": "int4"})
+    with pytest.raises(TypeError, match="sequence"):
+        aconn.compile("select %s", {"a": "int4"})
+
+    query = aconn.compile("select %s, %s", ["int4", "text"])
+    cur = aconn.cursor()
+    with pytest.raises(psycopg.ProgrammingError, match="2 placeholders but 3"):
+        await cur.execute(query, (1, "a", 3))
+    with pytest.raises(psycopg.ProgrammingError, match="no parameters"):
+        await cur.execute(query)
+    with pytest.raises(TypeError, match="sequence"):
+        await cur.execute(query, {"a": 1})
+
+
+@pytest.mark.parametrize("batch_rows", [1, 2, 3, 10])
+async def test_executemany_batch_rows(aconn, execmany, batch_rows):
+    cur = aconn.cursor()
+    records = [(10, "hello"), (20, "world"), (30, None), (40, "x")]
+    await cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        records,
+        batch_rows=batch_rows,
+    )
+    assert cur.rowcount == 4
+    await cur.execute("select num, data from execmany order by 1")
+    assert await cur.fetchall() == records
+
+
+async def test_executemany_batch_rows_returning(aconn, execmany):
+    cur = aconn.cursor()
+    await cur.executemany(
+        "insert into execmany(num, data) values (%(n)s, %(d)s || '!') returning *",
+        [{"n": i, "d": str(i)} for i in range(5)],
+        batch_rows=2,
+        returning=True,
+    )
+    assert cur._query.query == (
+        b"insert into execmany(num, data) values ($1, $2 || '!') returning *"
+    )
+    ress = await alist(await res.fetchall() async for res in cur.results())
+    assert [[r[1:] for r in res] for res in ress] == [
+        [(0, "0!"), (1, "1!")],
+        [(2, "2!"), (3, "3!")],
+        [(4, "4!")],
+    ]
+
+
+async def test_executemany_batch_rows_literals(aconn, execmany):
+    cur = aconn.cursor()
+    await cur.executemany(
+        "insert into execmany(num, data) values (%s, 'price $1 (%%s)')",
+        [(1,), (2,), (3,)],
+        batch_rows=3,
+    )
+    await cur.execute("select num, data from execmany order by 1")
+    assert await cur.fetchall() == [(i, "price $1 (%s)") for i in (1, 2, 3)]
+
+
+async def test_executemany_batch_rows_no_data(aconn, execmany):
+    cur = aconn.cursor()
+    await cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)", [], batch_rows=10
+    )
+    assert cur.rowcount == 0
+
+
+@pytest.mark.parametrize("batch_rows", [None, 2])
+async def test_executemany_aiter(aconn, execmany, batch_rows):
+    async def records():
+        for i in range(5):
+            yield (i, str(i))
+
+    cur = aconn.cursor()
+    await cur.executemany(
+        "insert into execmany(num, data) values (%s, %s)",
+        records(),
+        batch_rows=batch_rows,
+    )
+    assert cur.rowcount == 5
+    await cur.execute("select num, data from execmany order by 1")
+    assert await cur.fetchall() == [(i, str(i)) for i in range(5)]
+
+
+@pytest.mark.pipeline
+async def test_executemany_max_pending(aconn, execmany, monkeypatch):
+    monkeypatch.setattr(psycopg._cursor_base, "EXECMANY_MAX_PENDING", 3)
+
+    async def records():
+        for i in range(20):
+            assert len(aconn._pipeline.result_queue) < 3
+            yield (i, str(i))
+
+    cur = aconn.cursor()
+    await cur.executemany("insert into execmany(num, data) values (%s, %s)", records())
+    assert cur.rowcount == 20
+    await cur.execute("select count(*) from execmany")
+    assert await cur.fetchone() == (20,)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "select %s, %s",
+        "insert into execmany(num, data) values (%s, %s), (1, 'x')",
+        "insert into execmany(num, data) select %s, %s",
+        "insert into execmany(num, data) values (%s, 'x') returning %s",
+    ],
+)
+async def test_executemany_batch_rows_bad_query(aconn, execmany, query):
+    cur = aconn.cursor()
+    with pytest.raises(psycopg.ProgrammingError, match="batch_rows|INSERT"):
+        await cur.executemany(query, [(10, "hello")], batch_rows=10)
+
+
+async def test_executemany_batch_rows_bad(aconn, execmany):
+    cur = aconn.cursor()
+    query = "insert into execmany(num, data) values (%s, %s)"
+    with pytest.raises(ValueError):
+        await cur.executemany(query, [(10, "hello")], batch_rows=0)
+    with pytest.raises(psycopg.ProgrammingError, match="maximum"):
+        await cur.executemany(query, [(10, "hello")] * 40000, batch_rows=40000)
+    with pytest.raises(psycopg.NotSupportedError):
+        await psycopg.AsyncClientCursor(aconn).executemany(
+            query, [(10, "hello")], batch_rows=10
+        )
+
+
+async def test_compiled_not_supported(aconn):
+    query = aconn.compile("select %s", ["int4"])
+    ccur = psycopg.AsyncClientCursor(aconn)
+    with pytest.raises(psycopg.NotSupportedError):
+        await ccur.execute(query, (1,))
+    async with psycopg.AsyncServerCursor(aconn, "test") as scur:
+        with pytest.raises(psycopg.NotSupportedError):
+            await scur.execute(query, (1,))
+
+
 @pytest.mark.slow
 @pytest.mark.parametrize("fmt", PyFormat)
 @pytest.mark.parametrize("fmt_out", pq.Format)
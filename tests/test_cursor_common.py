@@ -7,7 +7,6 @@ Tests common to psycopg.Cursor and its subclasses.
 
 import weakref
 import datetime as dt
-from typing import Any
 from contextlib import closing
 
 import pytest
@@ -175,21 +174,12 @@ def test_next(conn):
 def test_query_parse_cache_size(conn):
     cur = conn.cursor()
     cls = type(cur)
-
-    # Warning: testing internal structures. Test might need refactoring with the code.
-    cache: Any
-    if cls is psycopg.Cursor:
-        cache = psycopg._queries._query2pg
-    elif cls is psycopg.ClientCursor:
-        cache = psycopg._queries._query2pg_client
-    elif cls is psycopg.RawCursor:
+    if cls is psycopg.RawCursor:
         pytest.skip("RawCursor has no query parse cache")
-    else:
-        assert False, cls
 
-    cache.cache_clear()
-    ci = cache.cache_info()
-    h0, m0 = (ci.hits, ci.misses)
+    cache = psycopg.query_cache
+    cache.clear()
+    h0, m0 = (cache.hits, cache.misses)
     tests = [
         (f"select 1 -- {'x' * 3500}", (), h0, m0 + 1),
         (f"select 1 -- {'x' * 3500}", (), h0 + 1, m0 + 1),
@@ -203,9 +193,8 @@ def test_query_parse_cache_size(conn):
     for i, (query, params, hits, misses) in enumerate(tests):
         pq = cur._query_cls(psycopg.adapt.Transformer())
         pq.convert(query, params)
-        ci = cache.cache_info()
-        assert ci.hits == hits, f"at {i}"
-        assert ci.misses == misses, f"at {i}"
+        assert cache.hits == hits, f"at {i}"
+        assert cache.misses == misses, f"at {i}"
 
 
 def test_execute_many_results(conn):
@@ -770,6 +759,44 @@ def test_stream_chunked_row_factory(conn):
         assert [c.name for c in cur.description] == ["a"]
 
 
+def test_stream_chunks(conn):
+    cur = conn.cursor()
+    chunks = list(cur.stream_chunks(ph(cur, "select generate_series(1, %s) as a"), [3]))
+    assert chunks == [[(1,)], [(2,)], [(3,)]]
+
+
+def test_stream_chunks_no_row(conn):
+    cur = conn.cursor()
+    assert list(cur.stream_chunks("select generate_series(2, 1)")) == []
+
+
+@pytest.mark.libpq("< 17")
+def test_stream_chunks_not_supported(conn):
+    cur = conn.cursor()
+    with pytest.raises(psycopg.NotSupportedError):
+        next(cur.stream_chunks("select generate_series(1, 4)", size=2))
+
+
+@pytest.mark.libpq(">= 17")
+def test_stream_chunks_size(conn):
+    cur = conn.cursor(row_factory=rows.scalar_row)
+    chunks = list(cur.stream_chunks("select generate_series(1, 5) as a", size=2))
+    assert chunks == [[1, 2], [3, 4], [5]]
+    assert [c.name for c in cur.description] == ["a"]
+
+
+def test_stream_chunks_error_python_to_consume(conn):
+    cur = conn.cursor()
+    with pytest.raises(ZeroDivisionError):
+        with closing(cur.stream_chunks("select generate_series(1, 10000)")) as gen:
+            for chunk in gen:
+                1 / 0
+    assert conn.info.transaction_status in (
+        pq.TransactionStatus.INTRANS,
+        pq.TransactionStatus.INERROR,
+    )
+
+
 @pytest.mark.crdb_skip("no col query")
 def test_stream_no_col(conn):
     cur = conn.cursor()
@@ -4,7 +4,6 @@ Tests common to psycopg.AsyncCursor and its subclasses.
 
 import weakref
 import datetime as dt
-from typing import Any
 from contextlib import aclosing
 
 import pytest
@@ -173,21 +172,12 @@ async def test_next(aconn):
 async def test_query_parse_cache_size(aconn):
     cur = aconn.cursor()
     cls = type(cur)
-
-    # Warning: testing internal structures. Test might need refactoring with the code.
-    cache: Any
-    if cls is psycopg.AsyncCursor:
-        cache = psycopg._queries._query2pg
-    elif cls is psycopg.AsyncClientCursor:
-        cache = psycopg._queries._query2pg_client
-    elif cls is psycopg.AsyncRawCursor:
+    if cls is psycopg.AsyncRawCursor:
         pytest.skip("RawCursor has no query parse cache")
-    else:
-        assert False, cls
 
-    cache.cache_clear()
-    ci = cache.cache_info()
-    h0, m0 = ci.hits, ci.misses
+    cache = psycopg.query_cache
+    cache.clear()
+    h0, m0 = cache.hits, cache.misses
     tests = [
         (f"select 1 -- {'x' * 3500}", (), h0, m0 + 1),
         (f"select 1 -- {'x' * 3500}", (), h0 + 1, m0 + 1),
@@ -201,9 +191,8 @@ async def test_query_parse_cache_size(aconn):
     for i, (query, params, hits, misses) in enumerate(tests):
         pq = cur._query_cls(psycopg.adapt.Transformer())
         pq.convert(query, params)
-        ci = cache.cache_info()
-        assert ci.hits == hits, f"at {i}"
-        assert ci.misses == misses, f"at {i}"
+        assert cache.hits == hits, f"at {i}"
+        assert cache.misses == misses, f"at {i}"
 
 
 async def test_execute_many_results(aconn):
@@ -773,6 +762,48 @@ async def test_stream_chunked_row_factory(aconn):
         assert [c.name for c in cur.description] == ["a"]
 
 
+async def test_stream_chunks(aconn):
+    cur = aconn.cursor()
+    chunks = await alist(
+        cur.stream_chunks(ph(cur, "select generate_series(1, %s) as a"), [3])
+    )
+    assert chunks == [[(1,)], [(2,)], [(3,)]]
+
+
+async def test_stream_chunks_no_row(aconn):
+    cur = aconn.cursor()
+    assert await alist(cur.stream_chunks("select generate_series(2, 1)")) == []
+
+
+@pytest.mark.libpq("< 17")
+async def test_stream_chunks_not_supported(aconn):
+    cur = aconn.cursor()
+    with pytest.raises(psycopg.NotSupportedError):
+        await anext(cur.stream_chunks("select generate_series(1, 4)", size=2))
+
+
+@pytest.mark.libpq(">= 17")
+async def test_stream_chunks_size(aconn):
+    cur = aconn.cursor(row_factory=rows.scalar_row)
+    chunks = await alist(cur.stream_chunks("select generate_series(1, 5) as a", size=2))
+    assert chunks == [[1, 2], [3, 4], [5]]
+    assert [c.name for c in cur.description] == ["a"]
+
+
+async def test_stream_chunks_error_python_to_consume(aconn):
+    cur = aconn.cursor()
+    with pytest.raises(ZeroDivisionError):
+        async with aclosing(
+            cur.stream_chunks("select generate_series(1, 10000)")
+        ) as gen:
+            async for chunk in gen:
+                1 / 0
+    assert aconn.info.transaction_status in (
+        pq.TransactionStatus.INTRANS,
+        pq.TransactionStatus.INERROR,
+    )
+
+
 @pytest.mark.crdb_skip("no col query")
 async def test_stream_no_col(aconn):
     cur = aconn.cursor()
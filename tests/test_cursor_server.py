@@ -8,6 +8,7 @@ import psycopg
 from psycopg import errors as e
 from psycopg import pq, rows
 
+from .acompat import is_alive, sleep
 from ._test_cursor import ph
 
 pytestmark = pytest.mark.crdb_skip("server-side cursor")
@@ -453,6 +454,193 @@ def test_itersize(conn, commands):
             assert "fetch forward 2" in cmd.lower()
 
 
+def test_itersize_bytes_shrink(conn, commands):
+    with conn.cursor("foo") as cur:
+        assert cur.itersize_bytes is None
+        cur.itersize_bytes = 10000
+        cur.execute("select repeat('x', 1000) from generate_series(1, 150)")
+        commands.popall()
+
+        recs = list(cur)
+        assert len(recs) == 150
+        assert cur.itersize == 10
+
+        cmds = [cmd.lower() for cmd in commands.popall()]
+        assert "fetch forward 100" in cmds[0]
+        assert len(cmds) == 7
+        for cmd in cmds[1:]:
+            assert "fetch forward 10" in cmd
+
+
+def test_itersize_bytes_grow(conn, commands):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.itersize_bytes = 1000
+        cur.execute("select 1 from generate_series(1, 1000)")
+        commands.popall()
+
+        assert list(cur) == [(1,)] * 1000
+        assert cur.itersize == 1000
+
+        cmds = [cmd.lower() for cmd in commands.popall()]
+        sizes = [2, 8, 32, 128, 512, 1000]
+        assert len(cmds) == len(sizes)
+        for cmd, size in zip(cmds, sizes):
+            assert f"fetch forward {size} " in cmd
+
+
+def test_itersize_bytes_prefetch(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.itersize_bytes = 100
+        cur.prefetch = 2
+        cur.execute("select generate_series(1, 1000)")
+        assert list(cur) == [(i,) for i in range(1, 1001)]
+        assert cur.itersize < 100
+
+
+def test_iter_pages(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (5,))
+        recs = list(cur)
+    assert recs == [(i,) for i in range(1, 6)]
+
+
+@pytest.mark.parametrize("nrecs", [0, 5, 6, 7])
+@pytest.mark.parametrize("prefetch", [1, 3])
+def test_prefetch(conn, commands, nrecs, prefetch):
+    with conn.cursor("foo") as cur:
+        assert cur.prefetch == 0
+        cur.itersize = 2
+        cur.prefetch = prefetch
+        cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (nrecs,))
+        commands.popall()
+
+        recs = []
+        for rec in cur:
+            assert cur.rownumber == rec[0]
+            recs.append(rec)
+        assert recs == [(i,) for i in range(1, nrecs + 1)]
+        assert cur._prefetcher is None
+
+        cmds = commands.popall()
+        assert len(cmds) == nrecs // 2 + 1
+        for cmd in cmds:
+            assert "fetch forward 2" in cmd.lower()
+
+
+def test_prefetch_fetch(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.prefetch = 2
+        cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (20,))
+        assert next(cur) == (1,)
+        assert next(cur) == (2,)
+        # Records prefetched and not consumed are discarded
+        rec = cur.fetchone()
+        assert rec is not None and rec[0] > 2
+        assert cur._prefetcher is None
+        assert cur.fetchone() == (rec[0] + 1,)
+
+        cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (3,))
+        assert list(cur) == [(1,), (2,), (3,)]
+
+
+def test_prefetch_state(conn):
+    # The worker fetching in advance doesn't change the cursor state.
+    with conn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.itersize_bytes = 100
+        cur.prefetch = 3
+        cur.execute("select generate_series(1, 100) as bar")
+        assert next(cur) == (1,)
+        res = cur.pgresult
+        itersize = cur.itersize
+        for i in range(30):
+            if cur._prefetch_queue.full():
+                break
+            sleep(0.1)
+        else:
+            pytest.fail("the prefetch worker didn't fill the queue")
+
+        assert cur.pgresult is res
+        assert cur.itersize == itersize
+        assert cur.rownumber == 1
+        assert next(cur) == (2,)
+        assert cur.pgresult is res
+
+        # The state is updated when a new page is consumed.
+        assert next(cur) == (3,)
+        assert cur.pgresult is not res
+        assert cur.pgresult.get_value(0, 0) == b"3"
+        assert cur.itersize > itersize
+        assert cur.description[0].name == "bar"
+
+
+def test_prefetch_close(conn):
+    cur = conn.cursor("foo")
+    cur.itersize = 2
+    cur.prefetch = 2
+    cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (20,))
+    assert next(cur) == (1,)
+    cur.close()
+    assert cur.closed
+    assert cur._prefetcher is None
+    cur = conn.execute("select 1")
+    assert cur.fetchone() == (1,)
+
+
+def test_prefetch_error(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.prefetch = 2
+        cur.execute("select 1 / (3 - x) from generate_series(1, 5) as x")
+        assert next(cur) == (0,)
+        with pytest.raises(e.DivisionByZero):
+            list(cur)
+        assert cur._prefetcher is None
+
+    conn.rollback()
+    cur = conn.execute("select 1")
+    assert cur.fetchone() == (1,)
+
+
+def test_prefetch_commit(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.prefetch = 2
+        cur.execute("select generate_series(1, 20) as bar")
+        assert next(cur) == (1,)
+        conn.commit()
+        # The cursor is closed at the end of the transaction: the pages
+        # fetched before the commit are returned, then the next fetch fails.
+        with pytest.raises(e.InvalidCursorName):
+            list(cur)
+        assert cur._prefetcher is None
+
+    conn.rollback()
+    cur = conn.execute("select 1")
+    assert cur.fetchone() == (1,)
+
+
+def test_prefetch_deleted(conn, recwarn, gc_collect):
+    cur = conn.cursor("foo")
+    cur.itersize = 2
+    cur.prefetch = 1
+    cur.execute("select generate_series(1, 20) as bar")
+    assert next(cur) == (1,)
+    worker = cur._prefetcher
+    del cur
+    gc_collect()
+    for i in range(30):
+        if not is_alive(worker):
+            break
+        sleep(0.1)
+    else:
+        pytest.fail("the prefetch worker didn't terminate")
+
+
 def test_next(conn):
     with conn.cursor() as cur:
         cur.execute("select 1")
@@ -5,7 +5,7 @@ import psycopg
 from psycopg import errors as e
 from psycopg import pq, rows
 
-from .acompat import alist
+from .acompat import alist, asleep, is_alive
 from ._test_cursor import ph
 
 pytestmark = pytest.mark.crdb_skip("server-side cursor")
@@ -459,6 +459,193 @@ async def test_itersize(aconn, acommands):
             assert "fetch forward 2" in cmd.lower()
 
 
+async def test_itersize_bytes_shrink(aconn, acommands):
+    async with aconn.cursor("foo") as cur:
+        assert cur.itersize_bytes is None
+        cur.itersize_bytes = 10_000
+        await cur.execute("select repeat('x', 1000) from generate_series(1, 150)")
+        acommands.popall()
+
+        recs = await alist(cur)
+        assert len(recs) == 150
+        assert cur.itersize == 10
+
+        cmds = [cmd.lower() for cmd in acommands.popall()]
+        assert "fetch forward 100" in cmds[0]
+        assert len(cmds) == 7
+        for cmd in cmds[1:]:
+            assert "fetch forward 10" in cmd
+
+
+async def test_itersize_bytes_grow(aconn, acommands):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.itersize_bytes = 1000
+        await cur.execute("select 1 from generate_series(1, 1000)")
+        acommands.popall()
+
+        assert await alist(cur) == [(1,)] * 1000
+        assert cur.itersize == 1000
+
+        cmds = [cmd.lower() for cmd in acommands.popall()]
+        sizes = [2, 8, 32, 128, 512, 1000]
+        assert len(cmds) == len(sizes)
+        for cmd, size in zip(cmds, sizes):
+            assert f"fetch forward {size} " in cmd
+
+
+async def test_itersize_bytes_prefetch(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.itersize_bytes = 100
+        cur.prefetch = 2
+        await cur.execute("select generate_series(1, 1000)")
+        assert await alist(cur) == [(i,) for i in range(1, 1001)]
+        assert cur.itersize < 100
+
+
+async def test_iter_pages(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 2
+        await cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (5,))
+        recs = await alist(cur)
+    assert recs == [(i,) for i in range(1, 6)]
+
+
+@pytest.mark.parametrize("nrecs", [0, 5, 6, 7])
+@pytest.mark.parametrize("prefetch", [1, 3])
+async def test_prefetch(aconn, acommands, nrecs, prefetch):
+    async with aconn.cursor("foo") as cur:
+        assert cur.prefetch == 0
+        cur.itersize = 2
+        cur.prefetch = prefetch
+        await cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (nrecs,))
+        acommands.popall()
+
+        recs = []
+        async for rec in cur:
+            assert cur.rownumber == rec[0]
+            recs.append(rec)
+        assert recs == [(i,) for i in range(1, nrecs + 1)]
+        assert cur._prefetcher is None
+
+        cmds = acommands.popall()
+        assert len(cmds) == nrecs // 2 + 1
+        for cmd in cmds:
+            assert "fetch forward 2" in cmd.lower()
+
+
+async def test_prefetch_fetch(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.prefetch = 2
+        await cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (20,))
+        assert await anext(cur) == (1,)
+        assert await anext(cur) == (2,)
+        # Records prefetched and not consumed are discarded
+        rec = await cur.fetchone()
+        assert rec is not None and rec[0] > 2
+        assert cur._prefetcher is None
+        assert await cur.fetchone() == (rec[0] + 1,)
+
+        await cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (3,))
+        assert await alist(cur) == [(1,), (2,), (3,)]
+
+
+async def test_prefetch_state(aconn):
+    # The worker fetching in advance doesn't change the cursor state.
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.itersize_bytes = 100
+        cur.prefetch = 3
+        await cur.execute("select generate_series(1, 100) as bar")
+        assert await anext(cur) == (1,)
+        res = cur.pgresult
+        itersize = cur.itersize
+        for i in range(30):
+            if cur._prefetch_queue.full():
+                break
+            await asleep(0.1)
+        else:
+            pytest.fail("the prefetch worker didn't fill the queue")
+
+        assert cur.pgresult is res
+        assert cur.itersize == itersize
+        assert cur.rownumber == 1
+        assert await anext(cur) == (2,)
+        assert cur.pgresult is res
+
+        # The state is updated when a new page is consumed.
+        assert await anext(cur) == (3,)
+        assert cur.pgresult is not res
+        assert cur.pgresult.get_value(0, 0) == b"3"
+        assert cur.itersize > itersize
+        assert cur.description[0].name == "bar"
+
+
+async def test_prefetch_close(aconn):
+    cur = aconn.cursor("foo")
+    cur.itersize = 2
+    cur.prefetch = 2
+    await cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (20,))
+    assert await anext(cur) == (1,)
+    await cur.close()
+    assert cur.closed
+    assert cur._prefetcher is None
+    cur = await aconn.execute("select 1")
+    assert await cur.fetchone() == (1,)
+
+
+async def test_prefetch_error(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.prefetch = 2
+        await cur.execute("select 1 / (3 - x) from generate_series(1, 5) as x")
+        assert await anext(cur) == (0,)
+        with pytest.raises(e.DivisionByZero):
+            await alist(cur)
+        assert cur._prefetcher is None
+
+    await aconn.rollback()
+    cur = await aconn.execute("select 1")
+    assert await cur.fetchone() == (1,)
+
+
+async def test_prefetch_commit(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.prefetch = 2
+        await cur.execute("select generate_series(1, 20) as bar")
+        assert await anext(cur) == (1,)
+        await aconn.commit()
+        # The cursor is closed at the end of the transaction: the pages
+        # fetched before the commit are returned, then the next fetch fails.
+        with pytest.raises(e.InvalidCursorName):
+            await alist(cur)
+        assert cur._prefetcher is None
+
+    await aconn.rollback()
+    cur = await aconn.execute("select 1")
+    assert await cur.fetchone() == (1,)
+
+
+async def test_prefetch_deleted(aconn, recwarn, gc_collect):
+    cur = aconn.cursor("foo")
+    cur.itersize = 2
+    cur.prefetch = 1
+    await cur.execute("select generate_series(1, 20) as bar")
+    assert await anext(cur) == (1,)
+    worker = cur._prefetcher
+    del cur
+    gc_collect()
+    for i in range(30):
+        if not is_alive(worker):
+            break
+        await asleep(0.1)
+    else:
+        pytest.fail("the prefetch worker didn't terminate")
+
+
 async def test_next(aconn):
     async with aconn.cursor() as cur:
         await cur.execute("select 1")
@@ -14,7 +14,7 @@ import psycopg
 from psycopg import errors as e
 from psycopg import pq
 
-from .acompat import is_async
+from .acompat import gather, is_async, skip_sync, spawn
 
 pytestmark = [
     pytest.mark.pipeline,
@@ -217,7 +217,249 @@ def test_sync_syncs_results(conn):
         assert cur.statusmessage == "SELECT 1"
 
 
+def test_max_pending(conn):
+    with conn.pipeline(max_pending=3) as p:
+        assert p.max_pending == 3
+        curs = []
+        for i in range(10):
+            curs.append(conn.execute("select %s::int", [i]))
+            assert len(p.result_queue) < 3
+
+    assert [cur.fetchone()[0] for cur in curs] == list(range(10))
+
+
+def test_max_pending_results_available(conn):
+    with conn.pipeline(max_pending=2):
+        cur1 = conn.execute("select 1")
+        assert cur1.statusmessage is None
+        cur2 = conn.execute("select 2")
+        assert cur1.statusmessage == "SELECT 1"
+        assert cur2.statusmessage == "SELECT 1"
+        assert cur2.fetchone() == (2,)
+
+
+def test_max_pending_nested(conn):
+    with conn.pipeline() as p:
+        assert p.max_pending is None
+        with conn.pipeline(max_pending=10):
+            assert p.max_pending == 10
+            with conn.pipeline():
+                assert p.max_pending == 10
+            assert p.max_pending == 10
+        assert p.max_pending is None
+
+
+@pytest.mark.parametrize("value", [0, -1])
+def test_bad_max_pending(conn, value):
+    with pytest.raises(ValueError):
+        with conn.pipeline(max_pending=value):
+            pass
+    assert conn._pipeline is None
+
+
 @pytest.mark.flakey("assert rarely fails randomly in CI blocking release")
+def test_submit(conn):
+    with conn.pipeline() as p:
+        res = [p.submit("select %s::int * 2", [i]) for i in range(5)]
+        assert not res[0].done()
+        assert res[0].rowcount == -1
+        assert res[0].statusmessage is None
+        assert res[0].pgresult is None
+
+    assert all((r.done() for r in res))
+    assert [r.result() for r in res] == [[(i * 2,)] for i in range(5)]
+    assert res[0].rowcount == 1
+    assert res[0].statusmessage == "SELECT 1"
+    assert "[done]" in repr(res[0])
+
+
+def test_submit_fetch(conn):
+    with conn.pipeline() as p:
+        res = p.submit("select generate_series(1, %s)", [3])
+        assert "[pending]" in repr(res)
+        assert res.result() == [(1,), (2,), (3,)]
+        assert res.done()
+
+
+def test_submit_result_threads(conn):
+    with conn.pipeline() as p:
+        res = [p.submit("select %s::int, %s::text", [i, str(i)]) for i in range(20)]
+        p.sync()
+
+    def worker(r, i):
+        assert r.result() == [(i, str(i))]
+
+    gather(*[spawn(worker, (r, i)) for i, r in enumerate(res)])
+    # The results don't use the Transformer shared by the pipeline.
+    assert p._get_tx().pgresult is None
+
+
+def test_submit_with_cursor(conn):
+    with conn.pipeline() as p:
+        res1 = p.submit("select 1")
+        cur = conn.execute("select 2")
+        res2 = p.submit("select 3", binary=True)
+
+    assert res1.result() == [(1,)]
+    assert cur.fetchone() == (2,)
+    assert res2.result() == [(3,)]
+    assert res2.pgresult and res2.pgresult.fformat(0) == pq.Format.BINARY
+
+
+def test_submit_command(conn):
+    conn.set_autocommit(True)
+    with conn.pipeline() as p:
+        p.submit("create temp table tsubmit (x int)")
+        res = p.submit("insert into tsubmit values (1), (2)")
+
+    assert res.rowcount == 2
+    assert res.statusmessage == "INSERT 0 2"
+    with pytest.raises(psycopg.ProgrammingError, match="didn't produce records"):
+        res.result()
+
+
+def test_submit_prepare(conn):
+    with conn.pipeline() as p:
+        for i in range(3):
+            res = p.submit("select %s::int", [i], prepare=True)
+        cq = conn.compile("select %s + %s", ["int4", "int4"])
+        res2 = p.submit(cq, [10, 20])
+        res3 = p.submit("select %s::text", [30])
+
+    assert res.result() == [(2,)]
+    assert res2.result() == [(30,)]
+    assert res3.result() == [("30",)]
+    assert conn._prepared.stats().prepares == 1
+
+
+@pipeline_aborted
+def test_submit_error(conn):
+    conn.set_autocommit(True)
+    with conn.pipeline() as p:
+        res1 = p.submit("select 1")
+        with pytest.raises(e.UndefinedTable):
+            p.submit("select * from doesnotexist").result()
+        res2 = p.submit("select 'aborted'")
+        with pytest.raises(e.PipelineAborted):
+            res2.result()
+        assert "[error]" in repr(res2)
+        # Sync restore the connection in usable state.
+        p.sync()
+        res3 = p.submit("select 3")
+
+    assert res1.result() == [(1,)]
+    with pytest.raises(e.PipelineAborted):
+        res2.result()
+    assert res3.result() == [(3,)]
+
+
+def test_submit_outside_block(conn):
+    with conn.pipeline() as p:
+        pass
+    with pytest.raises(psycopg.ProgrammingError):
+        p.submit("select 1")
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Record the number of queries sent in each automatic pipeline."""
+    rv = []
+    orig = psycopg.Pipeline._batch_gen
+
+    def _batch_gen(self, sends):
+        rv.append(len(sends))
+        return orig(self, sends)
+
+    monkeypatch.setattr(psycopg.Pipeline, "_batch_gen", _batch_gen)
+    return rv
+
+
+@skip_sync
+def test_auto_pipeline(conn, batches):
+    conn.set_autocommit(True)
+    conn.auto_pipeline = True
+    assert conn.auto_pipeline
+
+    def worker(i):
+        cur = conn.execute("select %s::int * 2", [i])
+        return cur.fetchone()
+
+    assert gather(*[worker(i) for i in range(20)]) == [(i * 2,) for i in range(20)]
+    assert batches == [20]
+    assert conn._pipeline is None
+    assert conn.pgconn.pipeline_status == pq.PipelineStatus.OFF
+
+    assert worker(10) == (20,)
+    assert batches == [20, 1]
+
+
+@skip_sync
+def test_auto_pipeline_error(conn, batches):
+    conn.set_autocommit(True)
+    conn.auto_pipeline = True
+
+    def worker(i):
+        cur = conn.execute("select 10 / %s", [i])
+        return cur.fetchone()
+
+    rv = gather(*[worker(i) for i in range(-2, 3)], return_exceptions=True)
+    assert batches == [5]
+    assert rv[:2] == [(-5,), (-10,)]
+    assert isinstance(rv[2], e.DivisionByZero)
+    assert rv[3:] == [(10,), (5,)]
+
+
+@skip_sync
+def test_auto_pipeline_bad_params(conn, batches):
+    conn.set_autocommit(True)
+    conn.auto_pipeline = True
+
+    def worker(i):
+        cur = conn.execute("select %s::int", i)
+        return cur.fetchone()
+
+    rv = gather(worker([1]), worker(2), worker([3]), return_exceptions=True)
+    assert rv[0] == (1,)
+    assert isinstance(rv[1], TypeError)
+    assert rv[2] == (3,)
+
+
+@skip_sync
+def test_auto_pipeline_transaction(conn, batches):
+    conn.auto_pipeline = True
+    conn.execute("create temp table tauto (id int)")
+    gather(*[conn.execute("insert into tauto values (%s)", [i]) for i in range(10)])
+    assert conn.info.transaction_status == pq.TransactionStatus.INTRANS
+    conn.rollback()
+    with pytest.raises(e.UndefinedTable):
+        conn.execute("select * from tauto")
+
+
+@skip_sync
+def test_auto_pipeline_prepare(conn, batches):
+    conn.set_autocommit(True)
+    conn.auto_pipeline = True
+    conn.prepare_threshold = 0
+
+    def worker(i):
+        cur = conn.execute("select %s::int", [i])
+        return cur.fetchone()
+
+    for j in range(3):
+        rv = gather(*[worker(i) for i in range(5)])
+        assert rv == [(i,) for i in range(5)]
+    assert conn.prepared_stats().prepares == 1
+
+
+@skip_sync
+def test_auto_pipeline_in_pipeline(conn, batches):
+    conn.auto_pipeline = True
+    with conn.pipeline():
+        cur = conn.execute("select 1")
+    assert cur.fetchone() == (1,)
+    assert not batches
+
+
 def test_sync_syncs_errors(conn):
     conn.set_autocommit(True)
     with conn.pipeline() as p:
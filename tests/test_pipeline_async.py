@@ -11,7 +11,7 @@ import psycopg
 from psycopg import errors as e
 from psycopg import pq
 
-from .acompat import is_async
+from .acompat import gather, is_async, skip_sync, spawn
 
 pytestmark = [
     pytest.mark.pipeline,
@@ -214,7 +214,258 @@ async def test_sync_syncs_results(aconn):
         assert cur.statusmessage == "SELECT 1"
 
 
+async def test_max_pending(aconn):
+    async with aconn.pipeline(max_pending=3) as p:
+        assert p.max_pending == 3
+        curs = []
+        for i in range(10):
+            curs.append(await aconn.execute("select %s::int", [i]))
+            assert len(p.result_queue) < 3
+
+    assert [(await cur.fetchone())[0] for cur in curs] == list(range(10))
+
+
+async def test_max_pending_results_available(aconn):
+    async with aconn.pipeline(max_pending=2):
+        cur1 = await aconn.execute("select 1")
+        assert cur1.statusmessage is None
+        cur2 = await aconn.execute("select 2")
+        assert cur1.statusmessage == "SELECT 1"
+        assert cur2.statusmessage == "SELECT 1"
+        assert await cur2.fetchone() == (2,)
+
+
+async def test_max_pending_nested(aconn):
+    async with aconn.pipeline() as p:
+        assert p.max_pending is None
+        async with aconn.pipeline(max_pending=10):
+            assert p.max_pending == 10
+            async with aconn.pipeline():
+                assert p.max_pending == 10
+            assert p.max_pending == 10
+        assert p.max_pending is None
+
+
+@pytest.mark.parametrize("value", [0, -1])
+async def test_bad_max_pending(aconn, value):
+    with pytest.raises(ValueError):
+        async with aconn.pipeline(max_pending=value):
+            pass
+    assert aconn._pipeline is None
+
+
 @pytest.mark.flakey("assert rarely fails randomly in CI blocking release")
+async def test_submit(aconn):
+    async with aconn.pipeline() as p:
+        res = [await p.submit("select %s::int * 2", [i]) for i in range(5)]
+        assert not res[0].done()
+        assert res[0].rowcount == -1
+        assert res[0].statusmessage is None
+        assert res[0].pgresult is None
+
+    assert all(r.done() for r in res)
+    assert [await r.result() for r in res] == [[(i * 2,)] for i in range(5)]
+    assert res[0].rowcount == 1
+    assert res[0].statusmessage == "SELECT 1"
+    assert "[done]" in repr(res[0])
+
+
+async def test_submit_fetch(aconn):
+    async with aconn.pipeline() as p:
+        res = await p.submit("select generate_series(1, %s)", [3])
+        assert "[pending]" in repr(res)
+        assert await res.result() == [(1,), (2,), (3,)]
+        assert res.done()
+        if is_async(aconn):
+            res = await p.submit("select %s::text", ["foo"])
+            assert await res == [("foo",)]
+
+
+async def test_submit_result_threads(aconn):
+    async with aconn.pipeline() as p:
+        res = [
+            await p.submit("select %s::int, %s::text", [i, str(i)]) for i in range(20)
+        ]
+        await p.sync()
+
+    async def worker(r, i):
+        assert await r.result() == [(i, str(i))]
+
+    await gather(*[spawn(worker, (r, i)) for i, r in enumerate(res)])
+    # The results don't use the Transformer shared by the pipeline.
+    assert p._get_tx().pgresult is None
+
+
+async def test_submit_with_cursor(aconn):
+    async with aconn.pipeline() as p:
+        res1 = await p.submit("select 1")
+        cur = await aconn.execute("select 2")
+        res2 = await p.submit("select 3", binary=True)
+
+    assert await res1.result() == [(1,)]
+    assert await cur.fetchone() == (2,)
+    assert await res2.result() == [(3,)]
+    assert res2.pgresult and res2.pgresult.fformat(0) == pq.Format.BINARY
+
+
+async def test_submit_command(aconn):
+    await aconn.set_autocommit(True)
+    async with aconn.pipeline() as p:
+        await p.submit("create temp table tsubmit (x int)")
+        res = await p.submit("insert into tsubmit values (1), (2)")
+
+    assert res.rowcount == 2
+    assert res.statusmessage == "INSERT 0 2"
+    with pytest.raises(psycopg.ProgrammingError, match="didn't produce records"):
+        await res.result()
+
+
+async def test_submit_prepare(aconn):
+    async with aconn.pipeline() as p:
+        for i in range(3):
+            res = await p.submit("select %s::int", [i], prepare=True)
+        cq = aconn.compile("select %s + %s", ["int4", "int4"])
+        res2 = await p.submit(cq, [10, 20])
+        res3 = await p.submit("select %s::text", [30])
+
+    assert await res.result() == [(2,)]
+    assert await res2.result() == [(30,)]
+    assert await res3.result() == [("30",)]
+    assert aconn._prepared.stats().prepares == 1
+
+
+@pipeline_aborted
+async def test_submit_error(aconn):
+    await aconn.set_autocommit(True)
+    async with aconn.pipeline() as p:
+        res1 = await p.submit("select 1")
+        with pytest.raises(e.UndefinedTable):
+            await (await p.submit("select * from doesnotexist")).result()
+        res2 = await p.submit("select 'aborted'")
+        with pytest.raises(e.PipelineAborted):
+            await res2.result()
+        assert "[error]" in repr(res2)
+        # Sync restore the connection in usable state.
+        await p.sync()
+        res3 = await p.submit("select 3")
+
+    assert await res1.result() == [(1,)]
+    with pytest.raises(e.PipelineAborted):
+        await res2.result()
+    assert await res3.result() == [(3,)]
+
+
+async def test_submit_outside_block(aconn):
+    async with aconn.pipeline() as p:
+        pass
+    with pytest.raises(psycopg.ProgrammingError):
+        await p.submit("select 1")
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Record the number of queries sent in each automatic pipeline."""
+    rv = []
+    orig = psycopg.AsyncPipeline._batch_gen
+
+    def _batch_gen(self, sends):
+        rv.append(len(sends))
+        return orig(self, sends)
+
+    monkeypatch.setattr(psycopg.AsyncPipeline, "_batch_gen", _batch_gen)
+    return rv
+
+
+@skip_sync
+async def test_auto_pipeline(aconn, batches):
+    await aconn.set_autocommit(True)
+    aconn.auto_pipeline = True
+    assert aconn.auto_pipeline
+
+    async def worker(i):
+        cur = await aconn.execute("select %s::int * 2", [i])
+        return await cur.fetchone()
+
+    assert await gather(*[worker(i) for i in range(20)]) == [
+        (i * 2,) for i in range(20)
+    ]
+    assert batches == [20]
+    assert aconn._pipeline is None
+    assert aconn.pgconn.pipeline_status == pq.PipelineStatus.OFF
+
+    assert await worker(10) == (20,)
+    assert batches == [20, 1]
+
+
+@skip_sync
+async def test_auto_pipeline_error(aconn, batches):
+    await aconn.set_autocommit(True)
+    aconn.auto_pipeline = True
+
+    async def worker(i):
+        cur = await aconn.execute("select 10 / %s", [i])
+        return await cur.fetchone()
+
+    rv = await gather(*[worker(i) for i in range(-2, 3)], return_exceptions=True)
+    assert batches == [5]
+    assert rv[:2] == [(-5,), (-10,)]
+    assert isinstance(rv[2], e.DivisionByZero)
+    assert rv[3:] == [(10,), (5,)]
+
+
+@skip_sync
+async def test_auto_pipeline_bad_params(aconn, batches):
+    await aconn.set_autocommit(True)
+    aconn.auto_pipeline = True
+
+    async def worker(i):
+        cur = await aconn.execute("select %s::int", i)
+        return await cur.fetchone()
+
+    rv = await gather(worker([1]), worker(2), worker([3]), return_exceptions=True)
+    assert rv[0] == (1,)
+    assert isinstance(rv[1], TypeError)
+    assert rv[2] == (3,)
+
+
+@skip_sync
+async def test_auto_pipeline_transaction(aconn, batches):
+    aconn.auto_pipeline = True
+    await aconn.execute("create temp table tauto (id int)")
+    await gather(
+        *[aconn.execute("insert into tauto values (%s)", [i]) for i in range(10)]
+    )
+    assert aconn.info.transaction_status == pq.TransactionStatus.INTRANS
+    await aconn.rollback()
+    with pytest.raises(e.UndefinedTable):
+        await aconn.execute("select * from tauto")
+
+
+@skip_sync
+async def test_auto_pipeline_prepare(aconn, batches):
+    await aconn.set_autocommit(True)
+    aconn.auto_pipeline = True
+    aconn.prepare_threshold = 0
+
+    async def worker(i):
+        cur = await aconn.execute("select %s::int", [i])
+        return await cur.fetchone()
+
+    for j in range(3):
+        rv = await gather(*[worker(i) for i in range(5)])
+        assert rv == [(i,) for i in range(5)]
+    assert aconn.prepared_stats().prepares == 1
+
+
+@skip_sync
+async def test_auto_pipeline_in_pipeline(aconn, batches):
+    aconn.auto_pipeline = True
+    async with aconn.pipeline():
+        cur = await aconn.execute("select 1")
+    assert await cur.fetchone() == (1,)
+    assert not batches
+
+
 async def test_sync_syncs_errors(aconn):
     await aconn.set_autocommit(True)
     async with aconn.pipeline() as p:
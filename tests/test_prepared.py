@@ -200,6 +200,72 @@ def test_deallocate_or_close(conn, caplog):
         assert "DEALLOCATE" in msgs
 
 
+def test_defer_deallocate(conn):
+    assert not conn.defer_deallocate
+    conn.defer_deallocate = True
+    conn.prepared_max = 3
+    for i in range(5):
+        conn.execute(f"select {i}", prepare=True)
+
+    assert len(get_prepared_statements(conn)) == 5
+    assert conn.prepared_stats().deallocations == 0
+
+    conn.flush_deallocations()
+    stmts = get_prepared_statements(conn)
+    assert sorted((s.statement for s in stmts)) == [f"select {i}" for i in (2, 3, 4)]
+    assert conn.prepared_stats().deallocations == 2
+
+    conn.flush_deallocations()
+    assert conn.prepared_stats().deallocations == 2
+
+
+def test_defer_deallocate_max(conn):
+    conn.defer_deallocate = True
+    conn.prepared_max = 2
+    for i in range(5):
+        conn.execute(f"select {i}", prepare=True)
+
+    # Deallocated when pending were more than prepared_max
+    assert len(get_prepared_statements(conn)) == 2
+    assert conn.prepared_stats().deallocations == 3
+
+
+def test_defer_deallocate_all(conn):
+    conn.defer_deallocate = True
+    conn.prepared_max = 1
+    for i in range(2):
+        conn.execute(f"select {i}", prepare=True)
+    conn.rollback()
+    assert not get_prepared_statements(conn)
+
+    stats = conn.prepared_stats()
+    assert stats.deallocations == 0
+    assert stats.deallocations_all == 1
+
+
+@pytest.mark.skipif("psycopg._cmodule._psycopg", reason="Python-only debug conn")
+def test_deallocate_batch(conn, caplog):
+    conn.pgconn = PGconnDebug(conn.pgconn)
+    conn.set_autocommit(True)
+    conn.defer_deallocate = True
+    conn.prepared_max = 3
+    for i in range(6):
+        conn.execute(f"select {i}", prepare=True)
+
+    caplog.set_level(logging.INFO, logger="psycopg.debug")
+    conn.flush_deallocations()
+
+    msgs = [rec.message for rec in caplog.records]
+    if psycopg.pq.__build_version__ >= 170000:
+        assert len([m for m in msgs if "PGconn.send_close_prepared" in m]) == 3
+        assert len([m for m in msgs if "PGconn.pipeline_sync" in m]) == 1
+    else:
+        assert len([m for m in msgs if "PGconn.send_query" in m]) == 1
+
+    stmts = get_prepared_statements(conn)
+    assert sorted((s.statement for s in stmts)) == [f"select {i}" for i in (3, 4, 5)]
+
+
 def test_prepared_max_none(conn):
     conn.prepared_max = 42
     assert conn.prepared_max == 42
@@ -303,6 +369,139 @@ def test_change_type_savepoint(conn):
                     raise ZeroDivisionError()
 
 
+def test_policy(conn):
+
+    class MyPolicy(psycopg.PreparePolicy):
+
+        def should_prepare(self, key):
+            return b"prepme" in key[0]
+
+    conn.prepare_policy = policy = MyPolicy()
+    assert conn.prepare_policy is policy
+
+    conn.execute("select 1 as prepme")
+    conn.execute("select 1 as prepme")
+    conn.execute("select 1 as dont")
+    assert (policy.hits, policy.misses) == (1, 2)
+
+    stmts = get_prepared_statements(conn)
+    assert [s.statement for s in stmts] == ["select 1 as prepme"]
+
+
+def test_policy_threshold_none(conn):
+
+    class MyPolicy(psycopg.PreparePolicy):
+
+        def should_prepare(self, key):
+            return True
+
+    conn.prepare_policy = MyPolicy()
+    conn.prepare_threshold = None
+    conn.execute("select 1")
+    assert not get_prepared_statements(conn)
+
+
+def test_cost_policy_min_count(conn):
+    conn.prepare_policy = psycopg.CostPreparePolicy(min_count=2)
+    res = []
+    for i in range(4):
+        conn.execute("select %s::int", [i])
+        stmts = get_prepared_statements(conn)
+        res.append(len(stmts))
+
+    assert res == [0, 0, 1, 1]
+
+
+def test_cost_policy_reject(conn):
+    # Preparing will never make the query twice as fast
+    policy = psycopg.CostPreparePolicy(min_count=1, min_gain=2.0, trials=2)
+    conn.prepare_policy = policy
+    res = []
+    for i in range(6):
+        conn.execute("select %s::int", [i])
+        stmts = get_prepared_statements(conn)
+        res.append(len(stmts))
+
+    assert res == [0, 1, 1, 1, 0, 0]
+
+
+def test_cost_policy_keep(conn):
+    policy = psycopg.CostPreparePolicy(min_count=1, min_gain=-1.0, trials=2)
+    conn.prepare_policy = policy
+    for i in range(6):
+        conn.execute("select %s::int", [i])
+
+    stmts = get_prepared_statements(conn)
+    assert len(stmts) == 1
+
+
+def test_cost_policy_max_keys(conn):
+    policy = psycopg.CostPreparePolicy(min_count=2, max_keys=2)
+    conn.prepare_policy = policy
+    for i in range(2):
+        for j in range(3):
+            conn.execute(f"select {j}")
+
+    stmts = get_prepared_statements(conn)
+    assert not stmts
+    assert len(policy._stats) == 2
+
+
+@pytest.mark.pipeline
+def test_cost_policy_pipeline(conn):
+    policy = psycopg.CostPreparePolicy(min_count=2)
+    conn.prepare_policy = policy
+    with conn.pipeline():
+        for i in range(4):
+            conn.execute("select %s::int", [i])
+
+    assert (policy.hits, policy.misses) == (1, 3)
+
+
+def test_stats(conn):
+    stats = conn.prepared_stats()
+    assert stats == psycopg.PreparedStats(0, 0, 0, 0, 0, 0, [])
+
+    for i in range(7):
+        conn.execute("select %s::int", [i])
+    conn.execute("select 'x'", prepare=True)
+
+    stats = conn.prepared_stats()
+    assert stats.hits == 1
+    assert stats.misses == 7
+    assert stats.prepares == 2
+    assert [k[0] for k in stats.keys] == [b"select 'x'", b"select $1::int"]
+
+
+def test_stats_evict(conn):
+    conn.prepared_max = 2
+    for i in range(4):
+        conn.execute(f"select {i}", prepare=True)
+
+    stats = conn.prepared_stats()
+    assert stats.prepares == 4
+    assert stats.evictions == 2
+    assert stats.deallocations == 2
+    assert stats.deallocations_all == 0
+    assert [k[0] for k in stats.keys] == [b"select 3", b"select 2"]
+
+
+def test_stats_discard(conn):
+    conn.execute("select 1", prepare=True)
+    conn.execute("create table if not exists prepstats ()")
+    conn.execute("drop table prepstats")
+
+    stats = conn.prepared_stats()
+    assert stats.deallocations_all == 1
+    assert stats.keys == []
+
+    conn.execute("select 1", prepare=True)
+    conn.rollback()
+    stats = conn.prepared_stats()
+    assert stats.deallocations_all == 2
+    assert stats.prepares == 2
+
+
 def get_prepared_statements(conn):
     cur = conn.cursor(row_factory=namedtuple_row)
     # CRDB has 'PREPARE name AS' in the statement.
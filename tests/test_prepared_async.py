@@ -199,6 +199,72 @@ async def test_deallocate_or_close(aconn, caplog):
         assert "DEALLOCATE" in msgs
 
 
+async def test_defer_deallocate(aconn):
+    assert not aconn.defer_deallocate
+    aconn.defer_deallocate = True
+    aconn.prepared_max = 3
+    for i in range(5):
+        await aconn.execute(f"select {i}", prepare=True)
+
+    assert len(await get_prepared_statements(aconn)) == 5
+    assert aconn.prepared_stats().deallocations == 0
+
+    await aconn.flush_deallocations()
+    stmts = await get_prepared_statements(aconn)
+    assert sorted(s.statement for s in stmts) == [f"select {i}" for i in (2, 3, 4)]
+    assert aconn.prepared_stats().deallocations == 2
+
+    await aconn.flush_deallocations()
+    assert aconn.prepared_stats().deallocations == 2
+
+
+async def test_defer_deallocate_max(aconn):
+    aconn.defer_deallocate = True
+    aconn.prepared_max = 2
+    for i in range(5):
+        await aconn.execute(f"select {i}", prepare=True)
+
+    # Deallocated when pending were more than prepared_max
+    assert len(await get_prepared_statements(aconn)) == 2
+    assert aconn.prepared_stats().deallocations == 3
+
+
+async def test_defer_deallocate_all(aconn):
+    aconn.defer_deallocate = True
+    aconn.prepared_max = 1
+    for i in range(2):
+        await aconn.execute(f"select {i}", prepare=True)
+    await aconn.rollback()
+    assert not await get_prepared_statements(aconn)
+
+    stats = aconn.prepared_stats()
+    assert stats.deallocations == 0
+    assert stats.deallocations_all == 1
+
+
+@pytest.mark.skipif("psycopg._cmodule._psycopg", reason="Python-only debug conn")
+async def test_deallocate_batch(aconn, caplog):
+    aconn.pgconn = PGconnDebug(aconn.pgconn)
+    await aconn.set_autocommit(True)
+    aconn.defer_deallocate = True
+    aconn.prepared_max = 3
+    for i in range(6):
+        await aconn.execute(f"select {i}", prepare=True)
+
+    caplog.set_level(logging.INFO, logger="psycopg.debug")
+    await aconn.flush_deallocations()
+
+    msgs = [rec.message for rec in caplog.records]
+    if psycopg.pq.__build_version__ >= 170000:
+        assert len([m for m in msgs if "PGconn.send_close_prepared" in m]) == 3
+        assert len([m for m in msgs if "PGconn.pipeline_sync" in m]) == 1
+    else:
+        assert len([m for m in msgs if "PGconn.send_query" in m]) == 1
+
+    stmts = await get_prepared_statements(aconn)
+    assert sorted(s.statement for s in stmts) == [f"select {i}" for i in (3, 4, 5)]
+
+
 def test_prepared_max_none(conn):
     conn.prepared_max = 42
     assert conn.prepared_max == 42
@@ -306,6 +372,135 @@ async def test_change_type_savepoint(aconn):
                     raise ZeroDivisionError()
 
 
+async def test_policy(aconn):
+    class MyPolicy(psycopg.PreparePolicy):
+        def should_prepare(self, key):
+            return b"prepme" in key[0]
+
+    aconn.prepare_policy = policy = MyPolicy()
+    assert aconn.prepare_policy is policy
+
+    await aconn.execute("select 1 as prepme")
+    await aconn.execute("select 1 as prepme")
+    await aconn.execute("select 1 as dont")
+    assert (policy.hits, policy.misses) == (1, 2)
+
+    stmts = await get_prepared_statements(aconn)
+    assert [s.statement for s in stmts] == ["select 1 as prepme"]
+
+
+async def test_policy_threshold_none(aconn):
+    class MyPolicy(psycopg.PreparePolicy):
+        def should_prepare(self, key):
+            return True
+
+    aconn.prepare_policy = MyPolicy()
+    aconn.prepare_threshold = None
+    await aconn.execute("select 1")
+    assert not await get_prepared_statements(aconn)
+
+
+async def test_cost_policy_min_count(aconn):
+    aconn.prepare_policy = psycopg.CostPreparePolicy(min_count=2)
+    res = []
+    for i in range(4):
+        await aconn.execute("select %s::int", [i])
+        stmts = await get_prepared_statements(aconn)
+        res.append(len(stmts))
+
+    assert res == [0, 0, 1, 1]
+
+
+async def test_cost_policy_reject(aconn):
+    # Preparing will never make the query twice as fast
+    policy = psycopg.CostPreparePolicy(min_count=1, min_gain=2.0, trials=2)
+    aconn.prepare_policy = policy
+    res = []
+    for i in range(6):
+        await aconn.execute("select %s::int", [i])
+        stmts = await get_prepared_statements(aconn)
+        res.append(len(stmts))
+
+    assert res == [0, 1, 1, 1, 0, 0]
+
+
+async def test_cost_policy_keep(aconn):
+    policy = psycopg.CostPreparePolicy(min_count=1, min_gain=-1.0, trials=2)
+    aconn.prepare_policy = policy
+    for i in range(6):
+        await aconn.execute("select %s::int", [i])
+
+    stmts = await get_prepared_statements(aconn)
+    assert len(stmts) == 1
+
+
+async def test_cost_policy_max_keys(aconn):
+    policy = psycopg.CostPreparePolicy(min_count=2, max_keys=2)
+    aconn.prepare_policy = policy
+    for i in range(2):
+        for j in range(3):
+            await aconn.execute(f"select {j}")
+
+    stmts = await get_prepared_statements(aconn)
+    assert not stmts
+    assert len(policy._stats) == 2
+
+
+@pytest.mark.pipeline
+async def test_cost_policy_pipeline(aconn):
+    policy = psycopg.CostPreparePolicy(min_count=2)
+    aconn.prepare_policy = policy
+    async with aconn.pipeline():
+        for i in range(4):
+            await aconn.execute("select %s::int", [i])
+
+    assert (policy.hits, policy.misses) == (1, 3)
+
+
+async def test_stats(aconn):
+    stats = aconn.prepared_stats()
+    assert stats == psycopg.PreparedStats(0, 0, 0, 0, 0, 0, [])
+
+    for i in range(7):
+        await aconn.execute("select %s::int", [i])
+    await aconn.execute("select 'x'", prepare=True)
+
+    stats = aconn.prepared_stats()
+    assert stats.hits == 1
+    assert stats.misses == 7
+    assert stats.prepares == 2
+    assert [k[0] for k in stats.keys] == [b"select 'x'", b"select $1::int"]
+
+
+async def test_stats_evict(aconn):
+    aconn.prepared_max = 2
+    for i in range(4):
+        await aconn.execute(f"select {i}", prepare=True)
+
+    stats = aconn.prepared_stats()
+    assert stats.prepares == 4
+    assert stats.evictions == 2
+    assert stats.deallocations == 2
+    assert stats.deallocations_all == 0
+    assert [k[0] for k in stats.keys] == [b"select 3", b"select 2"]
+
+
+async def test_stats_discard(aconn):
+    await aconn.execute("select 1", prepare=True)
+    await aconn.execute("create table if not exists prepstats ()")
+    await aconn.execute("drop table prepstats")
+
+    stats = aconn.prepared_stats()
+    assert stats.deallocations_all == 1
+    assert stats.keys == []
+
+    await aconn.execute("select 1", prepare=True)
+    await aconn.rollback()
+    stats = aconn.prepared_stats()
+    assert stats.deallocations_all == 2
+    assert stats.prepares == 2
+
+
 async def get_prepared_statements(aconn):
     cur = aconn.cursor(row_factory=namedtuple_row)
     # CRDB has 'PREPARE name AS' in the statement.
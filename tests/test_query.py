@@ -3,7 +3,8 @@ import pytest
 import psycopg
 from psycopg import pq
 from psycopg.adapt import PyFormat, Transformer
-from psycopg._queries import PostgresQuery, _split_query
+from psycopg._queries import PostgresBatchQuery, PostgresQuery, QueryCache, _query2pg
+from psycopg._queries import _query2pg_client, _split_insert_values, _split_query
 
 
 @pytest.mark.parametrize(
@@ -160,3 +161,114 @@ def test_pq_query_badprog(query, params):
     pq = PostgresQuery(Transformer())
     with pytest.raises(psycopg.ProgrammingError):
         pq.convert(query, params)
+
+
+def test_query_cache_size():
+    cache = QueryCache(max_size=2000)
+    for i in range(20):
+        cache._parse(_query2pg, b"select %s -- " + b"x" * (100 + i), "utf8", 1)
+        assert cache.size <= 2000
+
+    assert 0 < len(cache) < 20
+    assert cache.misses == 20
+    assert cache.hits == 0
+
+    # The most recent queries are kept
+    cache._parse(_query2pg, b"select %s -- " + b"x" * 119, "utf8", 1)
+    assert cache.hits == 1
+
+    cache._parse(_query2pg, b"select %s -- " + b"x" * 100, "utf8", 1)
+    assert cache.misses == 21
+
+    cache.max_size = 700
+    assert cache.size <= 700
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == cache.size == cache.hits == cache.misses == 0
+
+
+def test_query_cache_disabled():
+    cache = QueryCache(max_size=0)
+    rv1 = cache._parse(_query2pg, b"select %s", "utf8", 1)
+    rv2 = cache._parse(_query2pg, b"select %s", "utf8", 1)
+    assert rv1 == rv2
+    assert rv1 is not rv2
+    assert len(cache) == cache.hits == cache.misses == 0
+
+
+def test_query_cache_limits():
+    cache = QueryCache()
+    cache.max_query_length = 10
+    cache.max_query_params = 2
+    cache._parse(_query2pg, b"select %s, %s, %s", "utf8", 3)
+    cache._parse(_query2pg, b"select %s, %s", "utf8", 2)
+    assert len(cache) == 0
+
+    cache.max_query_length = 100
+    cache._parse(_query2pg, b"select %s, %s, %s", "utf8", 3)
+    cache._parse(_query2pg, b"select %s, %s", "utf8", 2)
+    assert len(cache) == 1
+
+
+def test_query_cache_kinds():
+    cache = QueryCache()
+    rv1 = cache._parse(_query2pg, b"select %s", "utf8", 1)
+    rv2 = cache._parse(_query2pg_client, b"select %s", "utf8", 1)
+    assert rv1[0] == b"select $1"
+    assert rv2[0] == b"select %s"
+    assert cache.misses == 2
+
+
+@pytest.mark.parametrize(
+    "query, nrows, want",
+    [
+        (b"insert into t values (%s)", 1, b"insert into t values ($1)"),
+        (b"INSERT INTO t VALUES(%s, %s)", 2, b"INSERT INTO t VALUES($1, $2), ($3, $4)"),
+        (
+            b"insert into t (a, b) values (f(%(b)s, ')'), %(a)s)"
+            b" on conflict do nothing",
+            3,
+            b"insert into t (a, b) values (f($1, ')'), $2), (f($3, ')'), $4),"
+            b" (f($5, ')'), $6) on conflict do nothing",
+        ),
+        (
+            b"insert into t values (%s, 'price $1')",
+            2,
+            b"insert into t values ($1, 'price $1'), ($2, 'price $1')",
+        ),
+        (
+            b"insert into t values (E'it\\'s )', %s, $$)$$, $x$ ) $x$ /* ) */) -- )",
+            2,
+            b"insert into t values (E'it\\'s )', $1, $$)$$, $x$ ) $x$ /* ) */),"
+            b" (E'it\\'s )', $2, $$)$$, $x$ ) $x$ /* ) */) -- )",
+        ),
+        (
+            b"insert into t values (default)",
+            2,
+            b"insert into t values (default), (default)",
+        ),
+    ],
+)
+def test_batch_query(query, nrows, want):
+    pgq = PostgresBatchQuery(Transformer())
+    _, pgq._want_formats, order, parts = _query2pg(query, "utf8")
+    pgq._head, pgq._row, pgq._tail = _split_insert_values(parts, order)
+    pgq._set_nrows(nrows)
+    assert pgq.query == want
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        b"insert into t values (%s, ')'",
+        b"insert into t (a) select %s",
+        b"insert into t values (%s), (%s)",
+        b"insert into t values (1) returning %s",
+        b"insert into t select %s where 1 in (values (1))",
+    ],
+)
+def test_batch_query_bad(query):
+    _, _, order, parts = _query2pg(query, "utf8")
+    with pytest.raises(psycopg.ProgrammingError):
+        _split_insert_values(parts, order)
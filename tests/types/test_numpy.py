@@ -4,6 +4,7 @@ from math import isnan
 import pytest
 from packaging.version import parse as ver  # noqa: F401  # used in skipif
 
+import psycopg
 from psycopg.pq import Format
 from psycopg.adapt import PyFormat
 
@@ -228,3 +229,194 @@ def test_random(conn, faker, fmt):
 
     for got, want in zip(recs, faker.records):
         faker.assert_record(got, want)
+
+
+@pytest.mark.parametrize(
+    "pgtype, values, dtype",
+    [
+        ("int2", [1, -32768, 32767], "int16"),
+        ("int4", [1, -(2**31), 2**31 - 1], "int32"),
+        ("int8", [1, -(2**63), 2**63 - 1], "int64"),
+        ("oid", [0, 2**32 - 1], "uint32"),
+        ("float4", [1.5, -0.25], "float32"),
+        ("float8", [2.718281828459045, -1e300], "float64"),
+        ("bool", [True, False], "bool"),
+    ],
+)
+def test_fetchall_numpy(conn, pgtype, values, dtype):
+    cur = conn.cursor(binary=True)
+    cur.execute(f"select unnest(%s::{pgtype}[]), 'x'", (list(map(str, values)),))
+    arr, obj = cur.fetchall_numpy()
+    assert arr.dtype == np.dtype(dtype)
+    assert arr.tolist() == values
+    assert obj.dtype == np.dtype(object)
+    assert obj.tolist() == ["x"] * len(values)
+    assert cur.fetchall_numpy()[0].tolist() == []
+
+
+def test_fetchall_numpy_dates(conn):
+    cur = conn.cursor(binary=True)
+    cur.execute(
+        """select
+            unnest('{2000-01-01,1970-01-01,2038-01-19,infinity}'::date[]),
+            unnest('{2000-01-01 00:00:01.5,1900-01-01,-infinity,infinity}'
+                ::timestamp[])
+        """
+    )
+    dates, tss = cur.fetchall_numpy()
+    assert dates.dtype == np.dtype("datetime64[D]")
+    assert list(dates[:3]) == [
+        np.datetime64("2000-01-01"),
+        np.datetime64("1970-01-01"),
+        np.datetime64("2038-01-19"),
+    ]
+    assert np.isnat(dates[3])
+    assert tss.dtype == np.dtype("datetime64[us]")
+    assert list(tss[:2]) == [
+        np.datetime64("2000-01-01T00:00:01.500000"),
+        np.datetime64("1900-01-01T00:00:00"),
+    ]
+    assert np.isnat(tss[2:]).all()
+
+
+def test_fetchall_numpy_uuid(conn):
+    cur = conn.cursor(binary=True)
+    cur.execute("select '12345678-1234-5678-1234-567812345678'::uuid")
+    (arr,) = cur.fetchall_numpy()
+    assert arr.dtype == np.dtype("V16")
+    assert bytes(arr[0]) == bytes.fromhex("12345678123456781234567812345678")
+
+
+def test_fetchall_numpy_nulls(conn):
+    cur = conn.cursor(binary=True)
+    cur.execute("select unnest('{1,NULL,3}'::int4[]), unnest('{a,NULL,c}'::text[])")
+    ints, texts = cur.fetchall_numpy()
+    assert isinstance(ints, np.ma.MaskedArray)
+    assert ints.mask.tolist() == [False, True, False]
+    assert ints.compressed().tolist() == [1, 3]
+    assert texts.tolist() == ["a", None, "c"]
+
+
+def test_fetchall_numpy_text(conn):
+    cur = conn.cursor()
+    cur.execute("select generate_series(1, 5)")
+    cur.fetchone()
+    (arr,) = cur.fetchall_numpy()
+    assert arr.dtype == np.dtype(object)
+    assert arr.tolist() == [2, 3, 4, 5]
+    assert cur.rownumber == 5
+
+
+def test_fetchall_numpy_server_cursor(conn):
+    with conn.cursor("numpy", binary=True) as cur:
+        cur.execute("select generate_series(1, 10)::int8")
+        cur.fetchone()
+        (arr,) = cur.fetchall_numpy()
+        assert arr.dtype == np.dtype("int64")
+        assert arr.tolist() == list(range(2, 11))
+        assert cur.rownumber == 10
+
+
+@pytest.mark.parametrize(
+    "nptype, pgtype",
+    [
+        ("int8", "smallint"),
+        ("int16", "smallint"),
+        ("int32", "integer"),
+        ("int64", "bigint"),
+        ("uint8", "smallint"),
+        ("uint16", "integer"),
+        ("uint32", "bigint"),
+        ("float16", "real"),
+        ("float32", "real"),
+        ("float64", "double precision"),
+        ("bool", "boolean"),
+    ],
+)
+@pytest.mark.parametrize("fmt_in", PyFormat)
+def test_dump_ndarray(conn, nptype, pgtype, fmt_in):
+    arr = np.array([0, 1, 0, 1, 1, 0], dtype=nptype)
+    cur = conn.cursor()
+    cur.execute(f"select pg_typeof(%{fmt_in.value}), %{fmt_in.value}", (arr, arr))
+    assert cur.fetchone() == (f"{pgtype}[]", arr.tolist())
+
+    arr2 = arr.reshape(2, 3)
+    cur.execute(f"select %{fmt_in.value}", (arr2,))
+    assert cur.fetchone()[0] == arr2.tolist()
+
+
+@pytest.mark.parametrize("fmt_in", PyFormat)
+def test_dump_ndarray_special_floats(conn, fmt_in):
+    arr = np.array([np.nan, np.inf, -np.inf, -0.5], dtype="float64")
+    cur = conn.cursor()
+    cur.execute(f"select %{fmt_in.value}::text", (arr,))
+    assert cur.fetchone()[0] == "{NaN,Infinity,-Infinity,-0.5}"
+
+
+@pytest.mark.parametrize("fmt_in", PyFormat)
+def test_dump_ndarray_empty(conn, fmt_in):
+    cur = conn.cursor()
+    cur.execute(f"select %{fmt_in.value}::int8[]", (np.array([], dtype="int64"),))
+    assert cur.fetchone()[0] == []
+
+
+@pytest.mark.parametrize("fmt_in", PyFormat)
+def test_dump_ndarray_bad(conn, fmt_in):
+    cur = conn.cursor()
+    with pytest.raises(psycopg.DataError):
+        cur.execute(f"select %{fmt_in.value}", (np.array(["a"]),))
+    with pytest.raises(psycopg.DataError):
+        cur.execute(f"select %{fmt_in.value}", (np.ma.masked_array([1], mask=[True]),))
+
+
+@pytest.mark.parametrize("fmt", Format)
+@pytest.mark.crdb_skip("copy")
+def test_copy_columns(conn, fmt):
+    cur = conn.cursor()
+    cur.execute("create table numpycols (a int2, b int4, c int8, d float8, e bool)")
+    cols = (
+        np.arange(-100, 100, dtype="int16"),
+        np.arange(-100, 100, dtype="int32") * 1000,
+        np.arange(-100, 100, dtype="int64") * 2**40,
+        np.linspace(-1, 1, 200),
+        np.arange(200) % 3 == 0,
+    )
+    with cur.copy(f"copy numpycols from stdin (format {fmt.name})") as copy:
+        copy.write_columns(cols)
+
+    cur.execute("select * from numpycols")
+    assert cur.fetchall() == list(zip(*(col.tolist() for col in cols)))
+
+
+@pytest.mark.crdb_skip("copy")
+def test_copy_columns_set_types(conn):
+    cur = conn.cursor()
+    cur.execute("create table numpycols (a int8, b float8, c int2)")
+    cols = (
+        np.arange(10, dtype="int16"),
+        np.arange(10, dtype="float32"),
+        np.ma.masked_array(
+            np.arange(10, dtype="int16"), mask=(np.arange(10) % 2).astype(bool)
+        ),
+    )
+    with cur.copy("copy numpycols from stdin (format binary)") as copy:
+        copy.set_types(["int8", "float8", "int2"])
+        copy.write_row((np.int64(-1), -1.0, None))
+        copy.write_columns(cols)
+
+    cur.execute("select * from numpycols")
+    assert cur.fetchall() == [(-1, -1.0, None)] + [
+        (i, float(i), None if i % 2 else i) for i in range(10)
+    ]
+
+
+@pytest.mark.crdb_skip("copy")
+def test_copy_columns_big(conn):
+    cur = conn.cursor()
+    cur.execute("create table numpycols (a int8, b float4)")
+    cols = (np.arange(100_000, dtype="int64"), np.ones(100_000, dtype="float32"))
+    with cur.copy("copy numpycols from stdin (format binary)") as copy:
+        copy.write_columns(cols)
+
+    cur.execute("select count(*), sum(a), sum(b) from numpycols")
+    assert cur.fetchone() == (100_000, sum(range(100_000)), 100_000)
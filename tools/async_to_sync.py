@@ -299,7 +299,9 @@ class RenameAsyncToSync(ast.NodeTransformer):  # type: ignore
         "AsyncIterator": "Iterator",
         "AsyncLibpqWriter": "LibpqWriter",
         "AsyncNullConnectionPool": "NullConnectionPool",
+        "AsyncParamsSeq": "ParamsSeq",
         "AsyncPipeline": "Pipeline",
+        "AsyncPipelineResult": "PipelineResult",
         "AsyncPoolConnection": "PoolConnection",
         "AsyncQueuedLibpqWriter": "QueuedLibpqWriter",
         "AsyncRawCursor": "RawCursor",